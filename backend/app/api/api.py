@@ -1,8 +1,15 @@
 from fastapi import APIRouter
-from app.api.endpoints import auth, categories, courses, files, progress, scanner, backup, config, enrollments, search, notifications, users, course_upload
+from app.core.config import settings
+from app.api.endpoints import auth, categories, courses, files, progress, scanner, backup, config, enrollments, search, notifications, users, course_upload, metrics
 
 api_router = APIRouter()
 
+# Async read endpoints must be registered first so they take precedence
+# over the sync handlers for the same paths
+if settings.ASYNC_DB_ENABLED:
+    from app.api.endpoints import async_reads
+    api_router.include_router(async_reads.router)
+
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(categories.router, prefix="/categories", tags=["categories"])
@@ -16,3 +23,4 @@ api_router.include_router(notifications.router, prefix="/notifications", tags=["
 api_router.include_router(scanner.router, prefix="/scanner", tags=["scanner"])
 api_router.include_router(backup.router, prefix="/admin/backup", tags=["backup"])
 api_router.include_router(config.router, prefix="/config", tags=["configuration"])
+api_router.include_router(metrics.router, prefix="/admin/metrics", tags=["metrics"])
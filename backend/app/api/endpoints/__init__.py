@@ -13,6 +13,7 @@ from . import enrollments
 from . import search
 from . import notifications
 from . import users
+from . import metrics
 
 __all__ = [
     'auth',
@@ -26,5 +27,6 @@ __all__ = [
     'enrollments',
     'search',
     'notifications',
-    'users'
+    'users',
+    'metrics'
 ]
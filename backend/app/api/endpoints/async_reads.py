@@ -0,0 +1,211 @@
+"""
+Async read endpoints (AsyncSession)
+
+Mounted ahead of the sync routers when ASYNC_DB_ENABLED is set, so these
+paths are served on the event loop instead of the threadpool. Responses
+match the sync endpoints they shadow.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from app.db.async_database import get_async_db
+from app.models import Course as CourseModel, User
+from app.schemas import Category, Course
+from app.core.dependencies import get_current_user_async
+from app.services.async_authorization_service import AsyncAuthorizationService
+from app.services.async_search_service import AsyncSearchService
+from app.services.search_service import file_filters
+from app.services.async_notification_service import AsyncNotificationService
+
+router = APIRouter()
+
+# Categories
+
+@router.get("/categories/", response_model=List[Category], tags=["categories"])
+async def get_categories(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get categories accessible to current user.
+    Admin sees all, regular users see only categories with enrolled courses.
+    """
+    return await AsyncAuthorizationService(db).get_accessible_categories(current_user)
+
+# Courses
+
+@router.get("/courses/", response_model=List[Course], tags=["courses"])
+async def get_all_courses(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get accessible courses for current user.
+    Admin sees all, regular users see only enrolled courses.
+    """
+    return await AsyncAuthorizationService(db).get_accessible_courses(current_user)
+
+@router.get("/courses/category/{category_id}", response_model=List[Course], tags=["courses"])
+async def get_courses_by_category(
+    category_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get accessible courses in a specific category.
+    """
+    return await AsyncAuthorizationService(db).get_accessible_courses(current_user, category_id)
+
+@router.get("/courses/{course_id}", response_model=Course, tags=["courses"])
+async def get_course(
+    course_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get a specific course by ID.
+    Requires access to the course.
+    """
+    if not await AsyncAuthorizationService(db).can_access_course(current_user, course_id):
+        raise HTTPException(status_code=403, detail="Access denied to this course")
+    
+    result = await db.execute(select(CourseModel).where(CourseModel.id == course_id))
+    course = result.scalars().first()
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return course
+
+# Search
+
+@router.get("/search/", tags=["search"])
+async def search_all(
+    q: str = Query(..., min_length=1, description="Search query"),
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Unified search across courses and files
+    """
+    return await AsyncSearchService(db).search_all(q, current_user, limit)
+
+@router.get("/search/courses", tags=["search"])
+async def search_courses(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Search courses only
+    """
+    results = await AsyncSearchService(db).search_courses(q, current_user, limit)
+    
+    return {
+        'results': results,
+        'total': len(results),
+        'query': q
+    }
+
+@router.get("/search/files", tags=["search"])
+async def search_files(
+    q: str = Query(..., min_length=1),
+    file_type: Optional[List[str]] = Query(None),
+    course_id: Optional[List[int]] = Query(None),
+    category_id: Optional[List[int]] = Query(None),
+    min_size: Optional[int] = Query(None, ge=0),
+    max_size: Optional[int] = Query(None, ge=0),
+    added_after: Optional[datetime] = None,
+    added_before: Optional[datetime] = None,
+    limit: int = Query(30, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Search files only, with facet filters and counts
+    """
+    filters = file_filters(file_type, course_id, category_id, min_size, max_size, added_after, added_before)
+    response = await AsyncSearchService(db).search_files_faceted(q, current_user, filters, limit)
+    response['file_type'] = file_type
+    return response
+
+@router.get("/search/content", tags=["search"])
+async def search_content(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Search inside PDFs, EPUBs and text files
+    """
+    results = await AsyncSearchService(db).search_content(q, current_user, limit)
+    
+    return {
+        'results': results,
+        'total': len(results),
+        'query': q
+    }
+
+@router.get("/search/popular", tags=["search"])
+async def get_popular_searches(
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get most popular search queries
+    """
+    results = await AsyncSearchService(db).get_popular_searches(limit)
+    
+    return {'popular_searches': results}
+
+@router.get("/search/recent", tags=["search"])
+async def get_recent_searches(
+    limit: int = Query(5, ge=1, le=10),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get user's recent search queries
+    """
+    results = await AsyncSearchService(db).get_recent_searches(current_user.id, limit)
+    
+    return {'recent_searches': results}
+
+# Notifications
+
+@router.get("/notifications/", tags=["notifications"])
+async def get_notifications(
+    unread_only: bool = False,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get user's notifications
+    Filtered by course enrollment
+    """
+    notifications, next_cursor = await AsyncNotificationService(db).get_user_notifications(
+        current_user,
+        unread_only,
+        limit,
+        cursor
+    )
+    
+    return {'notifications': notifications, 'next_cursor': next_cursor}
+
+@router.get("/notifications/unread-count", tags=["notifications"])
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get count of unread notifications
+    """
+    count = await AsyncNotificationService(db).get_unread_count(current_user)
+    
+    return {'unread_count': count}
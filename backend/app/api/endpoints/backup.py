@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import os
 import shutil
 from datetime import datetime
 from app.db.database import get_db
+from app.db.async_database import dispose_async_engine
 from app.core.dependencies import get_current_user
 from app.core.rate_limit import check_rate_limit
 from app.core.config import settings
@@ -73,14 +74,14 @@ async def create_backup(
 
 @router.get("/list", response_model=BackupListResponse)
 def list_backups(
-    skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_admin),
     db: Session = Depends(get_db)
 ):
-    """List all available backups"""
+    """List available backups, newest first (pass next_cursor for the next page)"""
     backup_service = BackupService(db)
-    backups = backup_service.list_backups(limit=limit, offset=skip)
+    backups, next_cursor = backup_service.list_backups(limit=limit, cursor=cursor)
     
     backup_responses = [
         BackupResponse(
@@ -98,7 +99,8 @@ def list_backups(
     
     return BackupListResponse(
         backups=backup_responses,
-        total=len(backup_responses)
+        total=len(backup_responses),
+        next_cursor=next_cursor
     )
 
 @router.get("/download/{backup_id}")
@@ -151,6 +153,9 @@ async def restore_backup(
         )
         
         if success:
+            # asyncpg connections belong to this event loop, so they are closed here
+            # rather than in RestoreService (which disposes the sync engine)
+            await dispose_async_engine()
             return {"message": "Database restored successfully"}
         else:
             raise HTTPException(
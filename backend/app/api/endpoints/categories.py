@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
@@ -7,13 +7,14 @@ from app.schemas import Category
 from app.core.dependencies import get_current_user
 from app.core.authorization import get_auth_service
 from app.services.authorization_service import AuthorizationService
-from app.core.cache import cached
+from app.core.compression import precompressed_cache, CATEGORIES_NAMESPACE
+import orjson
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Category])
-@cached(ttl_seconds=300, key_prefix="categories")  # Cache for 5 minutes
 def get_categories(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     auth_service: AuthorizationService = Depends(get_auth_service)
@@ -21,10 +22,21 @@ def get_categories(
     """
     Get categories accessible to current user.
     Admin sees all, regular users see only categories with enrolled courses.
-    Cached for 5 minutes.
+    Encoded body is cached per user until categories or enrollments change.
     """
-    categories = auth_service.get_accessible_categories(current_user)
-    return categories
+    def build() -> bytes:
+        categories = auth_service.get_accessible_categories(current_user)
+        return orjson.dumps([
+            Category.model_validate(category).model_dump(mode="json")
+            for category in categories
+        ])
+    
+    return precompressed_cache.response(
+        request,
+        key=f"categories:{current_user.id}",
+        namespace=CATEGORIES_NAMESPACE,
+        build=build
+    )
 
 @router.get("/{category_id}", response_model=Category)
 def get_category(
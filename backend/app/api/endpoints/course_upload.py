@@ -14,6 +14,12 @@ from app.models.category import Category
 from app.models.course import Course
 from app.models.file_node import FileNode
 from app.core.dependencies import get_admin_user
+from app.core.file_types import FOLDER_TYPE, file_type_for
+from app.services.file_tree_service import FileTreeService
+from app.services.rollup_service import RollupService
+from app.core.compression import precompressed_cache, tree_namespace, CATEGORIES_NAMESPACE
+from app.core.search_index import search_index
+from app.core.search_cache import search_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -148,7 +154,7 @@ async def upload_course_folder(
                 name=path_parts[-1],
                 path=str(folder_disk_path),
                 course_id=course.id,
-                file_type='folder',  # Required field
+                file_type=FOLDER_TYPE,
                 is_directory=True,
                 parent_id=parent_id
             )
@@ -187,8 +193,8 @@ async def upload_course_folder(
                     name=upload_file.filename or path_parts[-1],
                     path=str(file_path),
                     course_id=course.id,
-                    file_type=upload_file.content_type or 'application/octet-stream',
-                    file_size=len(content),
+                    file_type=file_type_for(path_parts[-1]),
+                    size=len(content),
                     is_directory=False,
                     parent_id=parent_id
                 )
@@ -205,7 +211,14 @@ async def upload_course_folder(
                 # Continue with other files
                 continue
         
+        FileTreeService(db).refresh_tree(course.id)
+        RollupService(db).rebuild(course.id)
         db.commit()
+        precompressed_cache.bump(tree_namespace(course.id))
+        precompressed_cache.bump(CATEGORIES_NAMESPACE)
+        # Index the new course and files (skipped if the periodic refresh is running)
+        search_index.refresh(db, blocking=False)
+        search_cache.bump()
         logger.info(f"Upload completed. Course ID: {course.id}, Files saved: {files_saved}")
         
         return {
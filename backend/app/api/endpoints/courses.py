@@ -7,6 +7,7 @@ from app.schemas import Course
 from app.core.dependencies import get_current_user
 from app.core.authorization import get_auth_service
 from app.services.authorization_service import AuthorizationService
+from app.services.rollup_service import RollupService
 
 router = APIRouter()
 
@@ -21,7 +22,7 @@ def get_all_courses(
     Admin sees all, regular users see only enrolled courses.
     """
     courses = auth_service.get_accessible_courses(current_user)
-    return courses
+    return RollupService(db).attach_course_stats(courses)
 
 @router.get("/category/{category_id}", response_model=List[Course])
 def get_courses_by_category(
@@ -35,7 +36,7 @@ def get_courses_by_category(
     Admin sees all, regular users see only enrolled courses.
     """
     courses = auth_service.get_accessible_courses(current_user, category_id)
-    return courses
+    return RollupService(db).attach_course_stats(courses)
 
 @router.get("/{course_id}", response_model=Course)
 def get_course(
@@ -55,4 +56,4 @@ def get_course(
     course = db.query(CourseModel).filter(CourseModel.id == course_id).first()
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+    return RollupService(db).attach_course_stats([course])[0]
@@ -1,9 +1,9 @@
 """
 Enrollment management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.database import get_db
 from app.models.user import User
 from app.models.enrollment import Enrollment
@@ -11,9 +11,13 @@ from app.schemas.enrollment import EnrollmentCreate, EnrollmentResponse
 from app.core.dependencies import get_current_user
 from app.core.authorization import get_auth_service
 from app.services.authorization_service import AuthorizationService
+from app.core.pagination import Keyset, NEXT_CURSOR_HEADER
+from sqlalchemy import select
 
 router = APIRouter()
 
+ENROLLMENT_KEYSET = Keyset(Enrollment.id)
+
 @router.post("/", response_model=EnrollmentResponse)
 def create_enrollment(
     enrollment_data: EnrollmentCreate,
@@ -62,37 +66,55 @@ def delete_enrollment(
 @router.get("/user/{user_id}", response_model=List[EnrollmentResponse])
 def get_user_enrollments(
     user_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get all enrollments for a user.
     Admin or the user themselves.
+    Next page cursor is returned in the X-Next-Cursor header.
     """
     if not current_user.is_admin and current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    enrollments = db.query(Enrollment).filter(
-        Enrollment.user_id == user_id
-    ).all()
+    enrollments, next_cursor = ENROLLMENT_KEYSET.page(
+        db,
+        select(Enrollment).where(Enrollment.user_id == user_id),
+        cursor,
+        limit
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return enrollments
 
 @router.get("/course/{course_id}", response_model=List[EnrollmentResponse])
 def get_course_enrollments(
     course_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get all enrollments for a course.
     Admin only.
+    Next page cursor is returned in the X-Next-Cursor header.
     """
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin only")
     
-    enrollments = db.query(Enrollment).filter(
-        Enrollment.course_id == course_id
-    ).all()
+    enrollments, next_cursor = ENROLLMENT_KEYSET.page(
+        db,
+        select(Enrollment).where(Enrollment.course_id == course_id),
+        cursor,
+        limit
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return enrollments
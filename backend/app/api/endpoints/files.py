@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.database import get_db
-from app.models import FileNode as FileNodeModel, User
-from app.schemas import FileNode
+from app.models import FileNode as FileNodeModel, Course as CourseModel, User
+from app.schemas import FileNode, FileNodeChildrenPage
 from app.core.dependencies import get_current_user
 from app.core.authorization import get_auth_service
 from app.services.authorization_service import AuthorizationService
+from app.services.file_tree_service import FileTreeService, COMPACT_TREE_MEDIA_TYPE
+from app.core.streaming import stream_query
+from app.core.compression import precompressed_cache, tree_namespace
+from sqlalchemy import select
+import orjson
 import os
 
 router = APIRouter()
 
+# Columns streamed for FileNode list responses (same shape as schemas.FileNode)
+FILE_NODE_COLUMNS = (
+    FileNodeModel.id, FileNodeModel.course_id, FileNodeModel.name, FileNodeModel.path,
+    FileNodeModel.file_type, FileNodeModel.is_directory, FileNodeModel.parent_id,
+    FileNodeModel.size, FileNodeModel.created_at
+)
+FILE_NODE_KEYS = [column.key for column in FILE_NODE_COLUMNS]
+
 @router.get("/course/{course_id}", response_model=List[FileNode])
 def get_files_by_course(
     course_id: int,
+    request: Request,
+    format: Optional[str] = Query(None, description="'compact' for the columnar tree payload"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     auth_service: AuthorizationService = Depends(get_auth_service)
@@ -22,15 +37,134 @@ def get_files_by_course(
     """
     Get all files in a specific course.
     Requires access to the course.
+    Streamed as a JSON array (column tuples, no ORM/Pydantic objects).
+    
+    Compact columnar format when ?format=compact or
+    Accept: application/vnd.lms.compact-tree+json.
     """
     # Check access
     if not auth_service.can_access_course(current_user, course_id):
         raise HTTPException(status_code=403, detail="Access denied to this course")
     
-    files = db.query(FileNodeModel).filter(
-        FileNodeModel.course_id == course_id
-    ).all()
-    return files
+    if format == "compact" or COMPACT_TREE_MEDIA_TYPE in request.headers.get("accept", ""):
+        def build() -> bytes:
+            course_path = db.query(CourseModel.path).filter(CourseModel.id == course_id).scalar()
+            if course_path is None:
+                raise HTTPException(status_code=404, detail="Course not found")
+            return orjson.dumps(FileTreeService(db).get_compact_tree(course_id, course_path))
+        
+        # Built and compressed once per tree version
+        return precompressed_cache.response(
+            request,
+            key=f"compact-tree:{course_id}",
+            namespace=tree_namespace(course_id),
+            build=build,
+            media_type=COMPACT_TREE_MEDIA_TYPE,
+            vary="Accept, Accept-Encoding"
+        )
+    
+    return stream_query(
+        select(*FILE_NODE_COLUMNS).where(FileNodeModel.course_id == course_id),
+        FILE_NODE_KEYS
+    )
+
+@router.get("/course/{course_id}/root", response_model=FileNodeChildrenPage)
+def get_course_root(
+    course_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    auth_service: AuthorizationService = Depends(get_auth_service)
+):
+    """
+    Get top-level nodes of a course, one page at a time.
+    Folders first, then by name. Pass next_cursor to get the next page.
+    """
+    if not auth_service.can_access_course(current_user, course_id):
+        raise HTTPException(status_code=403, detail="Access denied to this course")
+    
+    tree_service = FileTreeService(db)
+    nodes, next_cursor = tree_service.get_children(course_id, None, cursor, limit)
+    return {
+        'items': tree_service.to_children(course_id, nodes),
+        'next_cursor': next_cursor
+    }
+
+@router.get("/{node_id}/children", response_model=FileNodeChildrenPage)
+def get_node_children(
+    node_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    auth_service: AuthorizationService = Depends(get_auth_service)
+):
+    """
+    Get direct children of a folder, one page at a time.
+    Requires access to the folder's course.
+    """
+    node = db.query(FileNodeModel.course_id, FileNodeModel.is_directory).filter(
+        FileNodeModel.id == node_id
+    ).first()
+    if not node:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    if not auth_service.can_access_course(current_user, node.course_id):
+        raise HTTPException(status_code=403, detail="Access denied to this file")
+    
+    if not node.is_directory:
+        raise HTTPException(status_code=400, detail="Node is not a directory")
+    
+    tree_service = FileTreeService(db)
+    nodes, next_cursor = tree_service.get_children(node.course_id, node_id, cursor, limit)
+    return {
+        'items': tree_service.to_children(node.course_id, nodes),
+        'next_cursor': next_cursor
+    }
+
+@router.get("/{node_id}/breadcrumbs", response_model=List[FileNode])
+def get_node_breadcrumbs(
+    node_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    auth_service: AuthorizationService = Depends(get_auth_service)
+):
+    """
+    Get ancestor folders of a node, root first.
+    Requires access to the node's course.
+    """
+    node = _get_accessible_node(db, auth_service, current_user, node_id)
+    return FileTreeService(db).get_ancestors(node)
+
+@router.get("/{node_id}/stats")
+def get_node_stats(
+    node_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    auth_service: AuthorizationService = Depends(get_auth_service)
+):
+    """
+    Get recursive size, file count and folder count under a folder.
+    Requires access to the node's course.
+    """
+    node = _get_accessible_node(db, auth_service, current_user, node_id)
+    return FileTreeService(db).get_subtree_stats(node)
+
+def _get_accessible_node(
+    db: Session,
+    auth_service: AuthorizationService,
+    current_user: User,
+    node_id: int
+) -> FileNodeModel:
+    node = db.query(FileNodeModel).filter(FileNodeModel.id == node_id).first()
+    if not node:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    if not auth_service.can_access_course(current_user, node.course_id):
+        raise HTTPException(status_code=403, detail="Access denied to this file")
+    
+    return node
 
 @router.get("/{file_id}", response_model=FileNode)
 def get_file(
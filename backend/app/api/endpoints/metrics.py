@@ -0,0 +1,62 @@
+"""
+Operational metrics endpoints (admin only)
+"""
+from fastapi import APIRouter, Depends
+from app.models.user import User
+from app.core.dependencies import get_admin_user
+from app.db.database import engine
+from app.db.pool_metrics import get_pool_status
+from app.db.query_metrics import route_metrics
+from app.core.search_index import search_index
+from app.core.suggest_index import suggest_index
+from app.core.search_log_writer import search_log_writer
+from app.core.search_cache import search_cache
+from app.core.text_extraction import text_extraction_pool
+
+router = APIRouter()
+
+@router.get("/db-pool")
+def get_db_pool_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Database connection pool state:
+    checked-out connections, overflow, checkout wait time and timeouts
+    """
+    return get_pool_status(engine)
+
+@router.get("/routes")
+def get_route_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Per-route histograms since startup (or last reset):
+    request latency, DB time and SQL statement count
+    """
+    return route_metrics.snapshot()
+
+@router.delete("/routes")
+def reset_route_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Reset per-route histograms
+    """
+    route_metrics.reset()
+    return {"success": True}
+
+@router.get("/search-index")
+def get_search_index_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    In-memory search and autocomplete index state: build time, document and token counts;
+    search log writer backlog; result cache hit counts; text extraction counters
+    """
+    return {
+        **search_index.get_stats(),
+        'suggest': suggest_index.get_stats(),
+        'log_writer': search_log_writer.get_stats(),
+        'result_cache': search_cache.get_stats(),
+        'text_extraction': text_extraction_pool.get_stats()
+    }
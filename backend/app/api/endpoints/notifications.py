@@ -1,7 +1,7 @@
 """
 Notification API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional
 from pydantic import BaseModel
@@ -24,7 +24,8 @@ class AnnouncementCreate(BaseModel):
 @router.get("/")
 def get_notifications(
     unread_only: bool = False,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -33,13 +34,14 @@ def get_notifications(
     Filtered by course enrollment
     """
     notification_service = NotificationService(db)
-    notifications = notification_service.get_user_notifications(
+    notifications, next_cursor = notification_service.get_user_notifications(
         current_user,
         unread_only,
-        limit
+        limit,
+        cursor
     )
     
-    return {'notifications': notifications}
+    return {'notifications': notifications, 'next_cursor': next_cursor}
 
 @router.get("/unread-count")
 def get_unread_count(
@@ -85,9 +87,29 @@ def create_announcement(
     return {
         'id': result.id,
         'title': result.title,
-        'created_at': result.created_at.isoformat()
+        'created_at': result.created_at.isoformat(),
+        # Large audiences are notified in the background; poll /announcements/{id}/delivery
+        'delivery': notification_service.get_delivery_status(result.id)
     }
 
+@router.get("/announcements/{announcement_id}/delivery")
+def get_announcement_delivery(
+    announcement_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Fan-out progress of an announcement
+    Admin only
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin only"
+        )
+    
+    return NotificationService(db).get_delivery_status(announcement_id)
+
 @router.post("/{notification_id}/read")
 def mark_as_read(
     notification_id: int,
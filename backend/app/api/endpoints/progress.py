@@ -1,30 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from app.db.database import get_db
-from app.models import UserProgress as UserProgressModel, LastViewed as LastViewedModel, User
-from app.schemas import UserProgress, UserProgressCreate, LastViewed, LastViewedCreate
+from app.models import UserProgress as UserProgressModel, LastViewed as LastViewedModel, User, FileNode
+from app.models.progress import ProgressStatus
+from app.schemas import UserProgress, UserProgressCreate, LastViewed, LastViewedCreate, CourseCompletion
 from app.core.dependencies import get_current_user
+from app.services.rollup_service import RollupService
+from app.core.streaming import stream_query
+from app.core.pagination import Keyset, NEXT_CURSOR_HEADER
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
 
 router = APIRouter()
 
+# Columns streamed for progress list responses (same shape as schemas.UserProgress)
+PROGRESS_COLUMNS = (
+    UserProgressModel.id, UserProgressModel.user_id, UserProgressModel.file_id,
+    UserProgressModel.status, UserProgressModel.last_position,
+    UserProgressModel.completed_at, UserProgressModel.updated_at
+)
+PROGRESS_KEYS = [column.key for column in PROGRESS_COLUMNS]
+PROGRESS_KEYSET = Keyset(UserProgressModel.id)
+
 @router.get("/user/{user_id}", response_model=List[UserProgress])
 def get_user_progress(
     user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=5000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get all progress records for a user.
+    Streamed as a JSON array, ordered by id.
+    Next page cursor is returned in the X-Next-Cursor header.
     """
     if current_user.id != user_id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    progress = db.query(UserProgressModel).filter(
-        UserProgressModel.user_id == user_id
-    ).all()
-    return progress
+    statement = select(*PROGRESS_COLUMNS).where(UserProgressModel.user_id == user_id)
+    next_cursor = PROGRESS_KEYSET.next_cursor(db, statement, cursor, limit)
+    
+    return stream_query(
+        PROGRESS_KEYSET.apply(statement, cursor).limit(limit),
+        PROGRESS_KEYS,
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    )
+
+@router.get("/user/{user_id}/courses", response_model=List[CourseCompletion])
+def get_course_completions(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get completion percentage per course for a user (from rollups).
+    """
+    if current_user.id != user_id and not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    return RollupService(db).get_user_completions(user_id)
 
 @router.get("/user/{user_id}/file/{file_id}", response_model=UserProgress)
 def get_progress_for_file(
@@ -61,37 +98,61 @@ def update_progress(
     if current_user.id != progress_data.user_id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Check if progress already exists
-    existing_progress = db.query(UserProgressModel).filter(
-        UserProgressModel.user_id == progress_data.user_id,
-        UserProgressModel.file_id == progress_data.file_id
-    ).first()
+    status = ProgressStatus(progress_data.status)
+    progress_id, previous_status = _upsert_progress(
+        db, progress_data.user_id, progress_data.file_id, status, progress_data.last_position
+    )
     
-    if existing_progress:
-        # Update existing progress
-        existing_progress.status = progress_data.status
-        existing_progress.last_position = progress_data.last_position
-        existing_progress.updated_at = datetime.utcnow()
-        
-        if progress_data.status == "completed":
-            existing_progress.completed_at = datetime.utcnow()
+    was_completed = previous_status == ProgressStatus.COMPLETED
+    is_completed = status == ProgressStatus.COMPLETED
+    if was_completed != is_completed:
+        course_id = db.query(FileNode.course_id).filter(FileNode.id == progress_data.file_id).scalar()
+        if course_id is not None:
+            RollupService(db).record_completion(
+                progress_data.user_id, course_id, 1 if is_completed else -1
+            )
+    
+    db.commit()
+    return db.get(UserProgressModel, progress_id, populate_existing=True)
+
+def _upsert_progress(db: Session, user_id: int, file_id: int, status: ProgressStatus, last_position: Optional[int]):
+    """
+    Insert or update the (user, file) progress row
+    Returns (id, status before this write; None if inserted). The existing row is
+    locked before the upsert so its previous status cannot change underneath.
+    """
+    now = datetime.utcnow()
+    completed_at = now if status == ProgressStatus.COMPLETED else None
+    stmt = insert(UserProgressModel).values(
+        user_id=user_id, file_id=file_id, status=status,
+        last_position=last_position, completed_at=completed_at, updated_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint='uq_user_progress_user_file',
+        set_={
+            'status': stmt.excluded.status,
+            'last_position': stmt.excluded.last_position,
+            'updated_at': stmt.excluded.updated_at,
+            'completed_at': func.coalesce(stmt.excluded.completed_at, UserProgressModel.completed_at)
+        }
+    ).returning(UserProgressModel.id, literal_column("xmax = 0").label("inserted"))
+    
+    while True:
+        previous_status = db.execute(
+            select(UserProgressModel.status).where(
+                UserProgressModel.user_id == user_id,
+                UserProgressModel.file_id == file_id
+            ).with_for_update()
+        ).scalar_one_or_none()
         
-        db.commit()
-        db.refresh(existing_progress)
-        return existing_progress
-    else:
-        # Create new progress
-        new_progress = UserProgressModel(
-            user_id=progress_data.user_id,
-            file_id=progress_data.file_id,
-            status=progress_data.status,
-            last_position=progress_data.last_position,
-            completed_at=datetime.utcnow() if progress_data.status == "completed" else None
-        )
-        db.add(new_progress)
-        db.commit()
-        db.refresh(new_progress)
-        return new_progress
+        savepoint = db.begin_nested()
+        progress_id, inserted = db.execute(stmt).one()
+        if inserted or previous_status is not None:
+            savepoint.commit()
+            return progress_id, previous_status
+        # Another request inserted the row after the locking read; its status is
+        # unknown here, so undo and retry with that row locked
+        savepoint.rollback()
 
 @router.get("/user/{user_id}/last-viewed", response_model=LastViewed)
 def get_last_viewed(
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models import User
@@ -9,7 +9,8 @@ from app.services.reliable_scanner_service import ReliableScannerService
 from app.core.dependencies import get_current_user
 from app.core.rate_limit import check_rate_limit
 from app.core.config import settings
-from typing import List
+from app.core.pagination import NEXT_CURSOR_HEADER
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -101,12 +102,15 @@ def get_scan_status(
 
 @router.get("/history", response_model=List[ScanHistoryResponse])
 def get_scan_history(
-    limit: int = 10,
+    response: Response,
+    limit: int = Query(10, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get scan history (admin only).
+    Newest first; next page cursor in the X-Next-Cursor header.
     """
     if not current_user.is_admin:
         raise HTTPException(
@@ -115,7 +119,11 @@ def get_scan_history(
         )
     
     reliable_scanner = ReliableScannerService(db)
-    return reliable_scanner.get_scan_history(limit)
+    history, next_cursor = reliable_scanner.get_scan_history(limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    return history
 
 @router.get("/root-path", response_model=RootPathResponse)
 def get_root_path(
@@ -149,11 +157,14 @@ def set_root_path(
 @router.get("/logs/{scan_id}")
 def get_scan_logs(
     scan_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get detailed logs for a specific scan.
+    Newest first, one page at a time (pass next_cursor for the next page).
     Admin only.
     """
     if not current_user.is_admin:
@@ -162,25 +173,22 @@ def get_scan_logs(
             detail="Only administrators can view scan logs"
         )
     
-    from app.models.scan_history import ScanError
-    
-    # Get scan errors
-    errors = db.query(ScanError).filter(
-        ScanError.scan_id == scan_id
-    ).order_by(ScanError.occurred_at.desc()).all()
+    reliable_scanner = ReliableScannerService(db)
+    errors, next_cursor = reliable_scanner.get_scan_errors(scan_id, limit, cursor)
     
     return {
         "scan_id": scan_id,
         "errors": [
             {
                 "id": e.id,
-                "path": e.path,
+                "path": e.file_path,
                 "error_type": e.error_type,
                 "error_message": e.error_message,
-                "occurred_at": e.occurred_at.isoformat()
+                "occurred_at": e.created_at.isoformat() if e.created_at else None
             }
             for e in errors
-        ]
+        ],
+        "next_cursor": next_cursor
     }
 
 @router.post("/cleanup")
@@ -4,10 +4,13 @@ Search API endpoints
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 from app.db.database import get_db
 from app.models.user import User
 from app.core.dependencies import get_current_user
-from app.services.search_service import SearchService
+from app.services.search_service import SearchService, file_filters
+from app.services.authorization_service import AuthorizationService
+from app.core.suggest_index import suggest_index
 
 router = APIRouter()
 
@@ -48,23 +51,63 @@ def search_courses(
 @router.get("/files")
 def search_files(
     q: str = Query(..., min_length=1),
-    file_type: Optional[str] = None,
+    file_type: Optional[List[str]] = Query(None),
+    course_id: Optional[List[int]] = Query(None),
+    category_id: Optional[List[int]] = Query(None),
+    min_size: Optional[int] = Query(None, ge=0),
+    max_size: Optional[int] = Query(None, ge=0),
+    added_after: Optional[datetime] = None,
+    added_before: Optional[datetime] = None,
     limit: int = Query(30, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Search files only
-    Optional file_type filter: pdf, doc, video, etc.
+    Search files only, with facet filters and counts
+    file_type (repeatable): pdf, video, document, ... or an extension (mp4) / MIME type.
+    Repeated values of one filter are ORed; different filters are ANDed.
+    """
+    filters = file_filters(file_type, course_id, category_id, min_size, max_size, added_after, added_before)
+    response = SearchService(db).search_files_faceted(q, current_user, filters, limit)
+    response['file_type'] = file_type
+    return response
+
+@router.get("/content")
+def search_content(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Search inside PDFs, EPUBs and text files
+    Best passage per file, with a snippet and highlight offsets
     """
     search_service = SearchService(db)
-    results = search_service.search_files(q, current_user, limit, file_type)
+    results = search_service.search_content(q, current_user, limit)
     
     return {
         'results': results,
         'total': len(results),
-        'query': q,
-        'file_type': file_type
+        'query': q
+    }
+
+@router.get("/suggest")
+def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Autocomplete while typing: course names, file names and popular queries
+    starting with q, tolerating small typos
+    """
+    course_ids = None if current_user.is_admin else AuthorizationService(db).get_enrolled_course_ids(current_user)
+    
+    return {
+        'suggestions': suggest_index.suggest(q, course_ids, limit),
+        'query': q
     }
 
 @router.get("/popular")
@@ -1,45 +1,73 @@
 """
 User management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.database import get_db
 from app.models.user import User
 from app.core.dependencies import get_current_user, get_admin_user
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserWithEnrollments
 from app.core.security import get_password_hash
 from app.models.enrollment import Enrollment
+from app.models.course import Course
+from app.core.enrollment_index import enrollment_index
+from app.core.compression import precompressed_cache, CATEGORIES_NAMESPACE
+from app.core.streaming import stream_query
+from app.core.pagination import Keyset, NEXT_CURSOR_HEADER
+from sqlalchemy import select, func
 
 router = APIRouter()
 
+# Keyset orderings (see app.core.pagination)
+USER_KEYSET = Keyset(User.id)
+ENROLLMENT_KEYSET = Keyset(Enrollment.id)
+
+USER_LIST_COLUMNS = (
+    User.id, User.username, User.email, User.is_admin.label("isAdmin"), User.created_at
+)
+USER_LIST_KEYS = [column.key for column in USER_LIST_COLUMNS] + ["enrollment_count"]
+
+def users_with_enrollment_counts():
+    """Admin user listing with enrollment counts in one aggregated query"""
+    return select(
+        *USER_LIST_COLUMNS,
+        func.count(Enrollment.id).label("enrollment_count")
+    ).outerjoin(
+        Enrollment, Enrollment.user_id == User.id
+    ).group_by(User.id)
+
+def user_enrollments_with_course_names(user_id: int):
+    """A user's enrollments with course names joined in (no per-row lazy load)"""
+    return select(
+        Enrollment.id,
+        Enrollment.course_id,
+        Course.name.label("course_name"),
+        Enrollment.created_at.label("enrolled_at")
+    ).outerjoin(
+        Course, Enrollment.course_id == Course.id
+    ).where(Enrollment.user_id == user_id)
+
 @router.get("/", response_model=List[UserWithEnrollments])
 def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin_user)
 ):
     """
     Get all users (admin only)
+    Streamed as a JSON array, ordered by id.
+    Next page cursor is returned in the X-Next-Cursor header.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
+    statement = users_with_enrollment_counts()
+    next_cursor = USER_KEYSET.next_cursor(db, statement, cursor, limit)
     
-    # Add enrollment count to each user
-    result = []
-    for user in users:
-        enrollments = db.query(Enrollment).filter(Enrollment.user_id == user.id).all()
-        user_dict = {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "isAdmin": user.isAdmin,
-            "created_at": user.created_at,
-            "enrollment_count": len(enrollments)
-        }
-        result.append(user_dict)
-    
-    return result
+    return stream_query(
+        USER_KEYSET.apply(statement, cursor).limit(limit),
+        USER_LIST_KEYS,
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    )
 
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
@@ -181,17 +209,22 @@ def delete_user(
     
     db.delete(user)
     db.commit()
+    enrollment_index.invalidate_user(user_id)
     
     return None
 
 @router.get("/{user_id}/enrollments")
 def get_user_enrollments(
     user_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin_user)
 ):
     """
     Get all enrollments for a user (admin only)
+    Ordered by enrollment id; next page cursor in the X-Next-Cursor header.
     """
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -200,17 +233,17 @@ def get_user_enrollments(
             detail="User not found"
         )
     
-    enrollments = db.query(Enrollment).filter(Enrollment.user_id == user_id).all()
+    enrollments, next_cursor = ENROLLMENT_KEYSET.page(
+        db,
+        user_enrollments_with_course_names(user_id),
+        cursor,
+        limit,
+        scalars=False
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    return [
-        {
-            "id": e.id,
-            "course_id": e.course_id,
-            "course_name": e.course.name if e.course else None,
-            "enrolled_at": e.created_at
-        }
-        for e in enrollments
-    ]
+    return [dict(row._mapping) for row in enrollments]
 
 @router.post("/{user_id}/enrollments/{course_id}", status_code=status.HTTP_201_CREATED)
 def enroll_user_in_course(
@@ -222,8 +255,6 @@ def enroll_user_in_course(
     """
     Enroll a user in a course (admin only)
     """
-    from app.models.course import Course
-    
     # Check if user exists
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -259,8 +290,11 @@ def enroll_user_in_course(
     )
     
     db.add(enrollment)
+    enrollment_index.bump_version(db, user_id)
     db.commit()
     db.refresh(enrollment)
+    enrollment_index.add(user_id, course_id)
+    precompressed_cache.bump(CATEGORIES_NAMESPACE)
     
     return {
         "id": enrollment.id,
@@ -291,6 +325,9 @@ def unenroll_user_from_course(
         )
     
     db.delete(enrollment)
+    enrollment_index.bump_version(db, user_id)
     db.commit()
+    enrollment_index.remove(user_id, course_id)
+    precompressed_cache.bump(CATEGORIES_NAMESPACE)
     
     return None
@@ -0,0 +1,5 @@
+"""
+Load, benchmark and query-plan check scripts
+
+Run against a live server, e.g.: python -m app.benchmarks.async_reads --help
+"""
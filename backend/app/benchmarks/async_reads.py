@@ -0,0 +1,123 @@
+"""
+Benchmark: sync (threadpool) vs async (AsyncSession) read endpoints
+
+Start two servers from the same database, one with ASYNC_DB_ENABLED=false
+and one with ASYNC_DB_ENABLED=true, then:
+
+Run: python -m app.benchmarks.async_reads \\
+        --sync-url http://localhost:8000 --async-url http://localhost:8001 \\
+        --token <access token> --clients 500 --duration 30
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    "/api/categories/",
+    "/api/courses/",
+    "/api/search/?q=intro",
+    "/api/notifications/unread-count",
+]
+
+
+class Result:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.status: Dict[int, int] = {}
+
+
+async def _request(host: str, port: int, path: str, token: str) -> int:
+    """Single HTTP/1.1 GET on a fresh connection, returns status code"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            f"Authorization: Bearer {token}\r\n"
+            f"Connection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()  # drain body
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def _client(host: str, port: int, paths: List[str], token: str, deadline: float, result: Result):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            code = await _request(host, port, path, token)
+            result.status[code] = result.status.get(code, 0) + 1
+            if code >= 400:
+                result.errors += 1
+        except (OSError, ValueError, IndexError):
+            result.errors += 1
+            continue
+        result.latencies.append(time.perf_counter() - start)
+
+
+async def run(base_url: str, paths: List[str], token: str, clients: int, duration: float) -> Result:
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    prefix = url.path.rstrip("/")
+    full_paths = [prefix + p for p in paths]
+
+    result = Result()
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*[
+        _client(host, port, full_paths, token, deadline, result)
+        for _ in range(clients)
+    ])
+    return result
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def report(label: str, result: Result, duration: float):
+    latencies = sorted(result.latencies)
+    print(f"\n{label}")
+    print(f"  requests:   {len(latencies)}  errors: {result.errors}  status: {result.status}")
+    print(f"  throughput: {len(latencies) / duration:.1f} req/s")
+    if latencies:
+        print(
+            f"  latency ms: mean {statistics.mean(latencies) * 1000:.1f}"
+            f"  p50 {_percentile(latencies, 50) * 1000:.1f}"
+            f"  p95 {_percentile(latencies, 95) * 1000:.1f}"
+            f"  p99 {_percentile(latencies, 99) * 1000:.1f}"
+        )
+
+
+async def main(args):
+    paths = args.path or DEFAULT_PATHS
+    print(f"Clients: {args.clients}  Duration: {args.duration}s  Paths: {paths}")
+
+    for label, url in (("sync", args.sync_url), ("async", args.async_url)):
+        if not url:
+            continue
+        result = await run(url, paths, args.token, args.clients, args.duration)
+        report(f"{label} ({url})", result, args.duration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sync vs async read endpoint throughput")
+    parser.add_argument("--sync-url", help="Server with ASYNC_DB_ENABLED=false")
+    parser.add_argument("--async-url", help="Server with ASYNC_DB_ENABLED=true")
+    parser.add_argument("--token", required=True, help="Bearer access token")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--path", action="append", help="Endpoint path (repeatable)")
+    asyncio.run(main(parser.parse_args()))
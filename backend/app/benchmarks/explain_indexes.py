@@ -0,0 +1,70 @@
+"""
+Check that hot queries are served by an index (EXPLAIN)
+
+Sequential scans are disabled for the session so the check does not depend
+on table size: if the planner still cannot avoid a Seq Scan on the table,
+no usable index exists. Exits non-zero if any query fails.
+
+Run after app.migrations.add_hot_query_indexes:
+Run: python -m app.benchmarks.explain_indexes
+"""
+import json
+import sys
+from sqlalchemy import text
+from app.db.database import engine
+
+# (name, table that must be index-scanned, SQL)
+HOT_QUERIES = [
+    ("files by course", "file_nodes",
+     "SELECT * FROM file_nodes WHERE course_id = 1"),
+    ("children of folder", "file_nodes",
+     "SELECT * FROM file_nodes WHERE parent_id = 1"),
+    ("course root level", "file_nodes",
+     "SELECT * FROM file_nodes WHERE course_id = 1 AND parent_id IS NULL "
+     "ORDER BY is_directory DESC, name LIMIT 101"),
+    ("subtree by path prefix", "file_nodes",
+     "SELECT * FROM file_nodes WHERE tree_path LIKE '/1/2/%'"),
+    ("progress lookup", "user_progress",
+     "SELECT * FROM user_progress WHERE user_id = 1 AND file_id = 1"),
+    ("unread notifications", "user_notifications",
+     "SELECT count(*) FROM user_notifications WHERE user_id = 1 AND is_read = FALSE"),
+    ("popular searches", "search_logs",
+     "SELECT query, count(id) FROM search_logs GROUP BY query ORDER BY count(id) DESC LIMIT 10"),
+    ("recent searches", "search_logs",
+     "SELECT * FROM search_logs WHERE user_id = 1 ORDER BY created_at DESC LIMIT 5"),
+    ("courses in category", "courses",
+     "SELECT * FROM courses WHERE category_id = 1 ORDER BY name"),
+    ("course name search", "courses",
+     "SELECT * FROM courses WHERE lower(name) LIKE '%intro%'"),
+    ("file name search", "file_nodes",
+     "SELECT * FROM file_nodes WHERE is_directory = FALSE AND lower(name) LIKE '%intro%'"),
+]
+
+def _scans(plan: dict):
+    """Yield (node type, relation) for every scan node in a JSON plan"""
+    if 'Relation Name' in plan:
+        yield plan['Node Type'], plan['Relation Name']
+    for child in plan.get('Plans', []):
+        yield from _scans(child)
+
+def check() -> bool:
+    ok = True
+    
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        
+        for name, table, sql in HOT_QUERIES:
+            raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]['Plan']
+            scans = [node for node, relation in _scans(plan) if relation == table]
+            passed = bool(scans) and all(node != 'Seq Scan' for node in scans)
+            ok = ok and passed
+            
+            print(f"{'✓' if passed else '✗'} {name}: {', '.join(scans) or 'no scan on ' + table}")
+        
+        conn.rollback()
+    
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)
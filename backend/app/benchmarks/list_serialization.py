@@ -0,0 +1,166 @@
+"""
+Benchmark: ORM + Pydantic list responses vs streamed column tuples + orjson
+vs the compact columnar tree format
+
+Builds a synthetic course with N file nodes (100 per folder) in an in-memory
+SQLite database and serializes it each way, reporting peak traced memory,
+latency and body size. Also checks all paths decode to the same nodes.
+
+Run: python -m app.benchmarks.list_serialization --nodes 20000
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models import Category, Course, FileNode as FileNodeModel
+from app.schemas import FileNode
+from app.core.streaming import encode_json_array
+from app.api.endpoints.files import FILE_NODE_COLUMNS, FILE_NODE_KEYS
+from app.services.file_tree_service import FileTreeService
+import orjson
+
+
+def build_database(nodes: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        Category.__table__, Course.__table__, FileNodeModel.__table__
+    ])
+    db = sessionmaker(bind=engine)()
+
+    category = Category(name="Courses", path="/data/Courses")
+    db.add(category)
+    db.flush()
+    course = Course(name="Big Course", path="/data/Courses/Big Course", category_id=category.id)
+    db.add(course)
+    db.flush()
+
+    now = datetime.utcnow()
+    folders = []
+    for m in range((nodes + 99) // 100):
+        folder = FileNodeModel(
+            course_id=course.id,
+            name=f"module_{m:03d}",
+            path=os.path.join(course.path, f"module_{m:03d}"),
+            file_type="folder",
+            is_directory=True,
+            created_at=now
+        )
+        folders.append(folder)
+    db.add_all(folders)
+    db.flush()
+
+    db.bulk_insert_mappings(FileNodeModel, [
+        {
+            "course_id": course.id,
+            "name": f"lecture_{i:05d}.pdf",
+            "path": os.path.join(folders[i // 100].path, f"lecture_{i:05d}.pdf"),
+            "file_type": ("pdf", "video", "text")[i % 3],
+            "parent_id": folders[i // 100].id,
+            "is_directory": False,
+            "size": 1024 * i,
+            "created_at": now,
+            "child_count": 0
+        }
+        for i in range(nodes - len(folders))
+    ])
+    db.commit()
+    return db, course.id, course.path
+
+
+def orm_pydantic(db, course_id: int) -> bytes:
+    """Previous path: ORM objects -> response_model validation -> json"""
+    files = db.query(FileNodeModel).filter(FileNodeModel.course_id == course_id).all()
+    models = TypeAdapter(List[FileNode]).validate_python(files, from_attributes=True)
+    return json.dumps(jsonable_encoder(models), separators=(",", ":")).encode()
+
+
+def streamed(db, course_id: int, chunk_size: int) -> bytes:
+    """New path: column tuples -> orjson chunks"""
+    result = db.execute(
+        select(*FILE_NODE_COLUMNS).where(FileNodeModel.course_id == course_id),
+        execution_options={"yield_per": chunk_size}
+    )
+    return b"".join(encode_json_array(result, FILE_NODE_KEYS, chunk_size=chunk_size))
+
+
+def compact(db, course_id: int, base_path: str) -> bytes:
+    """Columnar tree payload"""
+    return orjson.dumps(FileTreeService(db).get_compact_tree(course_id, base_path))
+
+
+def decode_compact(payload: dict) -> List[dict]:
+    """Reference decoder (mirrors FileService.decodeCompactTree in the frontend)"""
+    nodes = []
+    node_id = 0
+    for i in range(payload["count"]):
+        node_id += payload["id"][i]
+        parent = i - payload["parent"][i] if payload["parent"][i] else None
+        parent_path = nodes[parent]["path"] if parent is not None else payload["base_path"]
+        if str(i) in payload["abs"]:
+            path = payload["abs"][str(i)]
+        elif str(i) in payload["path"]:
+            path = parent_path + payload["path"][str(i)]
+        else:
+            path = parent_path + payload["sep"] + payload["name"][i]
+        nodes.append({
+            "id": node_id,
+            "parent_id": nodes[parent]["id"] if parent is not None else None,
+            "name": payload["name"][i],
+            "path": path,
+            "file_type": payload["types"][payload["type"][i]],
+            "is_directory": bool(payload["dir"][i]),
+            "size": payload["size"][i],
+        })
+    return nodes
+
+
+def measure(label: str, func, *args):
+    func(*args)  # warm up
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    body = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<16} {elapsed * 1000:9.1f} ms   peak {peak / 1024 / 1024:8.1f} MB   body {len(body) / 1024:9.1f} KB")
+    return body
+
+
+def main(args):
+    db, course_id, base_path = build_database(args.nodes)
+    print(f"Nodes: {args.nodes}  Chunk size: {args.chunk_size}\n")
+
+    before = measure("orm + pydantic", orm_pydantic, db, course_id)
+    db.expunge_all()
+    after = measure("streamed orjson", streamed, db, course_id, args.chunk_size)
+    db.expunge_all()
+    columnar = measure("compact tree", compact, db, course_id, base_path)
+
+    # orjson keeps microseconds the same way; compare parsed documents
+    same = json.loads(before) == json.loads(after)
+    print(f"\nIdentical responses: {same}")
+
+    keys = ("id", "parent_id", "name", "path", "file_type", "is_directory", "size")
+    flat = sorted((tuple(node[k] for k in keys) for node in json.loads(after)))
+    decoded = sorted((tuple(node[k] for k in keys) for node in decode_compact(orjson.loads(columnar))))
+    print(f"Compact tree decodes to same nodes: {flat == decoded}")
+    print(f"Compact size ratio: {len(after) / len(columnar):.1f}x smaller")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare list serialization paths")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    main(parser.parse_args())
@@ -0,0 +1,123 @@
+"""
+N+1 regression check for admin listings
+
+Seeds an in-memory SQLite database at two sizes and runs each listing under
+assert_max_queries. The statement count must stay within budget and must not
+grow with the number of rows. Exits non-zero if any listing fails.
+
+Run: python -m app.benchmarks.query_counts
+"""
+import asyncio
+import sys
+from typing import Callable, Dict, List, Tuple
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database import Base, SessionLocal
+from app.models import Category, Course, User
+from app.models.enrollment import Enrollment
+from app.schemas.enrollment import EnrollmentResponse
+from app.core.query_counter import assert_max_queries
+from app.api.endpoints import users, enrollments
+
+SIZES = (10, 200)
+COURSES = 5
+
+
+def build_database(user_count: int):
+    # One shared connection: streamed listings read from their own session on a worker thread
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    SessionLocal.configure(bind=engine)
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Category.__table__, Course.__table__, Enrollment.__table__
+    ])
+    db = sessionmaker(bind=engine)()
+
+    category = Category(name="Courses", path="/data/Courses")
+    db.add(category)
+    db.flush()
+    courses = [
+        Course(name=f"Course {c}", path=f"/data/Courses/Course {c}", category_id=category.id)
+        for c in range(COURSES)
+    ]
+    db.add_all(courses)
+    admin = User(username="admin", email="admin@example.com", hashed_password="x", is_admin=True)
+    db.add(admin)
+    db.flush()
+
+    for u in range(user_count):
+        user = User(username=f"user{u}", email=f"user{u}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all([Enrollment(user_id=user.id, course_id=course.id) for course in courses[:3]])
+    db.commit()
+
+    # Listings must not rely on objects already loaded in the identity map
+    db.expire_all()
+    return engine, db, admin
+
+
+async def read_body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def list_users(db, admin) -> int:
+    response = users.get_all_users(cursor=None, limit=100, db=db, current_user=admin)
+    return len(asyncio.run(read_body(response)))
+
+
+def list_user_enrollments(db, admin) -> int:
+    return len(users.get_user_enrollments(
+        user_id=admin.id + 1, response=Response(), cursor=None, limit=500, db=db, current_user=admin
+    ))
+
+
+def list_course_enrollments(db, admin) -> int:
+    page = enrollments.get_course_enrollments(
+        course_id=1, response=Response(), cursor=None, limit=500, db=db, current_user=admin
+    )
+    return len(TypeAdapter(List[EnrollmentResponse]).dump_python(page, mode="json"))
+
+
+# (name, listing, max queries)
+LISTINGS: List[Tuple[str, Callable, int]] = [
+    ("admin user listing", list_users, 2),
+    ("user enrollments", list_user_enrollments, 2),
+    ("course enrollments", list_course_enrollments, 1),
+]
+
+
+def check() -> bool:
+    ok = True
+    counts: Dict[str, List[int]] = {name: [] for name, _, _ in LISTINGS}
+
+    for size in SIZES:
+        engine, db, admin = build_database(size)
+        admin_id = admin.id
+        for name, listing, max_queries in LISTINGS:
+            # Authenticated user is loaded before the endpoint runs
+            admin = db.get(User, admin_id)
+            try:
+                with assert_max_queries(engine, max_queries, name) as counter:
+                    listing(db, admin)
+            except AssertionError as e:
+                print(f"✗ {e}")
+                ok = False
+            counts[name].append(counter.count)
+        db.close()
+
+    for name, per_size in counts.items():
+        constant = len(set(per_size)) == 1
+        ok = ok and constant
+        sizes = ", ".join(f"{size} users: {count}" for size, count in zip(SIZES, per_size))
+        print(f"{'✓' if constant else '✗'} {name}: {sizes} queries")
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)
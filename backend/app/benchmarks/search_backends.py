@@ -0,0 +1,453 @@
+"""
+Benchmark: search backends under load, and their relevance
+
+Seeds a synthetic catalog (1M file nodes by default) into the configured
+database, then for each backend (sql LIKE, in-memory index, and postgres
+full-text when the search vectors exist):
+
+- replays a query log through SearchService.search_all at each concurrency
+  level and reports p50/p95/p99 latency, QPS and peak RSS
+- runs a labeled relevance set through search_files and reports mean
+  precision and recall per query kind (exact, reordered, prefix, typo)
+
+The query log is sampled from the catalog vocabulary, read from a file (one
+query per line) or taken from SearchLog of another database (--log-url).
+Runs offline against SQLite or a local PostgreSQL; point DATABASE_URL at a
+scratch database, the catalog is only seeded where no real files exist.
+
+Run: DATABASE_URL=sqlite:///./search_bench.db \\
+        python -m app.benchmarks.search_backends --files 1000000 --concurrency 1,8,32
+"""
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, func, insert, inspect, select
+
+from app.core.config import settings
+from app.core.file_types import EXTENSIONS
+from app.core.search_cache import search_cache
+from app.core.search_index import search_index
+from app.core.search_log_writer import search_log_writer
+from app.db.database import Base, SessionLocal, engine
+from app.models import Category, Course, FileNode, User
+from app.models.document_text import DocumentChunk, DocumentText
+from app.models.enrollment import Enrollment
+from app.models.search import SearchLog, SearchQueryDaily
+from app.services.search_service import SearchService
+
+BENCH_ROOT = "/bench"
+CATEGORIES = ["Courses", "Books", "Novels", "Pictures"]
+KINDS = ["lecture", "notes", "exercise", "slides", "lab", "solution", "reading"]
+# Weighted towards what course folders actually hold
+EXTENSION_WEIGHTS = {'pdf': 30, 'mp4': 20, 'docx': 8, 'pptx': 8, 'txt': 6, 'md': 4, 'epub': 3,
+                     'mp3': 5, 'jpg': 6, 'png': 4, 'zip': 2, 'py': 3, 'ipynb': 1}
+FOLDERS_PER_COURSE = 14
+FILES_PER_COURSE = 5000
+BATCH_SIZE = 10000
+
+# Labeled relevance set: planted "<a> <b> ..." files are the relevant ones;
+# distractors share only one of the two words. Neither word is in the vocabulary.
+TOPICS = [
+    ("fourier", "transform"), ("eigenvalue", "decomposition"), ("bayesian", "inference"),
+    ("entropy", "ensemble"), ("graph", "coloring"), ("gradient", "descent"),
+    ("laplace", "equation"), ("markov", "chain"), ("quantum", "tunneling"),
+    ("protein", "folding"), ("supply", "elasticity"), ("renaissance", "painting"),
+    ("photosynthesis", "pathway"), ("tectonic", "plates"), ("compiler", "optimization"),
+    ("hash", "collision"), ("neural", "network"), ("cellular", "automaton"),
+    ("linear", "regression"), ("orbital", "mechanics"),
+]
+RELEVANT_PER_TOPIC = (5, 40)
+DISTRACTORS_PER_WORD = 30
+RELEVANCE_LIMIT = 50
+
+
+def build_vocabulary(rng: random.Random, size: int) -> List[str]:
+    """Pronounceable pseudo-words, none colliding with the labeled topic words"""
+    onsets = ["b", "br", "c", "ch", "d", "f", "g", "gr", "k", "l", "m", "n", "p", "pl", "r", "s", "st", "t", "tr", "v", "z"]
+    vowels = ["a", "e", "i", "o", "u", "ai", "ea", "io", "ou"]
+    codas = ["", "n", "r", "s", "l", "m", "x", "nd", "st", "rt"]
+    reserved = {word for topic in TOPICS for word in topic} | set(KINDS)
+    words = set()
+    while len(words) < size:
+        word = "".join(rng.choice(onsets) + rng.choice(vowels) for _ in range(rng.randint(2, 3))) + rng.choice(codas)
+        if word not in reserved:
+            words.add(word)
+    return sorted(words)
+
+
+def zipf_choice(rng: random.Random, words: List[str]) -> str:
+    """Word with a roughly Zipfian frequency (a few very common, a long tail)"""
+    return words[min(int(rng.paretovariate(1.1)) - 1, len(words) - 1)]
+
+
+def _file_row(course_id: int, folder: Tuple[int, str], name: str, ext: str, now: datetime, rng: random.Random) -> dict:
+    return {
+        "course_id": course_id,
+        "name": f"{name}.{ext}",
+        "path": f"{folder[1]}/{name}.{ext}",
+        "file_type": EXTENSIONS[ext][0],
+        "parent_id": folder[0],
+        "is_directory": False,
+        "size": rng.randint(1_000, 500_000_000),
+        "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 720)),
+        "child_count": 0
+    }
+
+
+def seed_catalog(files: int, seed: int) -> List[str]:
+    """Create the synthetic catalog (or reuse it); returns the vocabulary"""
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(rng, 5000)
+
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Category.__table__, Course.__table__, FileNode.__table__, Enrollment.__table__,
+        SearchLog.__table__, SearchQueryDaily.__table__, DocumentText.__table__, DocumentChunk.__table__
+    ])
+    db = SessionLocal()
+    try:
+        existing = db.execute(select(func.count()).select_from(FileNode)).scalar()
+        seeded = db.execute(select(Category.id).where(Category.path.like(f"{BENCH_ROOT}/%"))).first()
+        if existing and not seeded:
+            sys.exit("Refusing to seed: file_nodes has rows that are not a benchmark catalog (use a scratch DATABASE_URL)")
+        if seeded:
+            print(f"Reusing benchmark catalog: {existing} file nodes")
+            return vocabulary
+
+        start = time.perf_counter()
+        now = datetime.utcnow()
+        categories = [Category(name=name, path=f"{BENCH_ROOT}/{name}") for name in CATEGORIES]
+        db.add_all(categories)
+        db.flush()
+
+        course_count = max(files // FILES_PER_COURSE, len(TOPICS))
+        courses = []
+        for c in range(course_count):
+            category = categories[c % len(categories)]
+            name = f"{zipf_choice(rng, vocabulary).title()} {rng.choice(['101', '201', 'Advanced', 'Seminar', 'Lab'])} {c}"
+            courses.append(Course(name=name, path=f"{category.path}/{name}", category_id=category.id))
+        db.add_all(courses)
+        db.flush()
+
+        db.execute(insert(FileNode), [
+            {
+                "course_id": course.id,
+                "name": f"week_{w:02d}",
+                "path": f"{course.path}/week_{w:02d}",
+                "file_type": "folder",
+                "is_directory": True,
+                "created_at": now,
+                "child_count": 0
+            }
+            for course in courses for w in range(FOLDERS_PER_COURSE)
+        ])
+        folders = defaultdict(list)
+        for folder_id, course_id, path in db.execute(
+            select(FileNode.id, FileNode.course_id, FileNode.path).where(FileNode.is_directory == True)
+        ):
+            folders[course_id].append((folder_id, path))
+
+        extensions, weights = zip(*EXTENSION_WEIGHTS.items())
+        course_ids = [course.id for course in courses]
+
+        def random_file(i: int) -> dict:
+            course_id = rng.choice(course_ids)
+            words = " ".join(zipf_choice(rng, vocabulary) for _ in range(rng.randint(1, 3)))
+            name = f"{words} {rng.choice(KINDS)} {i}"
+            return _file_row(course_id, rng.choice(folders[course_id]), name, rng.choices(extensions, weights)[0], now, rng)
+
+        # Planted relevance rows first (kept out of the random rows' budget)
+        planted = []
+        for a, b in TOPICS:
+            for i in range(rng.randint(*RELEVANT_PER_TOPIC)):
+                course_id = rng.choice(course_ids)
+                planted.append(_file_row(course_id, rng.choice(folders[course_id]), f"{a} {b} {rng.choice(KINDS)} {i}", "pdf", now, rng))
+            for word in (a, b):
+                for i in range(DISTRACTORS_PER_WORD):
+                    course_id = rng.choice(course_ids)
+                    name = f"{word} {zipf_choice(rng, vocabulary)} {rng.choice(KINDS)} {i}"
+                    planted.append(_file_row(course_id, rng.choice(folders[course_id]), name, "pdf", now, rng))
+        db.execute(insert(FileNode), planted)
+
+        remaining = files - len(planted) - len(course_ids) * FOLDERS_PER_COURSE
+        for offset in range(0, max(remaining, 0), BATCH_SIZE):
+            db.execute(insert(FileNode), [random_file(i) for i in range(offset, min(offset + BATCH_SIZE, remaining))])
+            db.commit()
+            if offset and offset % (BATCH_SIZE * 20) == 0:
+                print(f"  seeded {offset}/{remaining} files")
+
+        admin = User(username="bench_admin", email="bench_admin@example.com", hashed_password="x", is_admin=True)
+        student = User(username="bench_student", email="bench_student@example.com", hashed_password="x")
+        db.add_all([admin, student])
+        db.flush()
+        # Student enrolled in a quarter of the courses (scoped searches)
+        db.execute(insert(Enrollment), [
+            {"user_id": student.id, "course_id": course_id, "role": "student", "created_at": now}
+            for course_id in rng.sample(course_ids, max(len(course_ids) // 4, 1))
+        ])
+        db.commit()
+        print(f"Seeded {course_count} courses, {files} file nodes in {time.perf_counter() - start:.1f}s")
+        return vocabulary
+    finally:
+        db.close()
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """Swap two adjacent inner letters (edit distance 1 for Damerau, 2 otherwise)"""
+    if len(word) < 4:
+        return word
+    i = rng.randint(1, len(word) - 3)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def sample_queries(vocabulary: List[str], count: int, seed: int) -> List[str]:
+    """Query log shaped like typed searches: single words, pairs, prefixes, typos, type filters"""
+    rng = random.Random(seed + 1)
+    queries = []
+    for _ in range(count):
+        word = zipf_choice(rng, vocabulary)
+        roll = rng.random()
+        if roll < 0.55:
+            queries.append(word)
+        elif roll < 0.75:
+            queries.append(f"{word} {zipf_choice(rng, vocabulary)}")
+        elif roll < 0.87:
+            queries.append(word[:rng.randint(3, max(len(word) - 1, 3))])
+        elif roll < 0.95:
+            queries.append(typo(word, rng))
+        else:
+            queries.append(f"{word} {rng.choice(['pdf', 'video', 'slides'])}")
+    return queries
+
+
+def load_queries(args, vocabulary: List[str]) -> List[str]:
+    if args.query_file:
+        with open(args.query_file, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    elif args.log_url:
+        log_engine = create_engine(args.log_url)
+        with log_engine.connect() as conn:
+            queries = list(conn.execute(
+                select(SearchLog.query).order_by(SearchLog.created_at.desc()).limit(args.queries)
+            ).scalars())
+        log_engine.dispose()
+    else:
+        queries = sample_queries(vocabulary, args.queries, args.seed)
+    return queries[:args.queries]
+
+
+def relevance_set(seed: int) -> List[Tuple[str, str, Tuple[str, str]]]:
+    """(kind, query, topic) for every labeled topic"""
+    rng = random.Random(seed + 2)
+    cases = []
+    for a, b in TOPICS:
+        cases.append(("exact", f"{a} {b}", (a, b)))
+        cases.append(("reordered", f"{b} {a}", (a, b)))
+        cases.append(("prefix", f"{a} {b[:max(len(b) - 3, 3)]}", (a, b)))
+        cases.append(("typo", f"{a} {typo(b, rng)}", (a, b)))
+    return cases
+
+
+class RssSampler:
+    """Peak resident set size while a block runs (sampled every 20 ms from /proc)"""
+
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.peak = rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(0.02):
+            self.peak = max(self.peak, rss_bytes())
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:  # not Linux: lifetime peak is the best available
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def replay(queries: List[str], user_id: int, concurrency: int, limit: int) -> Tuple[List[float], float, int]:
+    """Run every query once across `concurrency` threads; returns (latencies, wall seconds, errors)"""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    position = iter(range(len(queries)))
+
+    def worker():
+        nonlocal errors
+        db = SessionLocal()
+        service = SearchService(db)
+        user = db.get(User, user_id)
+        local, failed = [], 0
+        try:
+            for i in position:
+                start = time.perf_counter()
+                try:
+                    service.search_all(queries[i], user, limit)
+                except Exception:
+                    db.rollback()
+                    failed += 1
+                    continue
+                local.append(time.perf_counter() - start)
+        finally:
+            db.close()
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return latencies, time.perf_counter() - start, errors
+
+
+def evaluate_relevance(user_id: int, seed: int) -> Dict[str, Tuple[float, float]]:
+    """Mean (precision, recall) per query kind on the labeled set, within the user's scope"""
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        service = SearchService(db)
+        scope = None if user.is_admin else set(service.auth_service.get_enrolled_course_ids(user))
+        scores = defaultdict(list)
+        for kind, query, (a, b) in relevance_set(seed):
+            relevant_stmt = select(FileNode.id).where(FileNode.name.like(f"{a} {b} %"))
+            if scope is not None:
+                relevant_stmt = relevant_stmt.where(FileNode.course_id.in_(scope))
+            relevant = set(db.execute(relevant_stmt).scalars())
+            returned = [result['id'] for result in service.search_files(query, user, RELEVANCE_LIMIT)]
+            hits = len(relevant.intersection(returned))
+            precision = hits / len(returned) if returned else (1.0 if not relevant else 0.0)
+            recall = hits / len(relevant) if relevant else 1.0
+            scores[kind].append((precision, recall))
+        return {
+            kind: (statistics.mean(p for p, _ in pairs), statistics.mean(r for _, r in pairs))
+            for kind, pairs in scores.items()
+        }
+    finally:
+        db.close()
+
+
+def available_backends(requested: List[str]) -> List[str]:
+    backends = []
+    for backend in requested:
+        if backend == "postgres":
+            if engine.dialect.name != "postgresql":
+                print("Skipping postgres backend: needs a PostgreSQL DATABASE_URL")
+                continue
+            columns = {column["name"] for column in inspect(engine).get_columns("file_nodes")}
+            if "search_vector" not in columns:
+                print("Skipping postgres backend: run app.migrations.add_search_vectors first")
+                continue
+        backends.append(backend)
+    return backends
+
+
+def prepare_backend(backend: str) -> Optional[dict]:
+    """Select the backend; the index is built here and its build time/memory reported"""
+    settings.SEARCH_BACKEND = backend
+    search_cache.bump()
+    if backend != "index":
+        return None
+
+    gc.collect()
+    before = rss_bytes()
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        search_index.build(db)
+    finally:
+        db.close()
+    gc.collect()
+    return {'seconds': time.perf_counter() - start, 'rss_mb': (rss_bytes() - before) / 1024 / 1024}
+
+
+def main(args):
+    vocabulary = seed_catalog(args.files, args.seed)
+    queries = load_queries(args, vocabulary)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    # Measure the backends, not the result cache or search logging
+    if not args.with_cache:
+        search_cache.max_entries = 0
+    search_log_writer.max_pending = 0
+
+    db = SessionLocal()
+    user = db.execute(select(User).where(User.username == f"bench_{args.user}")).scalar_one()
+    user_id = user.id
+    db.close()
+
+    print(f"\nQueries: {len(queries)}  User: {args.user}  Limit: {args.limit}  Cache: {args.with_cache}")
+    relevance = {}
+    for backend in available_backends(args.backends.split(",")):
+        build = prepare_backend(backend)
+        print(f"\n[{backend}]")
+        if build:
+            print(f"  index build {build['seconds']:.1f}s  +{build['rss_mb']:.0f} MB RSS")
+
+        replay(queries[:min(len(queries), 50)], user_id, 1, args.limit)  # warm up caches and pools
+        for concurrency in levels:
+            with RssSampler() as rss:
+                latencies, wall, errors = replay(queries, user_id, concurrency, args.limit)
+            latencies.sort()
+            print(
+                f"  c={concurrency:<3} {len(latencies) / wall:8.1f} qps"
+                f"   p50 {percentile(latencies, 50) * 1000:7.1f}"
+                f"  p95 {percentile(latencies, 95) * 1000:7.1f}"
+                f"  p99 {percentile(latencies, 99) * 1000:7.1f} ms"
+                f"   peak RSS {rss.peak / 1024 / 1024:6.0f} MB   errors {errors}"
+            )
+        relevance[backend] = evaluate_relevance(user_id, args.seed)
+
+    print(f"\nRelevance (mean precision / recall, top {RELEVANCE_LIMIT})")
+    kinds = ["exact", "reordered", "prefix", "typo"]
+    print("  " + "backend".ljust(10) + "".join(kind.rjust(16) for kind in kinds))
+    for backend, scores in relevance.items():
+        print("  " + backend.ljust(10) + "".join(
+            f"{scores[kind][0]:7.2f} / {scores[kind][1]:4.2f}".rjust(16) for kind in kinds
+        ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search backend load and relevance benchmark")
+    parser.add_argument("--files", type=int, default=1_000_000, help="File nodes in the synthetic catalog")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries replayed per concurrency level")
+    parser.add_argument("--query-file", help="Replay these queries (one per line) instead of sampling")
+    parser.add_argument("--log-url", help="Replay the latest SearchLog queries from this database")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated thread counts")
+    parser.add_argument("--backends", default="sql,index,postgres")
+    parser.add_argument("--user", choices=["admin", "student"], default="student")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--with-cache", action="store_true", help="Keep the search result cache on")
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
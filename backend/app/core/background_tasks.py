@@ -73,6 +73,7 @@ class BackgroundTaskManager:
     
     def __init__(self):
         self.tasks: Dict[str, BackgroundTask] = {}
+        self.periodic_tasks: Dict[str, Dict[str, Any]] = {}
         self.lock = threading.Lock()
         self.shutdown_event = threading.Event()
         self.monitor_thread: Optional[threading.Thread] = None
@@ -113,6 +114,7 @@ class BackgroundTaskManager:
         def monitor():
             while not self.shutdown_event.is_set():
                 self._check_heartbeats()
+                self._run_due_periodic_tasks()
                 time.sleep(10)  # Check every 10 seconds
         
         self.monitor_thread = threading.Thread(target=monitor, daemon=True)
@@ -129,6 +131,54 @@ class BackgroundTaskManager:
                         task.error = "Task heartbeat timeout"
                         task.completed_at = datetime.utcnow()
     
+    def register_periodic_task(
+        self,
+        task_id: str,
+        task_type: str,
+        task_func: Callable,
+        interval_seconds: int,
+        run_immediately: bool = False
+    ):
+        """
+        Register a task to be submitted every interval_seconds
+        
+        Checked by the monitor thread, so granularity is ~10 seconds.
+        A run is skipped if the previous one is still in progress.
+        """
+        first_run = datetime.utcnow()
+        if not run_immediately:
+            first_run += timedelta(seconds=interval_seconds)
+        
+        with self.lock:
+            self.periodic_tasks[task_id] = {
+                'task_type': task_type,
+                'task_func': task_func,
+                'interval_seconds': interval_seconds,
+                'next_run': first_run
+            }
+    
+    def _run_due_periodic_tasks(self):
+        """Submit periodic tasks whose next run time has passed"""
+        now = datetime.utcnow()
+        
+        with self.lock:
+            due = [
+                (task_id, entry) for task_id, entry in self.periodic_tasks.items()
+                if entry['next_run'] <= now
+            ]
+            for task_id, entry in due:
+                entry['next_run'] = now + timedelta(seconds=entry['interval_seconds'])
+        
+        for task_id, entry in due:
+            try:
+                self.submit_task(
+                    task_id=task_id,
+                    task_type=entry['task_type'],
+                    task_func=entry['task_func']
+                )
+            except ValueError:
+                print(f"Periodic task {task_id} still running - skipping this run")
+    
     def submit_task(
         self,
         task_id: str,
@@ -0,0 +1,380 @@
+"""
+Negotiated response compression and a precompressed byte cache
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+import threading
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Server preference when the client accepts several encodings equally
+ENCODINGS = [
+    name for name, available in (
+        ('zstd', zstandard is not None),
+        ('br', brotli is not None),
+        ('gzip', True)
+    ) if available
+]
+
+# (on-the-fly level, precompressed level) per encoding
+LEVELS = {
+    'zstd': (3, 19),
+    'br': (4, 11),
+    'gzip': (6, 9)
+}
+
+# Media that is already compressed; recompressing only burns CPU
+EXCLUDED_MEDIA_PREFIXES = ('video/', 'audio/', 'image/')
+EXCLUDED_MEDIA_TYPES = {
+    'application/epub+zip',
+    'application/zip',
+    'application/gzip',
+    'application/x-7z-compressed',
+    'application/x-rar-compressed',
+    'application/pdf',
+    'application/octet-stream'
+}
+COMPRESSIBLE_IMAGE_TYPES = {'image/svg+xml'}
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best available encoding from an Accept-Encoding header"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    wildcard = weights.get('*', 0.0)
+    best, best_q = None, 0.0
+    for name in ENCODINGS:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """Check whether a media type is worth compressing"""
+    media_type = content_type.split(';')[0].strip().lower()
+    if not media_type or media_type in EXCLUDED_MEDIA_TYPES:
+        return False
+    if media_type.startswith(EXCLUDED_MEDIA_PREFIXES):
+        return media_type in COMPRESSIBLE_IMAGE_TYPES
+    return True
+
+
+def compress(data: bytes, encoding: str, precompressed: bool = False) -> bytes:
+    """One-shot compression of a complete body"""
+    level = LEVELS[encoding][1 if precompressed else 0]
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class _StreamEncoder:
+    """Incremental compressor for streamed bodies (flushes every chunk)"""
+
+    def __init__(self, encoding: str):
+        level = LEVELS[encoding][0]
+        self.encoding = encoding
+        if encoding == 'zstd':
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        elif encoding == 'br':
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress and flush one chunk so the client can decode it right away"""
+        if self.encoding == 'zstd':
+            return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def _add_vary(headers: MutableHeaders, value: str):
+    vary = headers.get('vary')
+    if not vary:
+        headers['vary'] = value
+    elif value.lower() not in vary.lower():
+        headers['vary'] = f"{vary}, {value}"
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts (zstd > br > gzip)
+
+    - Skips bodies smaller than minimum_size
+    - Skips already-compressed media (video, audio, images, epub, zip, pdf)
+    - Skips range requests and partial/empty responses
+    - Leaves responses alone that already set Content-Encoding (precompressed cache)
+    - Streamed bodies are compressed chunk by chunk
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = None if 'range' in headers else negotiate_encoding(headers.get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Per-request send wrapper that decides on the first body message"""
+
+    def __init__(self, app, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message = None
+        self.encoder: Optional[_StreamEncoder] = None
+        self.passthrough = False
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message):
+        if message['type'] == 'http.response.start':
+            self.start_message = message
+            return
+
+        if message['type'] != 'http.response.body':
+            await self.send(message)
+            return
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            await self._start(start, message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        body = self.encoder.chunk(message.get('body', b''))
+        if not message.get('more_body', False):
+            body += self.encoder.finish()
+        await self.send({'type': 'http.response.body', 'body': body, 'more_body': message.get('more_body', False)})
+
+    async def _start(self, start, message):
+        headers = MutableHeaders(raw=start['headers'])
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        status = start['status']
+
+        compressible = (
+            200 <= status < 300 and status not in (204, 206)
+            and 'content-encoding' not in headers
+            and 'content-range' not in headers
+            and is_compressible(headers.get('content-type', ''))
+        )
+        if compressible:
+            _add_vary(headers, 'Accept-Encoding')
+
+        if not compressible or (not more_body and len(body) < self.minimum_size):
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers['content-encoding'] = self.encoding
+        # A strong validator no longer matches the encoded bytes
+        etag = headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            headers['etag'] = f"W/{etag}"
+
+        if more_body:
+            del headers['content-length']
+            self.encoder = _StreamEncoder(self.encoding)
+            body = self.encoder.chunk(body)
+        else:
+            body = compress(body, self.encoding)
+            headers['content-length'] = str(len(body))
+
+        await self.send(start)
+        await self.send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+
+
+class PrecompressedCache:
+    """
+    Encoded response bodies, built and compressed once per data version
+
+    - Keys belong to a namespace whose version is bumped when the data changes
+    - Entries expire after ttl_seconds so other workers' writes become visible
+    - Least recently used entries are dropped beyond max_bytes
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: int, minimum_size: int = 1024):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.minimum_size = minimum_size
+        self._versions: Dict[str, int] = {}
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Tuple[int, Optional[str], bytes, datetime]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, namespace: str) -> int:
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        """Mark a namespace's data as changed (old entries are never served again)"""
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def clear(self):
+        """Drop everything (e.g. after a database restore)"""
+        with self._lock:
+            self._versions.clear()
+            self._entries.clear()
+            self._size = 0
+
+    def _get(self, key: Tuple[str, Optional[str]], version: int) -> Optional[Tuple[Optional[str], bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            entry_version, encoding, body, stored_at = entry
+            if entry_version != version or datetime.utcnow() - stored_at >= timedelta(seconds=self.ttl_seconds):
+                del self._entries[key]
+                self._size -= len(body)
+                return None
+
+            self._entries.move_to_end(key)
+            return encoding, body
+
+    def _put(self, key: Tuple[str, Optional[str]], version: int, encoding: Optional[str], body: bytes):
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[2])
+
+            self._entries[key] = (version, encoding, body, datetime.utcnow())
+            self._size += len(body)
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted[2])
+
+    def get_body(self, key: str, namespace: str, encoding: Optional[str], build: Callable[[], bytes]) -> Tuple[Optional[str], bytes]:
+        """
+        Get (content_encoding, body) for key, building/compressing on a miss
+        build() must return the uncompressed body bytes.
+        """
+        version = self.version(namespace)
+        cached = self._get((key, encoding), version)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        identity = self._get((key, None), version) if encoding else None
+        raw = identity[1] if identity else build()
+        self._put((key, None), version, None, raw)
+
+        if encoding is None or len(raw) < self.minimum_size:
+            result = (None, raw)
+        else:
+            result = (encoding, compress(raw, encoding, precompressed=True))
+
+        if encoding is not None:
+            self._put((key, encoding), version, *result)
+        return result
+
+    def response(
+        self,
+        request: Request,
+        key: str,
+        namespace: str,
+        build: Callable[[], bytes],
+        media_type: str = 'application/json',
+        vary: str = 'Accept-Encoding'
+    ) -> Response:
+        """Serve a cached body in the best encoding the client accepts"""
+        encoding = None if 'range' in request.headers else negotiate_encoding(
+            request.headers.get('accept-encoding', '')
+        )
+        content_encoding, body = self.get_body(key, namespace, encoding, build)
+
+        headers = {'Vary': vary if 'Accept-Encoding' in vary else f"{vary}, Accept-Encoding"}
+        if content_encoding:
+            headers['Content-Encoding'] = content_encoding
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'encodings': ENCODINGS
+            }
+
+
+def tree_namespace(course_id: int) -> str:
+    """Cache namespace for a course's file tree"""
+    return f"tree:{course_id}"
+
+
+# Namespace for category listings (depends on courses and enrollments)
+CATEGORIES_NAMESPACE = "categories"
+
+# Global precompressed cache instance
+precompressed_cache = PrecompressedCache(
+    max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
+    ttl_seconds=settings.COMPRESSION_CACHE_TTL,
+    minimum_size=settings.COMPRESSION_MIN_SIZE
+)
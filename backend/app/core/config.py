@@ -17,11 +17,89 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # Detect connections dropped by a PostgreSQL restart
+    # Per-statement limit for the app's connections; 0 = no limit.
+    # Migrations use app.db.database.migration_engine, which never sets it.
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_APPLICATION_NAME: str = "lms-backend"
+    
+    # Async read path (AsyncSession + asyncpg) for cheap read endpoints
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with the asyncpg driver
+    
+    # Large list endpoints stream JSON in chunks of this many rows
+    STREAM_CHUNK_SIZE: int = 1000
+    
+    # Search backend: "index" (in-memory inverted index, per worker),
+    # "postgres" (tsvector + pg_trgm, needs app.migrations.add_search_vectors) or "sql" (LIKE scan)
+    SEARCH_BACKEND: str = "index"
+    SEARCH_INDEX_PATH: str = "./data/search_index.pkl"
+    SEARCH_INDEX_REFRESH_INTERVAL: int = 60  # seconds between catch-up refreshes
+    # Extra sessions concurrent SQL-backend search sub-queries may hold at once (per worker,
+    # across all requests); kept well below DB_POOL_SIZE + DB_MAX_OVERFLOW. When all are
+    # in use, sub-queries run on the request's own session instead.
+    SEARCH_PARALLEL_SESSIONS: int = 4
+    # Ranked result IDs per (query, filters, course-set hash); dropped on catalog changes
+    SEARCH_CACHE_MAX_ENTRIES: int = 10000
+    SEARCH_CACHE_TTL: int = 60  # seconds; bounds staleness from other workers' writes
+    
+    # Search logging: buffered batch writes + daily query counts
+    SEARCH_LOG_FLUSH_INTERVAL_MS: int = 500
+    SEARCH_LOG_BATCH_SIZE: int = 500  # flush early once this many entries wait
+    SEARCH_LOG_MAX_PENDING: int = 10000  # entries beyond this are dropped
+    SEARCH_LOG_RETENTION_DAYS: int = 90  # raw search_logs older than this are deleted (daily counts stay)
+    SEARCH_LOG_RETENTION_INTERVAL: int = 3600
+    SEARCH_LOG_RETENTION_BATCH_SIZE: int = 5000
+    SEARCH_POPULAR_DAYS: int = 30  # window for popular searches
+    
+    # Document text extraction for content search (PDF needs pypdf; EPUB and text use the standard library)
+    DOCUMENT_TEXT_WORKERS: int = 2  # extraction processes
+    DOCUMENT_TEXT_TIMEOUT: int = 60  # seconds per file
+    DOCUMENT_TEXT_MEMORY_MB: int = 1024  # address-space limit per worker process
+    DOCUMENT_TEXT_CHUNK_WORDS: int = 200
+    DOCUMENT_TEXT_CHUNK_OVERLAP: int = 30
+    DOCUMENT_TEXT_MAX_CHUNKS: int = 5000  # per file; the rest of a longer document is not indexed
+    DOCUMENT_TEXT_BATCH_SIZE: int = 50  # files checked and stored per transaction
+    DOCUMENT_TEXT_INTERVAL: int = 3600  # seconds between catch-up runs (scans also start one)
+    
+    # Autocomplete (GET /search/suggest)
+    SUGGEST_REFRESH_INTERVAL: int = 30  # seconds between catalog version checks
+    SUGGEST_POPULAR_QUERIES: int = 500  # most frequent logged queries offered as completions
+    SUGGEST_QUERIES_TTL: int = 300  # seconds before popular queries are reloaded
+    
+    # Announcement fan-out: one INSERT ... SELECT in the request up to this many recipients,
+    # larger audiences in a background task committing user-id batches
+    NOTIFICATION_FANOUT_INLINE_MAX: int = 2000
+    NOTIFICATION_FANOUT_BATCH_SIZE: int = 5000
+    
+    # Per-request SQL metrics (structured log + per-route histograms; Server-Timing when DEBUG)
+    QUERY_METRICS_ENABLED: bool = True
+    
+    # Response compression (zstd/br when installed, gzip always)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # precompressed tree/category bodies
+    COMPRESSION_CACHE_TTL: int = 300  # seconds before a cached body is rebuilt
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_SWEEP_INTERVAL: int = 3600  # seconds between expired/revoked token purges
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 1000
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_REHASH_ON_LOGIN: bool = True  # Upgrade legacy/mismatched hashes after successful login
+    PASSWORD_HASH_WORKERS: int = 2  # Process pool size (0 = hash inline)
+    PASSWORD_HASH_QUEUE_DEPTH: int = 32  # Queued jobs allowed beyond workers before 503
+    PASSWORD_HASH_TIMEOUT: int = 10  # seconds
+    PASSWORD_HASH_RETRY_AFTER: int = 2  # seconds, sent with 503 when saturated
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:4200"]
@@ -38,6 +116,11 @@ class Settings(BaseSettings):
     ADMIN_RATE_LIMIT: int = 30  # requests per hour
     VALIDATE_MIME_TYPES: bool = False  # Disabled for performance
     
+    # Authorization
+    # Backstop only: enroll/unenroll bump users.enrollment_version, which every worker
+    # compares on lookup, so revocations apply on the next request everywhere
+    ENROLLMENT_INDEX_TTL: int = 300  # seconds before a user's cached enrollments are reloaded
+    
     # Backup Configuration
     BACKUP_DIR: str = "./backups"
     MAX_BACKUP_SIZE: int = 1073741824  # 1GB
@@ -72,6 +155,14 @@ class Settings(BaseSettings):
         
         return v
     
+    @field_validator("BCRYPT_ROUNDS")
+    @classmethod
+    def validate_bcrypt_rounds(cls, v: int) -> int:
+        """Validate bcrypt cost factor is within bcrypt's supported range"""
+        if v < 4 or v > 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+    
     @field_validator("MAX_FILE_SIZE")
     @classmethod
     def validate_file_size(cls, v: int) -> int:
@@ -0,0 +1,141 @@
+"""
+In-memory enrollment index for authorization checks
+"""
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+
+
+class EnrollmentIndex:
+    """
+    Per-user sorted array of enrolled course IDs
+
+    - Loaded lazily from the enrollments table on first access
+    - Updated by the enroll/unenroll paths
+    - Each entry remembers users.enrollment_version; enroll/unenroll bump it
+      (bump_version), so a lookup with the requesting user's current version
+      reloads in every worker, not just the one that made the change
+    - Entries also expire after ttl_seconds as a backstop
+    """
+
+    def __init__(self, ttl_seconds: int = 300):
+        self._entries: Dict[int, Tuple[array, datetime, int]] = {}
+        self._lock = threading.Lock()
+        self.ttl_seconds = ttl_seconds
+
+    def _statement(self, user_id: int):
+        from app.models.enrollment import Enrollment
+        return select(Enrollment.course_id).where(Enrollment.user_id == user_id)
+
+    def _store(self, user_id: int, version: int, rows) -> array:
+        course_ids = array('l', sorted(rows))
+
+        with self._lock:
+            self._entries[user_id] = (course_ids, datetime.utcnow(), version)
+
+        return course_ids
+
+    def _cached(self, user_id: int, version: int) -> Optional[array]:
+        """Get a user's course IDs if loaded at this enrollment version and not expired"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+
+        if entry:
+            course_ids, loaded_at, loaded_version = entry
+            if loaded_version == version and datetime.utcnow() - loaded_at < timedelta(seconds=self.ttl_seconds):
+                return course_ids
+
+        return None
+
+    def _get(self, db: Session, user_id: int, version: int) -> array:
+        """Get a user's course IDs, loading them if missing, outdated or expired"""
+        course_ids = self._cached(user_id, version)
+        if course_ids is None:
+            rows = db.execute(self._statement(user_id)).scalars().all()
+            course_ids = self._store(user_id, version, rows)
+        return course_ids
+
+    async def _get_async(self, db: AsyncSession, user_id: int, version: int) -> array:
+        """Async variant of _get for AsyncSession callers"""
+        course_ids = self._cached(user_id, version)
+        if course_ids is None:
+            rows = (await db.execute(self._statement(user_id))).scalars().all()
+            course_ids = self._store(user_id, version, rows)
+        return course_ids
+
+    @staticmethod
+    def _contains(course_ids: array, course_id: int) -> bool:
+        i = bisect_left(course_ids, course_id)
+        return i < len(course_ids) and course_ids[i] == course_id
+
+    def get_course_ids(self, db: Session, user_id: int, version: int) -> List[int]:
+        """Get sorted list of course IDs the user is enrolled in (version = users.enrollment_version)"""
+        return self._get(db, user_id, version).tolist()
+
+    def contains(self, db: Session, user_id: int, version: int, course_id: int) -> bool:
+        """Check if user is enrolled in course (binary search)"""
+        return self._contains(self._get(db, user_id, version), course_id)
+
+    async def get_course_ids_async(self, db: AsyncSession, user_id: int, version: int) -> List[int]:
+        """Async variant of get_course_ids"""
+        return (await self._get_async(db, user_id, version)).tolist()
+
+    async def contains_async(self, db: AsyncSession, user_id: int, version: int, course_id: int) -> bool:
+        """Async variant of contains"""
+        return self._contains(await self._get_async(db, user_id, version), course_id)
+
+    @staticmethod
+    def bump_version(db: Session, user_id: int):
+        """Bump users.enrollment_version in the caller's transaction (before commit)"""
+        from app.models.user import User
+        db.execute(
+            update(User).where(User.id == user_id).values(enrollment_version=User.enrollment_version + 1)
+        )
+
+    def add(self, user_id: int, course_id: int):
+        """Record a new enrollment (no-op if user not loaded yet)"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if not entry:
+                return
+
+            # Copy-on-write so concurrent readers never see a partial update
+            course_ids = array('l', entry[0])
+            i = bisect_left(course_ids, course_id)
+            if i == len(course_ids) or course_ids[i] != course_id:
+                insort(course_ids, course_id)
+                self._entries[user_id] = (course_ids, *entry[1:])
+
+    def remove(self, user_id: int, course_id: int):
+        """Record a removed enrollment (no-op if user not loaded yet)"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if not entry:
+                return
+
+            course_ids = array('l', entry[0])
+            i = bisect_left(course_ids, course_id)
+            if i < len(course_ids) and course_ids[i] == course_id:
+                del course_ids[i]
+                self._entries[user_id] = (course_ids, *entry[1:])
+
+    def invalidate_user(self, user_id: int):
+        """Drop a user's entry so it is reloaded on next access"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        """Drop all entries (e.g. after a database restore)"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global enrollment index instance
+enrollment_index = EnrollmentIndex(ttl_seconds=settings.ENROLLMENT_INDEX_TTL)
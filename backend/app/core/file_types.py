@@ -0,0 +1,115 @@
+"""
+File type registry: the one extension -> type/MIME mapping
+
+Used by the scanner and uploads (stored as FileNode.file_type), upload
+validation (MIME types) and search (type filters, facets, icons).
+"""
+from typing import Dict, Optional, Tuple
+import os
+
+UNKNOWN_TYPE = 'unknown'
+FOLDER_TYPE = 'folder'
+
+# extension -> (file type, MIME type)
+EXTENSIONS: Dict[str, Tuple[str, str]] = {
+    'pdf': ('pdf', 'application/pdf'),
+    'epub': ('epub', 'application/epub+zip'),
+    'doc': ('document', 'application/msword'),
+    'docx': ('document', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    'odt': ('document', 'application/vnd.oasis.opendocument.text'),
+    'rtf': ('document', 'application/rtf'),
+    'txt': ('text', 'text/plain'),
+    'md': ('text', 'text/markdown'),
+    'markdown': ('text', 'text/markdown'),
+    'rst': ('text', 'text/x-rst'),
+    'log': ('text', 'text/plain'),
+    'ppt': ('presentation', 'application/vnd.ms-powerpoint'),
+    'pptx': ('presentation', 'application/vnd.openxmlformats-officedocument.presentationml.presentation'),
+    'odp': ('presentation', 'application/vnd.oasis.opendocument.presentation'),
+    'xls': ('spreadsheet', 'application/vnd.ms-excel'),
+    'xlsx': ('spreadsheet', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'ods': ('spreadsheet', 'application/vnd.oasis.opendocument.spreadsheet'),
+    'csv': ('spreadsheet', 'text/csv'),
+    'mp4': ('video', 'video/mp4'),
+    'avi': ('video', 'video/x-msvideo'),
+    'mkv': ('video', 'video/x-matroska'),
+    'mov': ('video', 'video/quicktime'),
+    'webm': ('video', 'video/webm'),
+    'mp3': ('audio', 'audio/mpeg'),
+    'wav': ('audio', 'audio/wav'),
+    'ogg': ('audio', 'audio/ogg'),
+    'm4a': ('audio', 'audio/mp4'),
+    'flac': ('audio', 'audio/flac'),
+    'jpg': ('image', 'image/jpeg'),
+    'jpeg': ('image', 'image/jpeg'),
+    'png': ('image', 'image/png'),
+    'gif': ('image', 'image/gif'),
+    'bmp': ('image', 'image/bmp'),
+    'webp': ('image', 'image/webp'),
+    'svg': ('image', 'image/svg+xml'),
+    'zip': ('archive', 'application/zip'),
+    'rar': ('archive', 'application/x-rar-compressed'),
+    '7z': ('archive', 'application/x-7z-compressed'),
+    'py': ('code', 'text/x-python'),
+    'js': ('code', 'text/javascript'),
+    'java': ('code', 'text/x-java'),
+    'cpp': ('code', 'text/x-c++src'),
+    'ipynb': ('code', 'application/x-ipynb+json'),
+}
+
+# Material icon per file type
+ICONS = {
+    'pdf': 'picture_as_pdf',
+    'epub': 'menu_book',
+    'document': 'description',
+    'text': 'article',
+    'presentation': 'slideshow',
+    'spreadsheet': 'table_chart',
+    'video': 'movie',
+    'audio': 'audiotrack',
+    'image': 'image',
+    'archive': 'folder_zip',
+    'code': 'code',
+    FOLDER_TYPE: 'folder',
+}
+
+FILE_TYPES = frozenset(file_type for file_type, _ in EXTENSIONS.values())
+_MIME_TYPES = {mime: file_type for file_type, mime in EXTENSIONS.values()}
+
+
+def extension_of(name: str) -> str:
+    """'pdf' for 'Lecture 01.PDF' ('' without an extension)"""
+    return os.path.splitext(name)[1][1:].lower()
+
+
+def file_type_for(name: str) -> str:
+    """Stored FileNode.file_type for a file name"""
+    entry = EXTENSIONS.get(extension_of(name))
+    return entry[0] if entry else UNKNOWN_TYPE
+
+
+def mime_type_for(extension: str) -> Optional[str]:
+    entry = EXTENSIONS.get(extension.lstrip('.').lower())
+    return entry[1] if entry else None
+
+
+def extensions_for(file_type: str) -> Tuple[str, ...]:
+    return tuple(extension for extension, (kind, _) in EXTENSIONS.items() if kind == file_type)
+
+
+def resolve_file_type(value: str) -> Optional[str]:
+    """
+    File type named by a filter or query word: a type ('video'), an extension
+    ('mp4', '.mp4') or a MIME type ('video/mp4'); None if it names none
+    """
+    value = value.strip().lower()
+    if value in FILE_TYPES or value in (UNKNOWN_TYPE, FOLDER_TYPE):
+        return value
+    entry = EXTENSIONS.get(value.lstrip('.'))
+    if entry:
+        return entry[0]
+    return _MIME_TYPES.get(value)
+
+
+def icon_for(file_type: str) -> str:
+    return ICONS.get(file_type, 'insert_drive_file')
@@ -0,0 +1,99 @@
+"""
+Keyset (cursor) pagination for list endpoints
+"""
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+import base64
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.orm import Session
+
+# Header carrying the next page cursor for endpoints that return a bare JSON array
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Keyset:
+    """
+    Stable ordering over (sort key..., id) with opaque cursors
+
+    - All columns sort in the same direction, so "after the cursor" is a single
+      row-value comparison that an index on the same columns can seek to
+    - The last column must be unique (normally the primary key)
+    - Cursors are base64 JSON of the last row's key values
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def order_by(self) -> list:
+        return [column.desc() if self.descending else column for column in self.columns]
+
+    def apply(self, statement, cursor: Optional[str] = None):
+        """Add the cursor filter and ordering to a select"""
+        if cursor:
+            values = self.decode(cursor)
+            if len(self.columns) == 1:
+                key, value = self.columns[0], values[0]
+            else:
+                key, value = tuple_(*self.columns), tuple_(*values)
+            statement = statement.where(key < value if self.descending else key > value)
+
+        return statement.order_by(*self.order_by())
+
+    def encode(self, values) -> str:
+        raw = json.dumps([
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def encode_item(self, item) -> str:
+        """Cursor for an ORM object or row exposing the key columns by name"""
+        return self.encode([getattr(item, column.key) for column in self.columns])
+
+    def decode(self, cursor: str) -> List[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError(cursor)
+            return [
+                datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+                for column, value in zip(self.columns, values)
+            ]
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def page(
+        self,
+        db: Session,
+        statement,
+        cursor: Optional[str],
+        limit: int,
+        scalars: bool = True
+    ) -> Tuple[list, Optional[str]]:
+        """
+        Run one page of a select
+        Returns (items, next_cursor); next_cursor is None on the last page.
+        """
+        # Fetch one extra row to know whether another page exists
+        result = db.execute(self.apply(statement, cursor).limit(limit + 1))
+        items = (result.scalars() if scalars else result).all()
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = self.encode_item(items[-1])
+
+        return items, next_cursor
+
+    def next_cursor(self, db: Session, statement, cursor: Optional[str], limit: int) -> Optional[str]:
+        """
+        Next page cursor without loading the page itself
+        For streamed pages: reads only the key columns of at most limit + 1 rows.
+        """
+        keys = statement.with_only_columns(*self.columns, maintain_column_froms=True)
+        rows = db.execute(self.apply(keys, cursor).limit(limit + 1)).all()
+        return self.encode(rows[limit - 1]) if len(rows) > limit else None
@@ -0,0 +1,117 @@
+"""
+Bounded process pool for bcrypt hashing and verification
+"""
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from fastapi import HTTPException, status
+from typing import Optional
+import logging
+import threading
+
+from app.core.config import settings
+from app.core.security import verify_password, get_password_hash
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt work in a dedicated process pool
+
+    - Keeps bcrypt CPU time off the API worker
+    - Caps in-flight jobs (running + queued) at workers + queue_depth
+    - Rejects with 503 + Retry-After when saturated instead of queueing forever
+    """
+
+    def __init__(self, workers: int, queue_depth: int, timeout: int, retry_after: int):
+        self.workers = workers
+        self.max_pending = workers + queue_depth
+        self.timeout = timeout
+        self.retry_after = retry_after
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Create executor on first use (None = run inline)"""
+        if self.workers <= 0:
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _saturated(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy. Please retry shortly.",
+            headers={"Retry-After": str(self.retry_after)}
+        )
+
+    def _run(self, func, *args):
+        """Submit job to the pool and wait for its result"""
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args)
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning(
+                    "Password hash pool saturated",
+                    extra={'pending': self._pending, 'max_pending': self.max_pending}
+                )
+                raise self._saturated()
+            self._pending += 1
+
+        try:
+            future = executor.submit(func, *args)
+        except Exception:
+            self._release()
+            raise
+        # A timed-out job keeps its worker until it finishes (cancel() cannot stop it),
+        # so the slot is freed when the job completes, not when the caller gives up
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise self._saturated()
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify password against bcrypt hash in the pool"""
+        return self._run(verify_password, plain_password, hashed_password)
+
+    def hash(self, password: str) -> str:
+        """Hash password with bcrypt in the pool"""
+        return self._run(get_password_hash, password)
+
+    def get_stats(self) -> dict:
+        """Current pool utilisation"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending
+            }
+
+    def shutdown(self):
+        """Stop worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Global password hash pool instance
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_depth=settings.PASSWORD_HASH_QUEUE_DEPTH,
+    timeout=settings.PASSWORD_HASH_TIMEOUT,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER
+)
@@ -0,0 +1,55 @@
+"""
+SQL statement counting for N+1 regression checks
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    Records statements executed on an engine while active
+
+    Usage:
+        with QueryCounter(engine) as counter:
+            ...
+        counter.count, counter.statements
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(engine: Engine, max_queries: int, label: str = "block") -> Iterator[QueryCounter]:
+    """
+    Fail if the block runs more than max_queries statements
+
+    Raises AssertionError listing the executed SQL, so an endpoint that
+    regresses into one query per row fails loudly.
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        executed = "\n".join(f"  {i + 1}. {sql.strip()}" for i, sql in enumerate(counter.statements))
+        raise AssertionError(
+            f"{label}: expected at most {max_queries} queries, ran {counter.count}:\n{executed}"
+        )
@@ -0,0 +1,86 @@
+"""
+Middleware for per-request SQL query count and latency metrics
+"""
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from app.core.correlation_middleware import get_correlation_id
+from app.db.query_metrics import RequestQueryStats, request_query_stats, route_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueryMetricsMiddleware:
+    """
+    Track SQL statements, DB time, slowest statement and rows per request
+
+    - Logged as one structured record tagged with the correlation ID
+    - Aggregated into per-route histograms (GET /admin/metrics/routes)
+    - Server-Timing header when server_timing is set (debug only)
+
+    Must be added before CorrelationIdMiddleware so it runs inside it.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = request_query_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                if self.server_timing:
+                    # Streamed bodies: covers the queries run before the first byte
+                    headers = MutableHeaders(scope=message)
+                    headers.append('Server-Timing', self._server_timing(stats, start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_query_stats.reset(token)
+            duration_ms = (time.perf_counter() - start) * 1000
+            route = self._route_name(scope)
+            snapshot = stats.snapshot()
+            route_metrics.observe(route, duration_ms, snapshot)
+
+            logger.info(
+                f"{route} - {status_code} - {snapshot['db_queries']} queries",
+                extra={
+                    'correlation_id': get_correlation_id(),
+                    'extra': {
+                        'route': route,
+                        'status_code': status_code,
+                        'duration_ms': round(duration_ms, 3),
+                        **snapshot
+                    }
+                }
+            )
+
+    @staticmethod
+    def _route_name(scope) -> str:
+        """Route template (not the raw path) so histograms stay bounded"""
+        route = scope.get('route')
+        path = getattr(route, 'path', None) or '<unmatched>'
+        return f"{scope['method']} {path}"
+
+    @staticmethod
+    def _server_timing(stats: RequestQueryStats, start: float) -> str:
+        snapshot = stats.snapshot()
+        app_ms = (time.perf_counter() - start) * 1000
+        return (
+            f'db;dur={snapshot["db_time_ms"]};desc="{snapshot["db_queries"]} queries", '
+            f'db-slowest;dur={snapshot["slowest_query_ms"]}, '
+            f'app;dur={app_ms:.3f}'
+        )
@@ -0,0 +1,102 @@
+"""
+Search result cache shared by users with the same course access
+"""
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional, Tuple
+import hashlib
+import threading
+
+from app.core.config import settings
+
+# Scope key for admins (every course)
+ADMIN_SCOPE = "admin"
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace; every backend matches case-insensitively"""
+    return " ".join(query.split())
+
+
+def scope_digest(course_ids: Iterable[int]) -> str:
+    """Stable hash of an accessible-course set (users with the same enrollments share entries)"""
+    ids = array('q', sorted(set(course_ids)))
+    return hashlib.blake2b(ids.tobytes(), digest_size=12).hexdigest()
+
+
+def id_array(results: Iterable[dict]) -> array:
+    """Compact ranked ID list of search results"""
+    return array('q', (result['id'] for result in results))
+
+
+class SearchResultCache:
+    """
+    Ranked result IDs per (kind, query, filters, course scope)
+
+    - Values are compact ID arrays, hydrated by primary key on a hit
+    - The catalog version is bumped when courses or files change;
+      entries from an older version are never served again
+    - Entries expire after ttl_seconds so other workers' writes become visible
+    - Least recently used entries are dropped beyond max_entries
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.catalog_version = 0
+        self._entries: "OrderedDict[Tuple, Tuple[int, Any, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(kind: str, query: str, scope: str, *filters) -> Tuple:
+        return (kind, normalize_query(query).lower(), scope, *filters)
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, value, stored_at = entry
+                if version == self.catalog_version and datetime.utcnow() - stored_at < timedelta(seconds=self.ttl_seconds):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, value: Any, version: int):
+        """Store a value computed under catalog version `version` (read before searching)"""
+        with self._lock:
+            if version != self.catalog_version:
+                return
+            self._entries[key] = (version, value, datetime.utcnow())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self):
+        """Courses or files changed: stop serving cached results"""
+        with self._lock:
+            self.catalog_version += 1
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'catalog_version': self.catalog_version,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+# Global search result cache instance
+search_cache = SearchResultCache(
+    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL
+)
@@ -0,0 +1,805 @@
+"""
+In-memory inverted index for course and file search
+"""
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+from heapq import nlargest
+from itertools import islice
+from typing import Collection, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import math
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.file_types import resolve_file_type
+from app.core.search_cache import search_cache
+
+logger = logging.getLogger(__name__)
+
+# Bump when tokenization or the on-disk layout changes (old files are rebuilt)
+FORMAT_VERSION = 3
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Field weights (added to term frequency)
+NAME_WEIGHT = 2
+PATH_WEIGHT = 1
+
+# Score multipliers for looser matches
+PREFIX_FACTOR = 0.7
+SUBSTRING_FACTOR = 0.4
+MAX_PREFIX_EXPANSIONS = 32
+
+# Rebuild instead of carrying more than this share of deleted documents
+MAX_DELETED_RATIO = 0.25
+
+# Words in a content search snippet
+SNIPPET_WORDS = 30
+
+_SPLIT_RE = re.compile(r"[^0-9A-Za-z]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def fold(text: str) -> str:
+    """Strip accents (é -> e) but keep case for camelCase splitting"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def stem(token: str) -> str:
+    """
+    Light English suffix stripping (lectures/lecturing/lecture -> lectur)
+    Numbers lose leading zeros (01 -> 1).
+    """
+    if token.isdigit():
+        return token.lstrip("0") or "0"
+    if len(token) <= 3:
+        return token
+
+    if token.endswith("sses"):
+        token = token[:-2]
+    elif token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+
+    for suffix in ("ingly", "edly", "ing", "ed"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            break
+
+    if token.endswith("e") and len(token) > 4:
+        token = token[:-1]
+    return token
+
+
+def words(text: str) -> List[str]:
+    """Lowercase words and their camelCase/number parts (IntroToML2 -> introtoml2, intro, to, ml, 2)"""
+    result = []
+    for word in _SPLIT_RE.split(fold(text)):
+        if not word:
+            continue
+        result.append(word.lower())
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            result.extend(part.lower() for part in parts)
+    return result
+
+
+def query_words(text: str) -> List[str]:
+    """Words of a query; camelCase is matched by its parts (every word is required)"""
+    result = []
+    for word in _SPLIT_RE.split(fold(text)):
+        if not word:
+            continue
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            result.extend(part.lower() for part in parts)
+        else:
+            result.append(word.lower())
+    return list(dict.fromkeys(result))
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized, stemmed tokens for indexing and querying"""
+    return [stem(word) for word in words(text)]
+
+
+def trigrams(word: str) -> Set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def snippet(text: str, query: str, width: int = SNIPPET_WORDS) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    About `width` words of text around the densest cluster of query words
+    Returns (snippet, [(start, end)]) with character offsets of the matched words.
+    """
+    terms = [stem(word) for word in query_words(query)]
+    spans = [match.span() for match in _WORD_RE.finditer(text)]
+    if not spans:
+        return text[:200], []
+
+    matched = []
+    for i, (start, end) in enumerate(spans):
+        token = stem(fold(text[start:end]).lower())
+        term = next((term for term in terms if token.startswith(term)), None)
+        if term is not None:
+            matched.append((i, term))
+
+    first = 0
+    if matched:
+        # Window covering the most distinct query words; earliest on ties
+        best = max(
+            (i for i, _ in matched),
+            key=lambda i: len({term for j, term in matched if i <= j < i + width})
+        )
+        first = max(0, best - width // 4)
+    last = min(len(spans), first + width)
+
+    prefix = "… " if first > 0 else ""
+    suffix = " …" if last < len(spans) else ""
+    offset = spans[first][0] - len(prefix)
+    highlights = [
+        (spans[i][0] - offset, spans[i][1] - offset)
+        for i, _ in matched if first <= i < last
+    ]
+    return prefix + text[spans[first][0]:spans[last - 1][1]] + suffix, highlights
+
+
+def split_extension(name: str) -> Tuple[str, str]:
+    """('lecture 01', 'pdf') for 'Lecture 01.PDF'"""
+    stem_part, ext = os.path.splitext(name)
+    return (stem_part, ext[1:].lower()) if ext else (name, "")
+
+
+class InvertedIndex:
+    """
+    Posting lists for one kind of document (courses or files)
+
+    - Documents get dense ordinals in ascending external-id order, so
+      postings stay sorted when new rows are appended
+    - Per-ordinal metadata lives in parallel arrays (id, course, length, file type)
+    - Deletions are tombstones until the next rebuild
+    - postings[token] / frequencies[token]: ordinals and weighted term frequencies
+    - grams[trigram]: ordinals of documents containing the trigram (substring matches)
+    """
+
+    def __init__(self):
+        self.doc_ids = array('q')
+        self.doc_course = array('q')
+        self.doc_length = array('H')
+        self.doc_type = array('H')
+        self.deleted = bytearray()
+        self.deleted_count = 0
+        self.total_length = 0
+        self.postings: Dict[str, array] = {}
+        self.frequencies: Dict[str, array] = {}
+        self.grams: Dict[str, array] = {}
+        self.types: Dict[str, int] = {"": 0}
+        self._vocabulary: Optional[List[str]] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_vocabulary'] = None
+        return state
+
+    def snapshot(self) -> "InvertedIndex":
+        """
+        Copy for persisting without holding the search lock
+        Postings and per-document arrays are append-only and shared (no add() may
+        run until the copy is pickled); tombstones are copied.
+        """
+        copy = InvertedIndex.__new__(InvertedIndex)
+        copy.__dict__.update(self.__dict__)
+        copy.deleted = bytearray(self.deleted)
+        copy._vocabulary = None
+        return copy
+
+    @property
+    def max_id(self) -> int:
+        return self.doc_ids[-1] if self.doc_ids else 0
+
+    @property
+    def live_count(self) -> int:
+        return len(self.doc_ids) - self.deleted_count
+
+    def add(
+        self,
+        doc_id: int,
+        course_id: int,
+        fields: Iterable[Tuple[str, int]],
+        file_type: str = "",
+        substrings: bool = True
+    ) -> bool:
+        """
+        Append a document; fields are (text, weight) pairs
+        substrings=False skips trigram postings (long text: no infix matches)
+        Returns False if doc_id is not above every indexed id (caller must rebuild).
+        """
+        if self.doc_ids and doc_id <= self.doc_ids[-1]:
+            return False
+
+        counts: Counter = Counter()
+        grams: Set[str] = set()
+        length = 0
+        for text, weight in fields:
+            for word in words(text):
+                counts[stem(word)] += weight
+                if substrings:
+                    grams.update(trigrams(word))
+                length += 1
+
+        ordinal = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.doc_course.append(course_id)
+        self.doc_length.append(min(length, 65535))
+        type_id = self.types.get(file_type)
+        if type_id is None:
+            type_id = self.types[file_type] = len(self.types)
+        self.doc_type.append(type_id)
+        self.deleted.append(0)
+        self.total_length += length
+
+        for token, frequency in counts.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = array('I')
+                self.frequencies[token] = array('B')
+                self._vocabulary = None
+            postings.append(ordinal)
+            self.frequencies[token].append(min(frequency, 255))
+
+        for gram in grams:
+            postings = self.grams.get(gram)
+            if postings is None:
+                postings = self.grams[gram] = array('I')
+            postings.append(ordinal)
+
+        return True
+
+    def remove(self, doc_id: int) -> bool:
+        ordinal = bisect_left(self.doc_ids, doc_id)
+        if ordinal == len(self.doc_ids) or self.doc_ids[ordinal] != doc_id or self.deleted[ordinal]:
+            return False
+
+        self.deleted[ordinal] = 1
+        self.deleted_count += 1
+        self.total_length -= self.doc_length[ordinal]
+        return True
+
+    def search(
+        self,
+        query: str,
+        course_ids: Optional[Collection[int]],
+        limit: int,
+        file_types: Optional[Collection[str]] = None,
+        course_filter: Optional[Collection[int]] = None,
+        facets: Optional[Dict[str, Counter]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank documents matching every query word (BM25)
+        Returns [(doc_id, score)] best first.
+
+        course_ids is the access scope (None = all courses); file_types and
+        course_filter are facet filters. facets, when given, is filled with
+        {'file_type': Counter, 'course': Counter} of the matches, each counted
+        without its own filter (so other values stay selectable).
+        """
+        type_ids = None
+        if file_types is not None:
+            type_ids = {self.types[name] for name in file_types if name in self.types}
+
+        terms = query_words(query)
+
+        # Types are not indexed as words: "calculus pdf" or "calculus mp4" filters on the type
+        if type_ids is None:
+            type_terms = {
+                word: resolve_file_type(word) for word in terms
+                if resolve_file_type(word) in self.types and stem(word) not in self.postings
+            }
+            if type_terms:
+                type_ids = {self.types[next(iter(type_terms.values()))]}
+                terms = [word for word in terms if word not in type_terms]
+
+        if not terms:
+            return self._newest(course_ids, limit, type_ids, course_filter) if type_ids else []
+
+        allowed = None if course_ids is None else set(course_ids)
+        selected_courses = None if course_filter is None else set(course_filter)
+        live = max(self.live_count, 1)
+        average_length = (self.total_length / live) or 1.0
+
+        scores: Optional[Dict[int, float]] = None
+        # Rarest terms first so the AND-intersection shrinks early
+        for word in sorted(terms, key=lambda w: len(self.postings.get(stem(w), ()))):
+            term_scores = self._term_scores(word, live, average_length, limit)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {o: s + term_scores[o] for o, s in scores.items() if o in term_scores}
+            if not scores:
+                return []
+
+        doc_course, doc_type, deleted = self.doc_course, self.doc_type, self.deleted
+        type_names = {number: name for name, number in self.types.items()}
+        matches = []
+        for o, s in scores.items():
+            if deleted[o] or (allowed is not None and doc_course[o] not in allowed):
+                continue
+            type_match = type_ids is None or doc_type[o] in type_ids
+            course_match = selected_courses is None or doc_course[o] in selected_courses
+            if facets is not None:
+                if course_match:
+                    facets['file_type'][type_names[doc_type[o]]] += 1
+                if type_match:
+                    facets['course'][doc_course[o]] += 1
+            if type_match and course_match:
+                matches.append((o, s))
+        return [(self.doc_ids[o], s) for o, s in nlargest(limit, matches, key=lambda m: m[1])]
+
+    def _newest(
+        self,
+        course_ids: Optional[Collection[int]],
+        limit: int,
+        type_ids: Set[int],
+        course_filter: Optional[Collection[int]]
+    ) -> List[Tuple[int, float]]:
+        """Filter-only query (e.g. just "pdf"): newest matching documents"""
+        allowed = None if course_ids is None else set(course_ids)
+        selected_courses = None if course_filter is None else set(course_filter)
+        results = []
+        for ordinal in range(len(self.doc_ids) - 1, -1, -1):
+            if (
+                not self.deleted[ordinal]
+                and self.doc_type[ordinal] in type_ids
+                and (allowed is None or self.doc_course[ordinal] in allowed)
+                and (selected_courses is None or self.doc_course[ordinal] in selected_courses)
+            ):
+                results.append((self.doc_ids[ordinal], 0.0))
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _term_scores(self, word: str, live: int, average_length: float, limit: int) -> Dict[int, float]:
+        """Scores for one query word: exact token, then prefix, then substring matches"""
+        token = stem(word)
+        scores: Dict[int, float] = {}
+
+        if token in self.postings:
+            self._bm25(token, live, average_length, 1.0, scores)
+
+        for candidate in self._prefix_tokens(token):
+            if candidate != token:
+                self._bm25(candidate, live, average_length, PREFIX_FACTOR, scores)
+
+        # Infix matches (e.g. "gebra" in "algebra") only when still short of results
+        if len(scores) < limit and len(word) >= 3:
+            gram_lists = sorted((self.grams.get(g) for g in trigrams(word)), key=lambda p: len(p) if p else 0)
+            if gram_lists and gram_lists[0]:
+                candidates = set(gram_lists[0])
+                for postings in gram_lists[1:]:
+                    if not postings:
+                        candidates = set()
+                        break
+                    candidates.intersection_update(postings)
+                    if not candidates:
+                        break
+
+                matching = min(len(candidates), live)
+                idf = math.log(1 + (live - matching + 0.5) / (matching + 0.5))
+                for ordinal in candidates:
+                    if ordinal not in scores:
+                        scores[ordinal] = idf * SUBSTRING_FACTOR
+
+        return scores
+
+    def _bm25(self, token: str, live: int, average_length: float, factor: float, scores: Dict[int, float]):
+        postings = self.postings[token]
+        frequencies = self.frequencies[token]
+        doc_length = self.doc_length
+        # Postings still hold tombstoned documents; never count more than are live
+        matching = min(len(postings), live)
+        idf = math.log(1 + (live - matching + 0.5) / (matching + 0.5)) * factor
+        norm = K1 * (1 - B)
+        per_length = K1 * B / average_length
+
+        for ordinal, tf in zip(postings, frequencies):
+            score = idf * tf * (K1 + 1) / (tf + norm + per_length * doc_length[ordinal])
+            if score > scores.get(ordinal, 0.0):
+                scores[ordinal] = score
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        """Indexed tokens starting with prefix (bounded, via the sorted vocabulary)"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+
+        vocabulary = self._vocabulary
+        tokens = []
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix) and len(tokens) < MAX_PREFIX_EXPANSIONS:
+            tokens.append(vocabulary[i])
+            i += 1
+        return tokens
+
+
+class _IndexUnpickler(pickle.Unpickler):
+    """Only reconstructs index types, never arbitrary callables"""
+
+    ALLOWED = {
+        ('array', '_array_reconstructor'),
+        ('array', 'array'),
+        ('builtins', 'bytearray'),
+        ('builtins', 'set'),
+        (__name__, 'InvertedIndex'),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) not in self.ALLOWED:
+            raise pickle.UnpicklingError(f"Unexpected type in search index: {module}.{name}")
+        return super().find_class(module, name)
+
+
+class SearchIndex:
+    """
+    Course, file and document text indexes with build, incremental catch-up and persistence
+
+    - build(): full load from the database (swapped in atomically)
+    - refresh(): appends rows added since the last build/refresh; rebuilds
+      when counts disagree (rows removed elsewhere) or tombstones pile up
+    - remove_files() / remove_chunks(): tombstones for scanner/delete/re-extraction diffs
+    - Saved to disk so a restart loads instead of rebuilding
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self.courses: Optional[InvertedIndex] = None
+        self.files: Optional[InvertedIndex] = None
+        # Extracted text chunks; chunk_files[ordinal] is the chunk's file id
+        self.content: Optional[InvertedIndex] = None
+        self.chunk_files = array('q')
+        self.built_at: Optional[datetime] = None
+        self.stale = False
+        self.dirty = False
+
+    @property
+    def ready(self) -> bool:
+        return self.files is not None and not self.stale
+
+    # Queries
+
+    def search_courses(self, query: str, course_ids: Optional[Collection[int]], limit: int) -> List[int]:
+        """Ranked course IDs (course_ids None = all courses)"""
+        with self.lock:
+            return [doc_id for doc_id, _ in self.courses.search(query, course_ids, limit)]
+
+    def search_files(
+        self,
+        query: str,
+        course_ids: Optional[Collection[int]],
+        limit: int,
+        file_types: Optional[Collection[str]] = None,
+        course_filter: Optional[Collection[int]] = None,
+        facets: Optional[Dict[str, Counter]] = None
+    ) -> List[int]:
+        """Ranked file node IDs (course_ids None = all courses; see InvertedIndex.search)"""
+        with self.lock:
+            return [
+                doc_id for doc_id, _ in self.files.search(query, course_ids, limit, file_types, course_filter, facets)
+            ]
+
+    def search_content(self, query: str, course_ids: Optional[Collection[int]], limit: int) -> List[int]:
+        """Ranked document chunk IDs (course_ids None = all courses)"""
+        with self.lock:
+            return [doc_id for doc_id, _ in self.content.search(query, course_ids, limit)]
+
+    # Maintenance
+
+    def build(self, db: Session):
+        """Build all indexes from the database and swap them in"""
+        start = time.perf_counter()
+        courses, files, content = InvertedIndex(), InvertedIndex(), InvertedIndex()
+        chunk_files = array('q')
+        self._add_courses(db, courses, 0)
+        self._add_files(db, files, 0)
+        self._add_chunks(db, content, chunk_files, 0)
+
+        with self.lock:
+            self.courses, self.files = courses, files
+            self.content, self.chunk_files = content, chunk_files
+            self.built_at = datetime.utcnow()
+            self.stale = False
+            self.dirty = True
+
+        logger.info(
+            "Search index built",
+            extra={'extra': {
+                'courses': courses.live_count,
+                'files': files.live_count,
+                'chunks': content.live_count,
+                'seconds': round(time.perf_counter() - start, 3)
+            }}
+        )
+
+    def refresh(self, db: Session, blocking: bool = True) -> str:
+        """
+        Bring the index up to date with the database
+        Returns 'built', 'updated', 'unchanged' or 'skipped' (busy, non-blocking).
+        """
+        if not self._refresh_lock.acquire(blocking=blocking):
+            return 'skipped'
+
+        try:
+            if not self.ready:
+                self.build(db)
+                return 'built'
+
+            # Rows are read outside the search lock; it is held per batch of add() calls
+            added = self._add_courses(db, self.courses, self.courses.max_id, self.lock)
+            added += self._add_files(db, self.files, self.files.max_id, self.lock)
+            added += self._add_chunks(db, self.content, self.chunk_files, self.content.max_id, self.lock)
+            if added:
+                self.dirty = True
+
+            # Out-of-order ids (stale), removals made elsewhere or too many tombstones
+            if self.stale or not self._matches_database(db):
+                self.build(db)
+                return 'built'
+
+            return 'updated' if added else 'unchanged'
+        finally:
+            self._refresh_lock.release()
+
+    def remove_files(self, file_ids: Iterable[int]):
+        """Tombstone files and their text chunks"""
+        file_ids = set(file_ids)
+        with self.lock:
+            if self.files is not None and file_ids:
+                for file_id in file_ids:
+                    self.dirty = self.files.remove(file_id) or self.dirty
+                self.remove_chunks(
+                    chunk_id for chunk_id, file_id in zip(self.content.doc_ids, self.chunk_files)
+                    if file_id in file_ids
+                )
+
+    def remove_chunks(self, chunk_ids: Iterable[int]):
+        """Tombstone text chunks replaced by a re-extraction"""
+        with self.lock:
+            if self.content is not None:
+                for chunk_id in chunk_ids:
+                    self.dirty = self.content.remove(chunk_id) or self.dirty
+
+    def remove_courses(self, course_ids: Iterable[int]):
+        with self.lock:
+            if self.courses is not None:
+                for course_id in course_ids:
+                    self.dirty = self.courses.remove(course_id) or self.dirty
+
+    def invalidate(self):
+        """Stop serving queries until the next build (e.g. after a database restore)"""
+        with self.lock:
+            self.stale = True
+
+    def _matches_database(self, db: Session) -> bool:
+        from app.models.course import Course
+        from app.models.document_text import DocumentChunk
+        from app.models.file_node import FileNode
+
+        course_count = db.execute(select(func.count(Course.id))).scalar()
+        file_count = db.execute(
+            select(func.count(FileNode.id)).where(FileNode.is_directory == False)
+        ).scalar()
+        chunk_count = db.execute(select(func.count(DocumentChunk.id))).scalar()
+
+        with self.lock:
+            for index, count in (
+                (self.courses, course_count), (self.files, file_count), (self.content, chunk_count)
+            ):
+                if index.live_count != count:
+                    return False
+                if index.deleted_count > MAX_DELETED_RATIO * max(len(index.doc_ids), 1):
+                    return False
+        return True
+
+    def _add_courses(self, db: Session, index: InvertedIndex, after_id: int, lock=None) -> int:
+        from app.models.course import Course
+
+        rows = db.execute(
+            select(Course.id, Course.name).where(Course.id > after_id).order_by(Course.id)
+        )
+        added = 0
+        for batch in _batches(rows):
+            with lock or nullcontext():
+                for course_id, name in batch:
+                    if not index.add(course_id, course_id, [(name, NAME_WEIGHT)]):
+                        self.stale = True
+                        return added
+                    added += 1
+        return added
+
+    def _add_files(self, db: Session, index: InvertedIndex, after_id: int, lock=None) -> int:
+        from app.models.course import Course
+        from app.models.file_node import FileNode
+
+        rows = db.execute(
+            select(
+                FileNode.id, FileNode.course_id, FileNode.name, FileNode.path, FileNode.file_type, Course.path
+            ).join(
+                Course, Course.id == FileNode.course_id
+            ).where(
+                FileNode.is_directory == False,
+                FileNode.id > after_id
+            ).order_by(FileNode.id),
+            execution_options={"yield_per": 5000}
+        )
+        added = 0
+        for batch in _batches(rows):
+            with lock or nullcontext():
+                for file_id, course_id, name, path, file_type, course_path in batch:
+                    base_name, _ = split_extension(name)
+                    # Folder names between the course root and the file
+                    folders = os.path.dirname(path[len(course_path):]) if path.startswith(course_path) else os.path.dirname(path)
+                    if not index.add(file_id, course_id, [(base_name, NAME_WEIGHT), (folders, PATH_WEIGHT)], file_type):
+                        self.stale = True
+                        return added
+                    added += 1
+        return added
+
+    def _add_chunks(self, db: Session, index: InvertedIndex, chunk_files: array, after_id: int, lock=None) -> int:
+        from app.models.document_text import DocumentChunk
+
+        rows = db.execute(
+            select(
+                DocumentChunk.id, DocumentChunk.file_id, DocumentChunk.course_id,
+                DocumentChunk.location, DocumentChunk.content
+            ).where(
+                DocumentChunk.id > after_id
+            ).order_by(DocumentChunk.id),
+            execution_options={"yield_per": 1000}
+        )
+        added = 0
+        for batch in _batches(rows):
+            with lock or nullcontext():
+                for chunk_id, file_id, course_id, location, content in batch:
+                    # No trigrams: postings for long text would dwarf the name indexes
+                    fields = [(location or "", PATH_WEIGHT), (content, 1)]
+                    if not index.add(chunk_id, course_id, fields, substrings=False):
+                        self.stale = True
+                        return added
+                    chunk_files.append(file_id)
+                    added += 1
+        return added
+
+    # Persistence
+
+    def save(self):
+        """
+        Write the index to disk (atomic replace) if it changed
+        The search lock is only held to take a snapshot; the refresh lock keeps
+        add() from touching the shared postings while they are pickled.
+        """
+        with self._refresh_lock:
+            with self.lock:
+                if self.files is None or not self.dirty:
+                    return
+                state = {
+                    'version': FORMAT_VERSION,
+                    'built_at': self.built_at.isoformat() if self.built_at else None,
+                    'courses': self.courses.snapshot(),
+                    'files': self.files.snapshot(),
+                    'content': self.content.snapshot(),
+                    'chunk_files': self.chunk_files
+                }
+                self.dirty = False
+
+            try:
+                data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+                self._write(data)
+            except Exception:
+                self.dirty = True
+                raise
+
+    def _write(self, data: bytes):
+        """Unique temp file in the target directory, fsynced, then renamed over the index"""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".search_index.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def load(self) -> bool:
+        """Load a saved index; False if missing, unreadable or an old format"""
+        if not os.path.exists(self.path):
+            return False
+
+        try:
+            with open(self.path, "rb") as f:
+                state = _IndexUnpickler(f).load()
+            if state.get('version') != FORMAT_VERSION:
+                return False
+        except Exception as e:
+            logger.warning(f"Search index at {self.path} could not be loaded: {e}")
+            return False
+
+        with self.lock:
+            self.courses, self.files = state['courses'], state['files']
+            self.content, self.chunk_files = state['content'], state['chunk_files']
+            self.built_at = datetime.fromisoformat(state['built_at']) if state['built_at'] else None
+            self.stale = False
+            self.dirty = False
+        return True
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            if self.files is None:
+                return {'ready': False}
+            return {
+                'ready': self.ready,
+                'built_at': self.built_at.isoformat() if self.built_at else None,
+                'courses': self.courses.live_count,
+                'files': self.files.live_count,
+                'deleted_files': self.files.deleted_count,
+                'tokens': len(self.files.postings),
+                'trigrams': len(self.files.grams),
+                'chunks': self.content.live_count,
+                'content_tokens': len(self.content.postings)
+            }
+
+
+def _batches(rows, size: int = 2000):
+    """Row lists of up to size from a streamed result"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+# Global search index instance
+search_index = SearchIndex(settings.SEARCH_INDEX_PATH)
+
+
+def refresh_search_index(_task=None) -> dict:
+    """
+    Periodic background job: load/build the index, catch up with the database, persist
+    Runs in a background thread with its own DB session
+    """
+    from app.db.database import SessionLocal
+
+    if search_index.files is None:
+        search_index.load()
+
+    db = SessionLocal()
+    try:
+        result = search_index.refresh(db)
+        search_index.save()
+        if result in ('built', 'updated'):
+            # Rows written by other workers are searchable now
+            search_cache.bump()
+        return {"result": result, **search_index.get_stats()}
+    finally:
+        db.close()
@@ -0,0 +1,173 @@
+"""
+Buffered search log writer and raw log retention
+"""
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+import threading
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SearchLogWriter:
+    """
+    Writes search logs in batches off the request path
+
+    - record() only appends to an in-memory buffer
+    - A daemon thread flushes every flush_interval_ms, or sooner once
+      batch_size entries are waiting
+    - Each flush is one transaction: a multi-row INSERT into search_logs and
+      an upsert of the per-day counts in search_query_daily
+    - Entries beyond max_pending are dropped (analytics, not user data)
+    """
+
+    def __init__(self, flush_interval_ms: int, batch_size: int, max_pending: int):
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.pending: deque = deque()
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(self, user_id: int, query: str, results_count: int, search_type: str):
+        entry = {
+            'user_id': user_id,
+            'query': query[:255],
+            'results_count': results_count,
+            'search_type': search_type,
+            'created_at': datetime.utcnow()
+        }
+        with self.lock:
+            if len(self.pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self.pending.append(entry)
+            full = len(self.pending) >= self.batch_size
+
+        self._ensure_started()
+        if full:
+            self.wake.set()
+
+    def _ensure_started(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.stopping.clear()
+                self.thread = threading.Thread(target=self._run, name="search-log-writer", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while not self.stopping.is_set():
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Search log flush failed: {e}")
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns entries written"""
+        written = 0
+        while True:
+            with self.lock:
+                batch = [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+            if not batch:
+                return written
+            self._write(batch)
+            written += len(batch)
+
+    def _write(self, batch: list):
+        from app.db.database import SessionLocal
+        from app.models.search import SearchLog, SearchQueryDaily
+
+        counts = Counter((entry['created_at'].date(), entry['query']) for entry in batch)
+        db = SessionLocal()
+        try:
+            db.execute(insert(SearchLog), batch)
+
+            # Sorted so concurrent workers lock (day, query) rows in the same order
+            upsert = insert(SearchQueryDaily).values([
+                {'day': day, 'query': query, 'search_count': count}
+                for (day, query), count in sorted(counts.items())
+            ])
+            db.execute(upsert.on_conflict_do_update(
+                index_elements=['day', 'query'],
+                set_={'search_count': SearchQueryDaily.search_count + upsert.excluded.search_count}
+            ))
+            db.commit()
+            self.written += len(batch)
+        except Exception as e:
+            db.rollback()
+            self.failed += len(batch)
+            logger.error(f"Failed to write {len(batch)} search log entries: {e}")
+        finally:
+            db.close()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the flush thread and write what is left (shutdown)"""
+        self.stopping.set()
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.flush()
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            pending = len(self.pending)
+        return {
+            'pending': pending,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed
+        }
+
+
+# Global search log writer instance
+search_log_writer = SearchLogWriter(
+    flush_interval_ms=settings.SEARCH_LOG_FLUSH_INTERVAL_MS,
+    batch_size=settings.SEARCH_LOG_BATCH_SIZE,
+    max_pending=settings.SEARCH_LOG_MAX_PENDING
+)
+
+
+def compact_search_logs(_task=None) -> dict:
+    """
+    Periodic background job: delete raw search logs past the retention window
+    Their counts stay in search_query_daily. Each batch is its own transaction.
+    """
+    from app.db.database import SessionLocal
+    from app.models.search import SearchLog
+
+    cutoff = datetime.utcnow() - timedelta(days=settings.SEARCH_LOG_RETENTION_DAYS)
+    batch_size = settings.SEARCH_LOG_RETENTION_BATCH_SIZE
+    total = 0
+
+    db = SessionLocal()
+    try:
+        while not (_task and _task.should_abort):
+            batch_ids = select(SearchLog.id).where(SearchLog.created_at < cutoff).limit(batch_size)
+            deleted = db.execute(
+                delete(SearchLog).where(SearchLog.id.in_(batch_ids)).execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+
+            total += deleted
+            if _task:
+                _task.update_heartbeat()
+            if deleted < batch_size:
+                break
+
+        return {"deleted": total}
+    finally:
+        db.close()
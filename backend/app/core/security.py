@@ -1,12 +1,20 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from functools import lru_cache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 import secrets
+import hashlib
 from app.core.config import settings
 
-# Simple password context without bcrypt complications
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes outside the configured cost factor are flagged for rehash on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
@@ -27,6 +35,27 @@ def get_password_hash(password: str) -> str:
         import hashlib
         return hashlib.sha256(password.encode()).hexdigest()
 
+@lru_cache(maxsize=None)
+def bcrypt_available() -> bool:
+    """Whether passlib can load its bcrypt backend (get_password_hash falls back to SHA256 otherwise)"""
+    try:
+        pwd_context.handler("bcrypt").get_backend()
+        return True
+    except Exception as e:
+        print(f"bcrypt backend unavailable: {e}")
+        return False
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if stored hash is legacy (plain/SHA256) or uses a different cost factor"""
+    # The new hash would be the SHA256 fallback again: rewriting it on every login gains nothing
+    if not bcrypt_available():
+        return False
+    try:
+        return pwd_context.needs_update(hashed_password)
+    except (ValueError, TypeError):
+        # Not a recognised bcrypt hash
+        return True
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create short-lived access token (15 minutes)"""
     to_encode = data.copy()
@@ -42,6 +71,10 @@ def create_refresh_token() -> str:
     """Create random refresh token"""
     return secrets.token_urlsafe(32)
 
+def hash_refresh_token(token: str) -> str:
+    """SHA-256 digest used to store and look up refresh tokens"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def decode_access_token(token: str) -> Optional[str]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
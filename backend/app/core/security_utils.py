@@ -6,26 +6,10 @@ import mimetypes
 from pathlib import Path
 from typing import Optional, Tuple
 from app.core.config import settings
+from app.core.file_types import EXTENSIONS
 
-# MIME type mapping for allowed extensions
-ALLOWED_MIME_TYPES = {
-    '.pdf': 'application/pdf',
-    '.mp4': 'video/mp4',
-    '.mp3': 'audio/mpeg',
-    '.txt': 'text/plain',
-    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-    '.jpg': 'image/jpeg',
-    '.jpeg': 'image/jpeg',
-    '.png': 'image/png',
-    '.epub': 'application/epub+zip',
-    '.mkv': 'video/x-matroska',
-    '.avi': 'video/x-msvideo',
-    '.mov': 'video/quicktime',
-    '.wav': 'audio/wav',
-    '.flac': 'audio/flac',
-    '.gif': 'image/gif',
-    '.webp': 'image/webp',
-}
+# MIME type per known extension (from the shared file type registry)
+ALLOWED_MIME_TYPES = {f'.{extension}': mime for extension, (_, mime) in EXTENSIONS.items()}
 
 class SecurityValidator:
     """
@@ -0,0 +1,70 @@
+"""
+Streaming JSON array responses for large list endpoints
+"""
+from fastapi.responses import StreamingResponse
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+import orjson
+
+from app.core.config import settings
+
+RowTransform = Callable[[dict], dict]
+
+
+def encode_json_array(
+    rows: Iterable[Sequence],
+    keys: Sequence[str],
+    transform: Optional[RowTransform] = None,
+    chunk_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    Encode row tuples as a JSON array of objects, chunk_size rows per yield
+    
+    Rows are zipped with keys; transform may rename/derive fields.
+    """
+    yield b"["
+    
+    first = True
+    buffer = []
+    for row in rows:
+        item = dict(zip(keys, row))
+        if transform:
+            item = transform(item)
+        
+        buffer.append(orjson.dumps(item))
+        if len(buffer) >= chunk_size:
+            yield (b"" if first else b",") + b",".join(buffer)
+            first = False
+            buffer = []
+    
+    if buffer:
+        yield (b"" if first else b",") + b",".join(buffer)
+    
+    yield b"]"
+
+
+def stream_query(
+    statement,
+    keys: Sequence[str],
+    transform: Optional[RowTransform] = None,
+    chunk_size: Optional[int] = None,
+    headers: Optional[dict] = None
+) -> StreamingResponse:
+    """
+    Stream a column select() as a JSON array
+    
+    The query runs in its own session while the response is sent, with
+    yield_per so rows are fetched from a server-side cursor in batches
+    instead of being materialized as ORM objects first.
+    """
+    chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+    
+    def generate() -> Iterator[bytes]:
+        from app.db.database import SessionLocal
+        db = SessionLocal()
+        try:
+            result = db.execute(statement, execution_options={"yield_per": chunk_size})
+            yield from encode_json_array(result, keys, transform, chunk_size)
+        finally:
+            db.close()
+    
+    return StreamingResponse(generate(), media_type="application/json", headers=headers)
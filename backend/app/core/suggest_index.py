@@ -0,0 +1,393 @@
+"""
+Prefix autocomplete over course names, file names and popular queries
+"""
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+import logging
+import math
+import re
+import threading
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.search_index import fold, split_extension
+
+logger = logging.getLogger(__name__)
+
+# Sorts after every character a key can contain (end of a prefix range)
+_PREFIX_END = chr(0x10FFFF)
+
+_WORD_RE = re.compile(r"[0-9a-z]+")
+
+# Keys are name suffixes starting at each word, truncated to this length
+MAX_KEY_LENGTH = 48
+
+# Matches taken per prefix range before giving up on the rest
+MAX_SCAN = 512
+
+# Suggestion kinds, in display order for equal edit distance
+COURSE, QUERY, FILE = 0, 1, 2
+KIND_NAMES = {COURSE: 'course', QUERY: 'query', FILE: 'file'}
+
+
+def normalize(text: str) -> str:
+    """'Lecture_01-Intro.PDF' -> 'lecture 01 intro pdf'"""
+    return " ".join(_WORD_RE.findall(fold(text).lower()))
+
+
+def max_distance(query: str) -> int:
+    """Typos tolerated for a query of this length"""
+    if len(query) < 4:
+        return 0
+    return 1 if len(query) < 8 else 2
+
+
+class PrefixArray:
+    """
+    Sorted keys with an entry number each; a prefix is a contiguous range
+
+    Fuzzy lookups walk the array as an implicit trie (a node's children are
+    found by binary search), carrying one Levenshtein row per node and pruning
+    branches that are already more than max_distance edits away.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.entries = array('l')
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def merged(self, pairs: Iterable[Tuple[str, int]]) -> "PrefixArray":
+        """New array with extra (key, entry) pairs (existing runs keep the sort cheap)"""
+        combined = sorted([*zip(self.keys, self.entries), *pairs])
+        result = PrefixArray()
+        result.keys = [key for key, _ in combined]
+        result.entries = array('l', (entry for _, entry in combined))
+        return result
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self.keys, prefix)
+        return lo, bisect_left(self.keys, prefix + _PREFIX_END, lo)
+
+    def fuzzy_ranges(self, query: str, distance: int) -> Iterable[Tuple[int, int, int]]:
+        """
+        (lo, hi, edits) for key ranges whose prefix is within distance edits of query
+        Edits are insertions, deletions, substitutions and adjacent transpositions.
+        The first character must match (typos there are rare, and it bounds the walk);
+        exact prefix matches are not repeated here.
+        """
+        keys = self.keys
+        first = query[0]
+        lo, hi = self.prefix_range(first)
+        root = list(range(len(query) + 1))
+        row = [1] + [min(root[k] + 1, root[k - 1] + (query[k - 1] != first), k + 1) for k in range(1, len(query) + 1)]
+        # (prefix, lo, hi, row, parent row)
+        stack = [(first, lo, hi, row, root)]
+        while stack:
+            prefix, lo, hi, row, parent = stack.pop()
+            depth = len(prefix)
+            last = prefix[-1]
+            i = lo
+            while i < hi:
+                key = keys[i]
+                if len(key) <= depth:
+                    i += 1
+                    continue
+
+                char = key[depth]
+                child = prefix + char
+                j = bisect_left(keys, child + _PREFIX_END, i, hi)
+
+                child_row = [row[0] + 1]
+                for k in range(1, len(query) + 1):
+                    cost = min(
+                        child_row[k - 1] + 1,
+                        row[k] + 1,
+                        row[k - 1] + (query[k - 1] != char)
+                    )
+                    if k > 1 and query[k - 1] == last and query[k - 2] == char:
+                        cost = min(cost, parent[k - 2] + 1)
+                    child_row.append(cost)
+
+                edits = child_row[-1]
+                if 0 < edits <= distance:
+                    yield i, j, edits
+                # Keep descending while a longer prefix could still be closer
+                if min(child_row) < min(edits, distance + 1):
+                    stack.append((child, i, j, child_row, row))
+                i = j
+
+
+class SuggestIndex:
+    """
+    Course names, file names and popular queries for typo-tolerant autocomplete
+
+    - Every word start of a name is a key ('linear algebra' and 'algebra')
+    - Exact prefixes first; edit-distance matches only when those run short
+    - refresh() is driven by a catalog version (row counts and max ids):
+      new rows are merged in, removals or id reuse trigger a full rebuild
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (courses, queries, files, files by course, metadata), swapped as one so readers
+        # see a consistent set; metadata maps entry -> (kind, id, course_id, text, weight)
+        self.state: Tuple[PrefixArray, PrefixArray, PrefixArray, Dict[int, PrefixArray], list] = (
+            PrefixArray(), PrefixArray(), PrefixArray(), {}, []
+        )
+        self.catalog_version: Optional[Tuple[int, int, int, int]] = None
+        self.built_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.catalog_version is not None
+
+    # Queries
+
+    def suggest(self, query: str, course_ids: Optional[Collection[int]], limit: int = 10) -> List[dict]:
+        """
+        Top suggestions for a partially typed query
+        course_ids None = all courses; popular queries are never scoped.
+        """
+        query = normalize(query)[:MAX_KEY_LENGTH]
+        if not query:
+            return []
+
+        courses, queries, files, course_files, metadata = self.state
+        if course_ids is None:
+            arrays = [(courses, None), (queries, None), (files, None)]
+        else:
+            # Enrolled users walk their courses' file arrays, so matches from
+            # other courses cannot crowd theirs out of a large prefix range
+            scope = set(course_ids)
+            arrays = [(courses, scope), (queries, None)]
+            arrays.extend((course_files[course_id], None) for course_id in scope if course_id in course_files)
+        best: Dict[int, int] = {}
+
+        def collect(prefix_array: PrefixArray, scope: Optional[set], lo: int, hi: int, edits: int):
+            entries = prefix_array.entries
+            taken = 0
+            for position in range(lo, hi):
+                entry = entries[position]
+                if scope is not None and metadata[entry][2] not in scope:
+                    continue
+                if edits < best.get(entry, edits + 1):
+                    best[entry] = edits
+                taken += 1
+                if taken == MAX_SCAN:
+                    break
+
+        for prefix_array, scope in arrays:
+            collect(prefix_array, scope, *prefix_array.prefix_range(query), 0)
+
+        # Widen one edit at a time, only while results are short
+        for distance in range(1, max_distance(query) + 1):
+            if len(best) >= limit:
+                break
+            for prefix_array, scope in arrays:
+                for lo, hi, edits in prefix_array.fuzzy_ranges(query, distance):
+                    collect(prefix_array, scope, lo, hi, edits)
+
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (item[1], metadata[item[0]][0], -metadata[item[0]][4], metadata[item[0]][3])
+        )
+
+        results, seen = [], set()
+        for entry, edits in ranked:
+            kind, ref_id, course_id, text, _ = metadata[entry]
+            if (kind, text) in seen:
+                continue
+            seen.add((kind, text))
+            result = {'text': text, 'type': KIND_NAMES[kind], 'distance': edits}
+            if kind != QUERY:
+                result['id'] = ref_id
+                result['course_id'] = course_id
+            results.append(result)
+            if len(results) == limit:
+                break
+        return results
+
+    # Maintenance
+
+    def refresh(self, db: Session) -> str:
+        """
+        Bring the index in line with the catalog version
+        Returns 'built', 'updated' or 'unchanged'.
+        """
+        from app.models.course import Course
+        from app.models.file_node import FileNode
+
+        course_count, course_max = db.execute(select(func.count(Course.id), func.max(Course.id))).one()
+        file_count, file_max = db.execute(
+            select(func.count(FileNode.id), func.max(FileNode.id)).where(FileNode.is_directory == False)
+        ).one()
+        version = (course_count, course_max or 0, file_count, file_max or 0)
+
+        with self.lock:
+            current = self.catalog_version
+            if current == version and self._queries_fresh():
+                return 'unchanged'
+
+            # Rows only appended since the last version: merge them in
+            appended = (
+                current is not None
+                and version[1] >= current[1] and version[3] >= current[3]
+                and version[0] - current[0] == self._count_after(db, Course, current[1])
+                and version[2] - current[2] == self._count_after(db, FileNode, current[3], files=True)
+            )
+            start = time.perf_counter()
+            if appended:
+                self._merge(db, current[1], current[3])
+                result = 'updated'
+            else:
+                self._rebuild(db)
+                result = 'built'
+            self.catalog_version = version
+
+        logger.info(
+            f"Suggest index {result}",
+            extra={'extra': {
+                **self.get_stats(),
+                'seconds': round(time.perf_counter() - start, 3)
+            }}
+        )
+        return result
+
+    def invalidate(self):
+        """Force a full rebuild on the next refresh"""
+        with self.lock:
+            self.catalog_version = None
+
+    def _queries_fresh(self) -> bool:
+        return self.built_at is not None and time.monotonic() - self.built_at < settings.SUGGEST_QUERIES_TTL
+
+    @staticmethod
+    def _count_after(db: Session, model, after_id: int, files: bool = False) -> int:
+        statement = select(func.count(model.id)).where(model.id > after_id)
+        if files:
+            statement = statement.where(model.is_directory == False)
+        return db.execute(statement).scalar()
+
+    def _rebuild(self, db: Session):
+        metadata = []
+        courses = PrefixArray().merged(self._course_pairs(db, metadata, 0))
+        new_files = self._file_pairs(db, metadata, 0)
+        files = PrefixArray().merged(chain.from_iterable(new_files.values()))
+        course_files = {course_id: PrefixArray().merged(pairs) for course_id, pairs in new_files.items()}
+        queries = PrefixArray().merged(self._query_pairs(db, metadata))
+        self.state = (courses, queries, files, course_files, metadata)
+        self.built_at = time.monotonic()
+
+    def _merge(self, db: Session, course_after: int, file_after: int):
+        # Metadata only grows, so readers holding the previous arrays stay valid
+        courses, queries, files, course_files, metadata = self.state
+        courses = courses.merged(self._course_pairs(db, metadata, course_after))
+        new_files = self._file_pairs(db, metadata, file_after)
+        if new_files:
+            files = files.merged(chain.from_iterable(new_files.values()))
+            course_files = dict(course_files)
+            for course_id, pairs in new_files.items():
+                course_files[course_id] = course_files.get(course_id, PrefixArray()).merged(pairs)
+        if not self._queries_fresh():
+            queries = PrefixArray().merged(self._query_pairs(db, metadata))
+            self.built_at = time.monotonic()
+        self.state = (courses, queries, files, course_files, metadata)
+
+    @staticmethod
+    def _keys(text: str) -> List[str]:
+        """Suffixes starting at each word: 'linear algebra' -> ['linear algebra', 'algebra']"""
+        normalized = normalize(text)
+        keys = [normalized[:MAX_KEY_LENGTH]] if normalized else []
+        keys.extend(
+            normalized[i + 1:i + 1 + MAX_KEY_LENGTH]
+            for i, char in enumerate(normalized) if char == " "
+        )
+        return keys
+
+    def _course_pairs(self, db: Session, metadata: list, after_id: int) -> List[Tuple[str, int]]:
+        from app.models.course import Course
+
+        pairs = []
+        for course_id, name in db.execute(select(Course.id, Course.name).where(Course.id > after_id)):
+            metadata.append((COURSE, course_id, course_id, name, 0.0))
+            entry = len(metadata) - 1
+            pairs.extend((key, entry) for key in self._keys(name))
+        return pairs
+
+    def _file_pairs(self, db: Session, metadata: list, after_id: int) -> Dict[int, List[Tuple[str, int]]]:
+        """(key, entry) pairs grouped by course"""
+        from app.models.file_node import FileNode
+
+        rows = db.execute(
+            select(FileNode.id, FileNode.course_id, FileNode.name).where(
+                FileNode.is_directory == False,
+                FileNode.id > after_id
+            ),
+            execution_options={"yield_per": 5000}
+        )
+        by_course: Dict[int, List[Tuple[str, int]]] = {}
+        for file_id, course_id, name in rows:
+            metadata.append((FILE, file_id, course_id, name, 0.0))
+            entry = len(metadata) - 1
+            # The extension is not worth completing on ('pdf' would match every PDF)
+            by_course.setdefault(course_id, []).extend(
+                (key, entry) for key in self._keys(split_extension(name)[0])
+            )
+        return by_course
+
+    def _query_pairs(self, db: Session, metadata: list) -> List[Tuple[str, int]]:
+        from app.models.search import SearchQueryDaily
+
+        since = datetime.utcnow().date() - timedelta(days=settings.SEARCH_POPULAR_DAYS)
+        count = func.sum(SearchQueryDaily.search_count)
+        rows = db.execute(
+            select(SearchQueryDaily.query, count)
+            .where(SearchQueryDaily.day >= since)
+            .group_by(SearchQueryDaily.query)
+            .order_by(count.desc())
+            .limit(settings.SUGGEST_POPULAR_QUERIES)
+        )
+        pairs = []
+        for query, count in rows:
+            key = normalize(query)[:MAX_KEY_LENGTH]
+            if key:
+                metadata.append((QUERY, 0, 0, query, math.log1p(count)))
+                pairs.append((key, len(metadata) - 1))
+        return pairs
+
+    def get_stats(self) -> dict:
+        courses, queries, files, course_files, metadata = self.state
+        return {
+            'ready': self.ready,
+            'catalog_version': self.catalog_version,
+            'courses': len(courses),
+            'files': len(files),
+            'queries': len(queries),
+            'entries': len(metadata)
+        }
+
+
+# Global suggest index instance
+suggest_index = SuggestIndex()
+
+
+def refresh_suggest_index(_task=None) -> dict:
+    """
+    Periodic background job: follow the catalog version and refresh popular queries
+    Runs in a background thread with its own DB session
+    """
+    from app.db.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = suggest_index.refresh(db)
+        return {"result": result, **suggest_index.get_stats()}
+    finally:
+        db.close()
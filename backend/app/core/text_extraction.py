@@ -0,0 +1,473 @@
+"""
+Document text extraction (PDF, EPUB, plain text) for content search
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+import logging
+import math
+import os
+import posixpath
+import re
+import signal
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ElementTree
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.config import settings
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, the parent-side timeout still applies
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Stored FileNode.file_type values (app.core.file_types)
+# PDFs only when pypdf is installed (otherwise they stay unrecorded and are picked up later)
+EXTRACTABLE_TYPES = {'text', 'epub'} | ({'pdf'} if PdfReader is not None else set())
+
+# pg_try_advisory_lock key: one extraction run at a time across API workers
+EXTRACTION_LOCK_KEY = 0x646f6374
+
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_HYPHENATED_RE = re.compile(r"(\w)-\n(\w)")
+
+Section = Tuple[Optional[str], str]  # (location, text)
+
+
+# Extractors (run inside pool workers)
+
+def _pdf_sections(path: str) -> Iterator[Section]:
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        reader.decrypt("")
+    for number, page in enumerate(reader.pages, 1):
+        yield f"p. {number}", page.extract_text() or ""
+
+
+class _HTMLText(HTMLParser):
+    """Visible text of an XHTML chapter and its first heading"""
+
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'blockquote'}
+    SKIPPED_TAGS = {'script', 'style', 'head'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.title: Optional[str] = None
+        self._heading: Optional[List[str]] = None
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+        if tag in ('h1', 'h2', 'h3') and self.title is None:
+            self._heading = []
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in ('h1', 'h2', 'h3') and self._heading is not None:
+            self.title = " ".join("".join(self._heading).split())[:255] or None
+            self._heading = None
+
+    def handle_data(self, data):
+        if self._skipping:
+            return
+        self.parts.append(data)
+        if self._heading is not None:
+            self._heading.append(data)
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+def _epub_sections(path: str) -> Iterator[Section]:
+    """Spine documents in reading order, one section per chapter file"""
+    namespaces = {
+        'container': 'urn:oasis:names:tc:opendocument:xmlns:container',
+        'opf': 'http://www.idpf.org/2007/opf'
+    }
+    with zipfile.ZipFile(path) as book:
+        container = ElementTree.fromstring(book.read('META-INF/container.xml'))
+        package_path = container.find('.//container:rootfile', namespaces).get('full-path')
+        package = ElementTree.fromstring(book.read(package_path))
+        base = posixpath.dirname(package_path)
+
+        manifest = {
+            item.get('id'): item.get('href')
+            for item in package.iterfind('opf:manifest/opf:item', namespaces)
+        }
+        for number, itemref in enumerate(package.iterfind('opf:spine/opf:itemref', namespaces), 1):
+            href = manifest.get(itemref.get('idref'))
+            if not href:
+                continue
+            name = posixpath.normpath(posixpath.join(base, unquote(href.split('#', 1)[0])))
+            parser = _HTMLText()
+            parser.feed(book.read(name).decode('utf-8', errors='replace'))
+            parser.close()
+            yield parser.title or f"Chapter {number}", parser.text()
+
+
+def _text_sections(path: str) -> Iterator[Section]:
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = data.decode('latin-1')
+    yield None, text
+
+
+EXTRACTORS = {
+    'pdf': _pdf_sections,
+    'epub': _epub_sections,
+    'text': _text_sections
+}
+
+
+def chunk_sections(sections: List[Section], chunk_words: int, overlap: int, max_chunks: int) -> List[Section]:
+    """
+    Split each section into passages of chunk_words words, overlapping by overlap words
+    Passages never span two pages/chapters, so each keeps its location.
+    """
+    step = max(chunk_words - overlap, 1)
+    chunks: List[Section] = []
+    for location, text in sections:
+        words = _CONTROL_RE.sub(" ", _HYPHENATED_RE.sub(r"\1\2", text)).split()
+        for start in range(0, max(len(words) - overlap, 1), step):
+            passage = words[start:start + chunk_words]
+            if passage:
+                chunks.append((location, " ".join(passage)))
+            if len(chunks) >= max_chunks:
+                return chunks
+    return chunks
+
+
+class _ExtractionTimeout(Exception):
+    pass
+
+
+def _timed_out(signum, frame):
+    raise _ExtractionTimeout()
+
+
+def _limit_memory(memory_bytes: int):
+    """Pool initializer: cap the worker's address space"""
+    if resource is not None and memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def _limit_cpu(seconds: int):
+    """CPU-time limit for this file: the kernel kills a worker stuck in native code (SIGXCPU)"""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime) + seconds
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def extract_document(path: str, file_type: str, timeout: int, chunk_words: int, overlap: int, max_chunks: int) -> dict:
+    """
+    Pool worker: text chunks of one file
+    Returns {'sections': N, 'chunks': [(location, text)]} or {'error': ...}
+    """
+    alarm = hasattr(signal, 'SIGALRM')
+    if alarm:
+        signal.signal(signal.SIGALRM, _timed_out)
+        signal.alarm(timeout)
+    if resource is not None:
+        _limit_cpu(2 * timeout)
+
+    try:
+        sections = list(EXTRACTORS[file_type](path))
+        return {
+            'sections': len(sections),
+            'chunks': chunk_sections(sections, chunk_words, overlap, max_chunks)
+        }
+    except _ExtractionTimeout:
+        return {'error': f"Timed out after {timeout}s"}
+    except MemoryError:
+        return {'error': "Memory limit exceeded"}
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"[:500]}
+    finally:
+        if alarm:
+            signal.alarm(0)
+
+
+class TextExtractionPool:
+    """
+    Process pool for document text extraction
+
+    - Workers run under an address-space limit (memory_mb)
+    - Each file gets timeout seconds: SIGALRM inside the worker, plus a
+      CPU-time rlimit that kills a worker stuck in native code
+    - A killed worker breaks the pool; it is recreated and the files that
+      were in flight are retried one at a time to find the culprit
+    """
+
+    def __init__(self, workers: int, timeout: int, memory_mb: int):
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.memory_bytes = memory_mb * 1024 * 1024
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.extracted = 0
+        self.failed = 0
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_limit_memory,
+                    initargs=(self.memory_bytes,)
+                )
+            return self._executor
+
+    def _reset(self):
+        """Drop a broken or stuck pool (a stuck worker is left to its CPU limit)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self.restarts += 1
+
+    def _submit(self, path: str, file_type: str):
+        return self._get_executor().submit(
+            extract_document, path, file_type, self.timeout,
+            settings.DOCUMENT_TEXT_CHUNK_WORDS,
+            settings.DOCUMENT_TEXT_CHUNK_OVERLAP,
+            settings.DOCUMENT_TEXT_MAX_CHUNKS
+        )
+
+    def extract(self, jobs: List[Tuple[int, str, str]]) -> Dict[int, dict]:
+        """Extract (file_id, path, file_type) jobs; returns results by file id"""
+        results: Dict[int, dict] = {}
+        futures = [(job, self._submit(job[1], job[2])) for job in jobs]
+        # Backstop for workers that never answer; the in-worker limits normally fire first
+        deadline = time.monotonic() + 2 * self.timeout * (math.ceil(len(jobs) / self.workers) + 1)
+        broken, stuck = [], False
+
+        for job, future in futures:
+            try:
+                results[job[0]] = future.result(timeout=max(deadline - time.monotonic(), 0.1))
+            except BrokenProcessPool:
+                broken.append(job)
+            except FutureTimeoutError:
+                results[job[0]] = {'error': "Timed out waiting for the extraction worker"}
+                stuck = True
+
+        if broken or stuck:
+            self._reset()
+        for file_id, path, file_type in broken:
+            try:
+                results[file_id] = self._submit(path, file_type).result(timeout=2 * self.timeout + 10)
+            except (BrokenProcessPool, FutureTimeoutError):
+                self._reset()
+                results[file_id] = {'error': "Extraction worker killed (time or memory limit)"}
+
+        for result in results.values():
+            if 'error' in result:
+                self.failed += 1
+            else:
+                self.extracted += 1
+        return results
+
+    def get_stats(self) -> dict:
+        return {
+            'workers': self.workers,
+            'file_types': sorted(EXTRACTABLE_TYPES),
+            'extracted': self.extracted,
+            'failed': self.failed,
+            'restarts': self.restarts
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Global text extraction pool instance
+text_extraction_pool = TextExtractionPool(
+    workers=settings.DOCUMENT_TEXT_WORKERS,
+    timeout=settings.DOCUMENT_TEXT_TIMEOUT,
+    memory_mb=settings.DOCUMENT_TEXT_MEMORY_MB
+)
+
+
+def _candidates_statement(after_id: int, limit: int):
+    """Extractable files after after_id with their recorded size/mtime (None = never extracted)"""
+    from app.models.document_text import DocumentText
+    from app.models.file_node import FileNode
+
+    return select(
+        FileNode.id, FileNode.course_id, FileNode.file_type, FileNode.path,
+        DocumentText.size, DocumentText.mtime_ns
+    ).outerjoin(
+        DocumentText, DocumentText.file_id == FileNode.id
+    ).where(
+        FileNode.is_directory == False,
+        FileNode.id > after_id,
+        FileNode.file_type.in_(sorted(EXTRACTABLE_TYPES))
+    ).order_by(FileNode.id).limit(limit)
+
+
+def _store(db, jobs: List[dict], results: Dict[int, dict]) -> Tuple[List[int], Counter]:
+    """Replace chunks and extraction rows of one batch; returns (removed chunk ids, status counts)"""
+    from app.models.document_text import DocumentChunk, DocumentText
+
+    file_ids = [job['file_id'] for job in jobs]
+    removed = db.execute(
+        delete(DocumentChunk).where(DocumentChunk.file_id.in_(file_ids)).returning(DocumentChunk.id)
+    ).scalars().all()
+
+    chunks, states, statuses = [], [], Counter()
+    for job in jobs:
+        result = results[job['file_id']]
+        file_chunks = result.get('chunks', [])
+        status = 'failed' if 'error' in result else ('indexed' if file_chunks else 'empty')
+        statuses[status] += 1
+        chunks.extend(
+            {
+                'file_id': job['file_id'],
+                'course_id': job['course_id'],
+                'position': position,
+                'location': location[:255] if location else None,
+                'content': content
+            }
+            for position, (location, content) in enumerate(file_chunks)
+        )
+        states.append({
+            'file_id': job['file_id'],
+            'size': job['size'],
+            'mtime_ns': job['mtime_ns'],
+            'status': status,
+            'sections': result.get('sections', 0),
+            'chunk_count': len(file_chunks),
+            'error': result.get('error'),
+            'extracted_at': func.now()
+        })
+
+    if chunks:
+        db.execute(insert(DocumentChunk), chunks)
+    upsert = pg_insert(DocumentText).values(states)
+    db.execute(upsert.on_conflict_do_update(
+        index_elements=['file_id'],
+        set_={column: upsert.excluded[column] for column in (
+            'size', 'mtime_ns', 'status', 'sections', 'chunk_count', 'error', 'extracted_at'
+        )}
+    ))
+    return removed, statuses
+
+
+def extract_document_text(_task=None) -> dict:
+    """
+    Background job: extract text of new or changed documents and index it
+    Runs after scans and periodically. A file is extracted again only when its
+    on-disk size or mtime differs from the recorded one; failures are recorded
+    too, so a broken file is not retried until it changes.
+    """
+    from app.db.database import SessionLocal, engine
+    from app.core.search_cache import search_cache
+    from app.core.search_index import search_index
+
+    totals = Counter()
+    removed_chunks: List[int] = []
+
+    # AUTOCOMMIT: the lock connection must not sit idle in a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        if not lock_conn.execute(select(func.pg_try_advisory_lock(EXTRACTION_LOCK_KEY))).scalar():
+            return {"skipped": "Extraction already running in another worker"}
+
+        db = SessionLocal()
+        try:
+            after_id = 0
+            while not (_task and _task.should_abort):
+                rows = db.execute(_candidates_statement(after_id, settings.DOCUMENT_TEXT_BATCH_SIZE)).all()
+                if not rows:
+                    break
+                after_id = rows[-1].id
+                totals['checked'] += len(rows)
+
+                jobs = []
+                for file_id, course_id, file_type, path, size, mtime_ns in rows:
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        totals['missing'] += 1
+                        continue
+                    if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                        jobs.append({
+                            'file_id': file_id,
+                            'course_id': course_id,
+                            'path': path,
+                            'file_type': file_type,
+                            'size': stat.st_size,
+                            'mtime_ns': stat.st_mtime_ns
+                        })
+
+                if jobs:
+                    results = text_extraction_pool.extract(
+                        [(job['file_id'], job['path'], job['file_type']) for job in jobs]
+                    )
+                    try:
+                        removed, statuses = _store(db, jobs, results)
+                        db.commit()
+                        removed_chunks.extend(removed)
+                        totals.update(statuses)
+                    except Exception as e:
+                        # e.g. a file deleted by a scan meanwhile; retried on the next run
+                        db.rollback()
+                        totals['write_failed'] += len(jobs)
+                        logger.error(f"Failed to store extracted text for {len(jobs)} files: {e}")
+
+                if _task:
+                    _task.update_heartbeat()
+
+            changed = totals['indexed'] + totals['empty'] + totals['failed']
+            if changed and search_index.ready:
+                search_index.remove_chunks(removed_chunks)
+                search_index.refresh(db)
+                search_index.save()
+            if changed:
+                search_cache.bump()
+        finally:
+            db.close()
+            lock_conn.execute(select(func.pg_advisory_unlock(EXTRACTION_LOCK_KEY)))
+
+    logger.info("Document text extraction finished", extra={'extra': dict(totals)})
+    return dict(totals)
+
+
+def schedule_document_extraction():
+    """Start an extraction run in the background (no-op if one is already running)"""
+    from app.core.background_tasks import task_manager
+
+    try:
+        task_manager.submit_task(
+            task_id="document_text_extraction",
+            task_type="maintenance",
+            task_func=extract_document_text
+        )
+    except ValueError:
+        pass
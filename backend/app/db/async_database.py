@@ -0,0 +1,74 @@
+"""
+Async database layer (AsyncSession + asyncpg) for read endpoints
+
+Only used when ASYNC_DB_ENABLED is set; the engine is created on first
+use so deployments without asyncpg installed are unaffected.
+"""
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, async_sessionmaker, create_async_engine
+from typing import AsyncGenerator, Optional
+from app.core.config import settings
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+def get_async_database_url() -> str:
+    """ASYNC_DATABASE_URL, or DATABASE_URL switched to the asyncpg driver"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    
+    url = make_url(settings.DATABASE_URL)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+def get_async_engine() -> AsyncEngine:
+    """Create async engine on first use with the same pool settings as the sync engine"""
+    global _async_engine, _async_session_factory
+    
+    if _async_engine is None:
+        url = get_async_database_url()
+        options = {}
+        
+        if not url.startswith("sqlite"):
+            options = {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_recycle": settings.DB_POOL_RECYCLE,
+                "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            }
+        
+        if url.startswith("postgresql+asyncpg"):
+            server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+            if settings.DB_STATEMENT_TIMEOUT_MS:
+                server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+            options["connect_args"] = {"server_settings": server_settings}
+        
+        _async_engine = create_async_engine(url, **options)
+        _async_session_factory = async_sessionmaker(
+            _async_engine,
+            expire_on_commit=False,
+            autoflush=False
+        )
+    
+    return _async_engine
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+def async_session() -> AsyncSession:
+    """New AsyncSession outside request dependencies (e.g. concurrent sub-queries)"""
+    get_async_engine()
+    return _async_session_factory()
+
+async def dispose_async_engine():
+    """Close pooled async connections (shutdown / after restore)"""
+    global _async_engine, _async_session_factory
+    
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
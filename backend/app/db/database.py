@@ -2,10 +2,43 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool
 
-engine = create_engine(settings.DATABASE_URL)
+def get_engine_options(statement_timeout: bool = True) -> dict:
+    """
+    Build create_engine() options from Settings
+    Pool tuning only applies to server databases (not SQLite)
+    statement_timeout=False disables the limit (migrations), even a role/database default
+    """
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return {}
+    
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    
+    if settings.DATABASE_URL.startswith("postgresql"):
+        connect_args = {"application_name": settings.DB_APPLICATION_NAME}
+        if not statement_timeout:
+            connect_args["options"] = "-c statement_timeout=0"
+        elif settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        options["connect_args"] = connect_args
+    
+    return options
+
+engine = create_engine(settings.DATABASE_URL, **get_engine_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# app.migrations: backfills and CREATE INDEX CONCURRENTLY run longer than the request
+# statement_timeout (a timed-out CONCURRENTLY build leaves an INVALID index behind)
+migration_engine = create_engine(settings.DATABASE_URL, **get_engine_options(statement_timeout=False))
+
 Base = declarative_base()
 
 def get_db():
@@ -0,0 +1,142 @@
+"""
+Per-request SQL instrumentation and per-route histograms
+"""
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Longest statement text kept for the slowest query
+MAX_STATEMENT_LENGTH = 500
+
+
+class RequestQueryStats:
+    """
+    SQL statements run while handling one request
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float, rows: int):
+        # Streamed bodies run their queries in a worker thread
+        with self.lock:
+            self.count += 1
+            self.db_seconds += seconds
+            if rows > 0:
+                self.rows += rows
+            if seconds >= self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_statement = statement[:MAX_STATEMENT_LENGTH]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "db_queries": self.count,
+                "db_time_ms": round(self.db_seconds * 1000, 3),
+                "db_rows": self.rows,
+                "slowest_query_ms": round(self.slowest_seconds * 1000, 3),
+                "slowest_query": self.slowest_statement
+            }
+
+
+# Stats for the request being handled (None outside requests)
+request_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar('request_query_stats', default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if request_query_stats.get() is not None:
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = request_query_stats.get()
+    start_times = conn.info.get('query_start_time')
+    if stats is None or not start_times:
+        return
+
+    seconds = time.perf_counter() - start_times.pop()
+    # rowcount is -1 for server-side (streamed) cursors; only count result sets
+    rows = cursor.rowcount if cursor.description is not None else 0
+    stats.record(statement, seconds, rows)
+
+
+class Histogram:
+    """Fixed-bucket histogram (bucket i counts values <= bounds[i], last is +Inf)"""
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "buckets": {
+                **{f"le_{bound:g}": n for bound, n in zip(self.bounds, self.buckets)},
+                "le_inf": self.buckets[-1]
+            }
+        }
+
+
+LATENCY_BOUNDS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+QUERY_COUNT_BOUNDS = [0, 1, 2, 5, 10, 20, 50, 100]
+
+
+class RouteMetrics:
+    """
+    Thread-safe per-route histograms of latency, DB time and statement count
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.routes: Dict[str, Dict[str, Histogram]] = {}
+
+    def observe(self, route: str, duration_ms: float, stats: Dict[str, Any]):
+        with self.lock:
+            histograms = self.routes.get(route)
+            if histograms is None:
+                histograms = self.routes[route] = {
+                    "latency_ms": Histogram(LATENCY_BOUNDS_MS),
+                    "db_time_ms": Histogram(LATENCY_BOUNDS_MS),
+                    "db_queries": Histogram(QUERY_COUNT_BOUNDS)
+                }
+            histograms["latency_ms"].observe(duration_ms)
+            histograms["db_time_ms"].observe(stats["db_time_ms"])
+            histograms["db_queries"].observe(stats["db_queries"])
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                route: {name: histogram.snapshot() for name, histogram in histograms.items()}
+                for route, histograms in sorted(self.routes.items())
+            }
+
+
+# Global per-route metrics instance
+route_metrics = RouteMetrics()
@@ -7,6 +7,16 @@ from app.db.database import engine, Base
 from app.core.background_tasks import task_manager
 from app.core.logging_config import setup_logging
 from app.core.correlation_middleware import CorrelationIdMiddleware
+from app.core.query_metrics_middleware import QueryMetricsMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.password_pool import password_pool
+from app.db.async_database import dispose_async_engine
+from app.services.auth_service import sweep_refresh_tokens
+from app.core.search_index import refresh_search_index
+from app.core.suggest_index import refresh_suggest_index
+from app.core.search_log_writer import search_log_writer, compact_search_logs
+from app.core.text_extraction import extract_document_text, text_extraction_pool
 import logging
 
 # Setup logging
@@ -25,12 +35,52 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up LMS API...", extra={'event': 'startup'})
     Base.metadata.create_all(bind=engine)
     
+    # Periodic maintenance
+    task_manager.register_periodic_task(
+        task_id="refresh_token_sweep",
+        task_type="maintenance",
+        task_func=sweep_refresh_tokens,
+        interval_seconds=settings.REFRESH_TOKEN_SWEEP_INTERVAL
+    )
+    # Loads the saved search index (or builds it), then keeps it in step with other workers
+    task_manager.register_periodic_task(
+        task_id="search_index_refresh",
+        task_type="maintenance",
+        task_func=refresh_search_index,
+        interval_seconds=settings.SEARCH_INDEX_REFRESH_INTERVAL,
+        run_immediately=True
+    )
+    task_manager.register_periodic_task(
+        task_id="suggest_index_refresh",
+        task_type="maintenance",
+        task_func=refresh_suggest_index,
+        interval_seconds=settings.SUGGEST_REFRESH_INTERVAL,
+        run_immediately=True
+    )
+    task_manager.register_periodic_task(
+        task_id="search_log_retention",
+        task_type="maintenance",
+        task_func=compact_search_logs,
+        interval_seconds=settings.SEARCH_LOG_RETENTION_INTERVAL
+    )
+    # Catch-up for documents added outside scans (uploads) or changed on disk
+    task_manager.register_periodic_task(
+        task_id="document_text_extraction",
+        task_type="maintenance",
+        task_func=extract_document_text,
+        interval_seconds=settings.DOCUMENT_TEXT_INTERVAL
+    )
+    
     yield
     
     # Shutdown
     logger.info("Shutting down LMS API...", extra={'event': 'shutdown'})
     try:
         task_manager.shutdown(timeout=10)  # Reduced timeout
+        search_log_writer.stop()  # Write buffered search logs
+        text_extraction_pool.shutdown()
+        password_pool.shutdown()
+        await dispose_async_engine()
         logger.info("Shutdown complete", extra={'event': 'shutdown_complete'})
     except Exception as e:
         logger.error(f"Error during shutdown: {e}", extra={'event': 'shutdown_error'})
@@ -51,11 +101,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Per-request SQL metrics (inside the correlation ID middleware)
+if settings.QUERY_METRICS_ENABLED:
+    app.add_middleware(QueryMetricsMiddleware, server_timing=settings.DEBUG)
+
 # Add correlation ID middleware
 app.add_middleware(CorrelationIdMiddleware)
 
+# Compress responses (outermost, so it sees the final body)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
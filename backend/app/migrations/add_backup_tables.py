@@ -5,13 +5,11 @@ Run this script to add the new tables for backup/restore functionality:
 python -m app.migrations.add_backup_tables
 """
 
-from sqlalchemy import create_engine, text
-from app.core.config import settings
+from sqlalchemy import text
+from app.db.database import migration_engine
 
 def upgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         # Create backup_history table
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS backup_history (
@@ -43,9 +41,7 @@ def upgrade():
         print("✓ Tables created successfully")
 
 def downgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         conn.execute(text("DROP TABLE IF EXISTS backup_history CASCADE;"))
         conn.execute(text("DROP TABLE IF EXISTS operation_lock CASCADE;"))
         conn.commit()
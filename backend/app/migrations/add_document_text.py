@@ -0,0 +1,96 @@
+"""
+Add document text tables for content search
+
+- document_texts: extraction state per file (size/mtime at extraction, status)
+- document_chunks: searchable passages, one page or chapter at most
+- document_chunks.search_vector: location (weight B) + passage text, kept current
+  by a BEFORE INSERT/UPDATE trigger (SEARCH_BACKEND=postgres), GIN index built CONCURRENTLY
+
+Run: python -m app.migrations.add_document_text
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+BATCH_SIZE = 5000
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS document_texts (
+                file_id INTEGER PRIMARY KEY REFERENCES file_nodes(id) ON DELETE CASCADE,
+                size BIGINT NOT NULL,
+                mtime_ns BIGINT NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                sections INTEGER DEFAULT 0 NOT NULL,
+                chunk_count INTEGER DEFAULT 0 NOT NULL,
+                error VARCHAR(500),
+                extracted_at TIMESTAMP NOT NULL
+            );
+            
+            CREATE TABLE IF NOT EXISTS document_chunks (
+                id SERIAL PRIMARY KEY,
+                file_id INTEGER NOT NULL REFERENCES file_nodes(id) ON DELETE CASCADE,
+                course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                location VARCHAR(255),
+                content TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_document_chunks_file_position ON document_chunks (file_id, position);
+            CREATE INDEX IF NOT EXISTS idx_document_chunks_course ON document_chunks (course_id);
+            
+            ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS search_vector tsvector;
+            
+            CREATE OR REPLACE FUNCTION document_chunks_search_vector_trigger() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector('simple', coalesce(NEW.location, '')), 'B') ||
+                    to_tsvector('simple', NEW.content);
+                RETURN NEW;
+            END
+            $$;
+            
+            DROP TRIGGER IF EXISTS document_chunks_search_vector ON document_chunks;
+            CREATE TRIGGER document_chunks_search_vector
+                BEFORE INSERT OR UPDATE OF location, content ON document_chunks
+                FOR EACH ROW EXECUTE FUNCTION document_chunks_search_vector_trigger();
+        """))
+        conn.commit()
+        print("✓ document_texts and document_chunks created")
+        
+        # Chunks stored before the trigger existed (tables created by the app at startup)
+        low, high = conn.execute(text("SELECT min(id), max(id) FROM document_chunks")).one()
+        if low is not None:
+            for start in range(low, high + 1, BATCH_SIZE):
+                conn.execute(text("""
+                    UPDATE document_chunks
+                    SET location = location
+                    WHERE id >= :start AND id < :end AND search_vector IS NULL
+                """), {"start": start, "end": start + BATCH_SIZE})
+                conn.commit()
+            print("✓ document_chunks search_vector backfilled")
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with migration_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunks_search_vector "
+            "ON document_chunks USING gin (search_vector);"
+        ))
+        conn.execute(text("ANALYZE document_chunks;"))
+        print("✓ idx_document_chunks_search_vector")
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            DROP TABLE IF EXISTS document_chunks;
+            DROP TABLE IF EXISTS document_texts;
+            DROP FUNCTION IF EXISTS document_chunks_search_vector_trigger();
+        """))
+        conn.commit()
+        print("✓ Document text tables dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_document_text")
+    upgrade()
+    print("Migration completed!")
@@ -0,0 +1,31 @@
+"""
+Add users.enrollment_version for cross-worker enrollment index invalidation
+
+Enroll/unenroll bump it; each worker's enrollment index reloads a user's courses
+when the version on the requesting user's row differs from the cached one.
+
+Run: python -m app.migrations.add_enrollment_version
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        # Constant default: no table rewrite on PostgreSQL 11+
+        conn.execute(text(
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS enrollment_version INTEGER NOT NULL DEFAULT 0;"
+        ))
+        conn.commit()
+        print("✓ users.enrollment_version")
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("ALTER TABLE users DROP COLUMN IF EXISTS enrollment_version;"))
+        conn.commit()
+        print("✓ users.enrollment_version dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_enrollment_version")
+    upgrade()
+    print("Migration completed!")
@@ -4,13 +4,11 @@ Add enrollments table
 Run: python -m app.migrations.add_enrollments
 """
 
-from sqlalchemy import create_engine, text
-from app.core.config import settings
+from sqlalchemy import text
+from app.db.database import migration_engine
 
 def upgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         # Create enrollments table
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS enrollments (
@@ -30,9 +28,7 @@ def upgrade():
         print("✓ enrollments table created successfully")
 
 def downgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         conn.execute(text("DROP TABLE IF EXISTS enrollments CASCADE;"))
         conn.commit()
         print("✓ enrollments table dropped")
@@ -0,0 +1,52 @@
+"""
+Add FileNode.child_count and the children listing index for the lazy tree API
+
+- child_count column, backfilled from existing parent_id links
+- idx_file_nodes_children (course_id, parent_id, is_directory DESC, name)
+  replaces idx_file_nodes_course_parent (same leading columns)
+
+Run: python -m app.migrations.add_file_tree_children
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            ALTER TABLE file_nodes ADD COLUMN IF NOT EXISTS child_count INTEGER NOT NULL DEFAULT 0;
+            
+            UPDATE file_nodes f
+            SET child_count = c.cnt
+            FROM (
+                SELECT parent_id, COUNT(*) AS cnt
+                FROM file_nodes
+                WHERE parent_id IS NOT NULL
+                GROUP BY parent_id
+            ) c
+            WHERE f.id = c.parent_id;
+            
+            CREATE INDEX IF NOT EXISTS idx_file_nodes_children
+                ON file_nodes(course_id, parent_id, is_directory DESC, name);
+            DROP INDEX IF EXISTS idx_file_nodes_course_parent;
+            
+            ANALYZE file_nodes;
+        """))
+        
+        conn.commit()
+        print("✓ file_nodes.child_count and children index created")
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_file_nodes_course_parent ON file_nodes(course_id, parent_id);
+            DROP INDEX IF EXISTS idx_file_nodes_children;
+            ALTER TABLE file_nodes DROP COLUMN IF EXISTS child_count;
+        """))
+        conn.commit()
+        print("✓ file_nodes.child_count and children index dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_file_tree_children")
+    upgrade()
+    print("Migration completed!")
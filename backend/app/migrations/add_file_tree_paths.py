@@ -0,0 +1,54 @@
+"""
+Add FileNode.tree_path (materialized path) for subtree queries
+
+- tree_path holds ancestor ids including self, e.g. "/12/45/78/"
+- Backfilled with a recursive CTE from parent_id links
+- varchar_pattern_ops index so LIKE '/12/45/%' is an index range scan
+
+Run: python -m app.migrations.add_file_tree_paths
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            ALTER TABLE file_nodes ADD COLUMN IF NOT EXISTS tree_path VARCHAR;
+            
+            WITH RECURSIVE tree AS (
+                SELECT id, '/' || id || '/' AS tree_path
+                FROM file_nodes
+                WHERE parent_id IS NULL
+                UNION ALL
+                SELECT f.id, t.tree_path || f.id || '/'
+                FROM file_nodes f
+                JOIN tree t ON f.parent_id = t.id
+            )
+            UPDATE file_nodes f
+            SET tree_path = tree.tree_path
+            FROM tree
+            WHERE f.id = tree.id;
+            
+            CREATE INDEX IF NOT EXISTS idx_file_nodes_tree_path
+                ON file_nodes(tree_path varchar_pattern_ops);
+            
+            ANALYZE file_nodes;
+        """))
+        
+        conn.commit()
+        print("✓ file_nodes.tree_path added and backfilled")
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            DROP INDEX IF EXISTS idx_file_nodes_tree_path;
+            ALTER TABLE file_nodes DROP COLUMN IF EXISTS tree_path;
+        """))
+        conn.commit()
+        print("✓ file_nodes.tree_path dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_file_tree_paths")
+    upgrade()
+    print("Migration completed!")
@@ -0,0 +1,74 @@
+"""
+Normalize stored file types and index them for search filters and facets
+
+- file_nodes.file_type: recomputed for files from the extension registry
+  (app.core.file_types); uploads used to store the browser's MIME type and the
+  scanner knew fewer extensions. Batched by id range.
+- file_rollups (keyed by file_type): rebuilt per course from the normalized types
+  (every course, so a rerun after an interruption still repairs them)
+- idx_file_nodes_type: partial (file_type, course_id) for files, built CONCURRENTLY
+
+Run: python -m app.migrations.add_file_type_index
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+from app.db.database import migration_engine
+from app.services.rollup_service import RollupService
+from app.core.file_types import EXTENSIONS, UNKNOWN_TYPE
+
+BATCH_SIZE = 20000
+
+def upgrade():
+    # Registry as an inline VALUES list (constants, no user input)
+    registry = ", ".join(f"('{extension}', '{file_type}')" for extension, (file_type, _) in EXTENSIONS.items())
+    
+    with migration_engine.connect() as conn:
+        low, high = conn.execute(text("SELECT min(id), max(id) FROM file_nodes")).one()
+        updated = 0
+        if low is not None:
+            for start in range(low, high + 1, BATCH_SIZE):
+                result = conn.execute(text(f"""
+                    UPDATE file_nodes f
+                    SET file_type = coalesce(registry.file_type, :unknown)
+                    FROM file_nodes n
+                    LEFT JOIN (VALUES {registry}) AS registry(extension, file_type)
+                        ON registry.extension = lower(substring(n.name from '\\.([^.]+)$'))
+                    WHERE f.id = n.id
+                        AND n.id >= :start AND n.id < :end
+                        AND n.is_directory = FALSE
+                        AND f.file_type IS DISTINCT FROM coalesce(registry.file_type, :unknown)
+                """), {"start": start, "end": start + BATCH_SIZE, "unknown": UNKNOWN_TYPE})
+                conn.commit()
+                updated += result.rowcount
+        print(f"✓ file_nodes.file_type normalized ({updated} rows)")
+    
+    # Rollups are keyed by file type: old keys would stay stale and removals
+    # (subtracted under the new type) would go negative
+    if inspect(migration_engine).has_table("file_rollups"):
+        with Session(migration_engine) as db:
+            course_ids = db.execute(text("SELECT id FROM courses ORDER BY id")).scalars().all()
+            for course_id in course_ids:
+                RollupService(db).rebuild(course_id)
+                db.commit()
+        print(f"✓ file_rollups rebuilt for {len(course_ids)} courses")
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with migration_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_nodes_type "
+            "ON file_nodes (file_type, course_id) WHERE is_directory = FALSE;"
+        ))
+        conn.execute(text("ANALYZE file_nodes;"))
+        print("✓ idx_file_nodes_type")
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS idx_file_nodes_type;"))
+        conn.commit()
+        print("✓ idx_file_nodes_type dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_file_type_index")
+    upgrade()
+    print("Migration completed!")
@@ -0,0 +1,118 @@
+"""
+Add composite, partial and trigram indexes for hot query shapes
+
+- file_nodes: (course_id, parent_id), parent_id, partial (course_id, name) for files
+- user_progress: UNIQUE (user_id, file_id) + file_id
+- user_notifications: UNIQUE (user_id, announcement_id), (user_id, is_read),
+  partial unread index
+- search_logs: (user_id, created_at) for recent searches
+- courses: (category_id, name)
+- pg_trgm GIN indexes on lower(name)/lower(path) for LIKE '%q%' search,
+  skipped if the extension cannot be created
+
+Duplicate rows are removed (highest id kept) before unique constraints are added.
+
+Run: python -m app.migrations.add_hot_query_indexes
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+TRIGRAM_INDEXES = [
+    ("idx_courses_name_trgm", "courses", "lower(name)"),
+    ("idx_file_nodes_name_trgm", "file_nodes", "lower(name)"),
+    ("idx_file_nodes_path_trgm", "file_nodes", "lower(path)"),
+]
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        # Deduplicate before adding unique constraints
+        conn.execute(text("""
+            DELETE FROM user_progress a
+            USING user_progress b
+            WHERE a.user_id = b.user_id AND a.file_id = b.file_id AND a.id < b.id;
+            
+            DELETE FROM user_notifications a
+            USING user_notifications b
+            WHERE a.user_id = b.user_id AND a.announcement_id = b.announcement_id AND a.id < b.id;
+        """))
+        
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_constraint WHERE conname = 'uq_user_progress_user_file'
+                ) THEN
+                    ALTER TABLE user_progress
+                    ADD CONSTRAINT uq_user_progress_user_file UNIQUE (user_id, file_id);
+                END IF;
+                
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_constraint WHERE conname = 'uq_user_notifications_user_announcement'
+                ) THEN
+                    ALTER TABLE user_notifications
+                    ADD CONSTRAINT uq_user_notifications_user_announcement UNIQUE (user_id, announcement_id);
+                END IF;
+            END $$;
+        """))
+        
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_file_nodes_course_parent ON file_nodes(course_id, parent_id);
+            CREATE INDEX IF NOT EXISTS idx_file_nodes_parent_id ON file_nodes(parent_id);
+            CREATE INDEX IF NOT EXISTS idx_file_nodes_course_files ON file_nodes(course_id, name)
+                WHERE is_directory = FALSE;
+            
+            CREATE INDEX IF NOT EXISTS idx_user_progress_file_id ON user_progress(file_id);
+            
+            CREATE INDEX IF NOT EXISTS idx_user_notifications_user_read ON user_notifications(user_id, is_read);
+            CREATE INDEX IF NOT EXISTS idx_user_notifications_unread ON user_notifications(user_id)
+                WHERE is_read = FALSE;
+            
+            CREATE INDEX IF NOT EXISTS idx_search_logs_user_created ON search_logs(user_id, created_at);
+            
+            CREATE INDEX IF NOT EXISTS idx_courses_category_name ON courses(category_id, name);
+        """))
+        conn.commit()
+        print("✓ Composite and partial indexes created")
+        
+        # Trigram indexes need pg_trgm (may require superuser to install)
+        try:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+            for name, table, expression in TRIGRAM_INDEXES:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({expression} gin_trgm_ops);"
+                ))
+            conn.commit()
+            print("✓ Trigram indexes created")
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠ pg_trgm not available, trigram indexes skipped: {e}")
+        
+        conn.execute(text("ANALYZE file_nodes, user_progress, user_notifications, search_logs, courses;"))
+        conn.commit()
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        for name, _, _ in TRIGRAM_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name};"))
+        
+        conn.execute(text("""
+            DROP INDEX IF EXISTS idx_file_nodes_course_parent;
+            DROP INDEX IF EXISTS idx_file_nodes_parent_id;
+            DROP INDEX IF EXISTS idx_file_nodes_course_files;
+            DROP INDEX IF EXISTS idx_user_progress_file_id;
+            DROP INDEX IF EXISTS idx_user_notifications_user_read;
+            DROP INDEX IF EXISTS idx_user_notifications_unread;
+            DROP INDEX IF EXISTS idx_search_logs_user_created;
+            DROP INDEX IF EXISTS idx_courses_category_name;
+            
+            ALTER TABLE user_progress DROP CONSTRAINT IF EXISTS uq_user_progress_user_file;
+            ALTER TABLE user_notifications DROP CONSTRAINT IF EXISTS uq_user_notifications_user_announcement;
+        """))
+        conn.commit()
+        print("✓ Hot query indexes dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_hot_query_indexes")
+    upgrade()
+    print("Migration completed!")
@@ -0,0 +1,44 @@
+"""
+Add indexes backing keyset (cursor) pagination on list endpoints
+
+- enrollments: (user_id, id), (course_id, id)
+- user_progress: (user_id, id)
+- scan_history: (started_at, id)
+- scan_errors: (scan_id, created_at, id)
+- backup_history: (created_at, id)
+
+Run: python -m app.migrations.add_keyset_indexes
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+KEYSET_INDEXES = [
+    ("idx_enrollments_user_id_id", "enrollments", "user_id, id"),
+    ("idx_enrollments_course_id_id", "enrollments", "course_id, id"),
+    ("idx_user_progress_user_id_id", "user_progress", "user_id, id"),
+    ("idx_scan_history_started_id", "scan_history", "started_at, id"),
+    ("idx_scan_errors_scan_created_id", "scan_errors", "scan_id, created_at, id"),
+    ("idx_backup_history_created_id", "backup_history", "created_at, id"),
+]
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with migration_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, table, columns in KEYSET_INDEXES:
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table}({columns});"))
+            print(f"✓ {name}")
+        
+        conn.execute(text("ANALYZE enrollments, user_progress, scan_history, scan_errors, backup_history;"))
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        for name, _, _ in KEYSET_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name};"))
+        conn.commit()
+        print("✓ Keyset indexes dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_keyset_indexes")
+    upgrade()
+    print("Migration completed!")
@@ -4,13 +4,11 @@ Add scan_logs and file_access_logs tables
 Run: python -m app.migrations.add_logging_tables
 """
 
-from sqlalchemy import create_engine, text
-from app.core.config import settings
+from sqlalchemy import text
+from app.db.database import migration_engine
 
 def upgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         # Create scan_logs table
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS scan_logs (
@@ -67,9 +65,7 @@ def upgrade():
         print("✓ scan_logs and file_access_logs tables created successfully")
 
 def downgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         conn.execute(text("DROP TABLE IF EXISTS file_access_logs CASCADE;"))
         conn.execute(text("DROP TABLE IF EXISTS scan_logs CASCADE;"))
         conn.commit()
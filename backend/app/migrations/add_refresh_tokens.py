@@ -4,13 +4,11 @@ Add refresh_tokens table for JWT refresh token management
 Run: python -m app.migrations.add_refresh_tokens
 """
 
-from sqlalchemy import create_engine, text
-from app.core.config import settings
+from sqlalchemy import text
+from app.db.database import migration_engine
 
 def upgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS refresh_tokens (
                 id SERIAL PRIMARY KEY,
@@ -29,9 +27,7 @@ def upgrade():
         print("✓ refresh_tokens table created successfully")
 
 def downgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         conn.execute(text("DROP TABLE IF EXISTS refresh_tokens CASCADE;"))
         conn.commit()
         print("✓ refresh_tokens table dropped")
@@ -0,0 +1,85 @@
+"""
+Add denormalized rollup tables for course/folder aggregates and user completion
+
+- file_rollups: file count and total size per (course, folder, file_type);
+  folder_id = 0 holds course totals
+- user_course_completions: completed file count per (user, course)
+- Both are backfilled from existing rows (requires file_nodes.tree_path,
+  see add_file_tree_paths)
+
+Run: python -m app.migrations.add_rollups
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS file_rollups (
+                id SERIAL PRIMARY KEY,
+                course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+                folder_id INTEGER NOT NULL DEFAULT 0,
+                file_type VARCHAR NOT NULL,
+                file_count INTEGER NOT NULL DEFAULT 0,
+                total_size BIGINT NOT NULL DEFAULT 0,
+                CONSTRAINT uq_file_rollups_course_folder_type UNIQUE (course_id, folder_id, file_type)
+            );
+            CREATE INDEX IF NOT EXISTS ix_file_rollups_id ON file_rollups(id);
+            
+            CREATE TABLE IF NOT EXISTS user_course_completions (
+                id SERIAL PRIMARY KEY,
+                user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+                completed_count INTEGER NOT NULL DEFAULT 0,
+                CONSTRAINT uq_user_course_completions_user_course UNIQUE (user_id, course_id)
+            );
+            CREATE INDEX IF NOT EXISTS ix_user_course_completions_id ON user_course_completions(id);
+        """))
+        
+        # Backfill: course level, then every folder containing each file
+        conn.execute(text("""
+            DELETE FROM file_rollups;
+            
+            INSERT INTO file_rollups (course_id, folder_id, file_type, file_count, total_size)
+            SELECT course_id, 0, file_type, COUNT(*), COALESCE(SUM(size), 0)
+            FROM file_nodes
+            WHERE is_directory = FALSE
+            GROUP BY course_id, file_type;
+            
+            INSERT INTO file_rollups (course_id, folder_id, file_type, file_count, total_size)
+            SELECT f.course_id, d.id, f.file_type, COUNT(*), COALESCE(SUM(f.size), 0)
+            FROM file_nodes f
+            JOIN file_nodes d
+              ON d.course_id = f.course_id
+             AND d.is_directory = TRUE
+             AND f.tree_path LIKE d.tree_path || '%'
+            WHERE f.is_directory = FALSE
+            GROUP BY f.course_id, d.id, f.file_type;
+            
+            DELETE FROM user_course_completions;
+            
+            INSERT INTO user_course_completions (user_id, course_id, completed_count)
+            SELECT p.user_id, f.course_id, COUNT(*)
+            FROM user_progress p
+            JOIN file_nodes f ON f.id = p.file_id
+            WHERE p.status = 'COMPLETED'
+            GROUP BY p.user_id, f.course_id;
+        """))
+        
+        conn.commit()
+        print("✓ Rollup tables created and backfilled")
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            DROP TABLE IF EXISTS user_course_completions CASCADE;
+            DROP TABLE IF EXISTS file_rollups CASCADE;
+        """))
+        conn.commit()
+        print("✓ Rollup tables dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_rollups")
+    upgrade()
+    print("Migration completed!")
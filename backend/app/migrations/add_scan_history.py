@@ -4,13 +4,11 @@ Add scan_history, scan_errors, and scan_lock tables
 Run: python -m app.migrations.add_scan_history
 """
 
-from sqlalchemy import create_engine, text
-from app.core.config import settings
+from sqlalchemy import text
+from app.db.database import migration_engine
 
 def upgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         # Create scan_history table
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS scan_history (
@@ -70,9 +68,7 @@ def upgrade():
         print("✓ scan_history, scan_errors, and scan_lock tables created successfully")
 
 def downgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         conn.execute(text("DROP TABLE IF EXISTS scan_errors CASCADE;"))
         conn.execute(text("DROP TABLE IF EXISTS scan_lock CASCADE;"))
         conn.execute(text("DROP TABLE IF EXISTS scan_history CASCADE;"))
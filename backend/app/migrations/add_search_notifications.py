@@ -4,13 +4,11 @@ Add search and notifications tables
 Run: python -m app.migrations.add_search_notifications
 """
 
-from sqlalchemy import create_engine, text
-from app.core.config import settings
+from sqlalchemy import text
+from app.db.database import migration_engine
 
 def upgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         # Create announcements table
         conn.execute(text("""
             CREATE TABLE IF NOT EXISTS announcements (
@@ -69,9 +67,7 @@ def upgrade():
         print("✓ Search and notification tables created successfully")
 
 def downgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         conn.execute(text("DROP TABLE IF EXISTS search_logs CASCADE;"))
         conn.execute(text("DROP TABLE IF EXISTS user_notifications CASCADE;"))
         conn.execute(text("DROP TABLE IF EXISTS announcements CASCADE;"))
@@ -0,0 +1,45 @@
+"""
+Add search_query_daily (searches per query and day) for popular searches
+
+- Upserted by the batched search log writer
+- Backfilled from existing search_logs so compacting old raw logs keeps their counts
+
+Run: python -m app.migrations.add_search_query_daily
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS search_query_daily (
+                id SERIAL PRIMARY KEY,
+                day DATE NOT NULL,
+                query VARCHAR(255) NOT NULL,
+                search_count INTEGER DEFAULT 0 NOT NULL,
+                CONSTRAINT uq_search_query_daily_day_query UNIQUE (day, query)
+            );
+            
+            INSERT INTO search_query_daily (day, query, search_count)
+            SELECT created_at::date, query, COUNT(*)
+            FROM search_logs
+            GROUP BY created_at::date, query
+            ON CONFLICT (day, query) DO NOTHING;
+            
+            ANALYZE search_query_daily;
+        """))
+        
+        conn.commit()
+        print("✓ search_query_daily created and backfilled")
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS search_query_daily;"))
+        conn.commit()
+        print("✓ search_query_daily dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_search_query_daily")
+    upgrade()
+    print("Migration completed!")
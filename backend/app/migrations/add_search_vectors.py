@@ -0,0 +1,168 @@
+"""
+Add full-text search vectors and trigram indexes for SEARCH_BACKEND=postgres
+
+- courses.search_vector: course name (weight A)
+- file_nodes.search_vector: file name (weight A) + folders below the course root (weight B),
+  NULL for directories
+- Kept current by BEFORE INSERT/UPDATE triggers; plain columns rather than
+  GENERATED ones so adding them does not rewrite the table under an exclusive lock
+- Existing rows backfilled in id-range batches, one short transaction each
+- GIN indexes on the vectors and pg_trgm GIN indexes on names, built CONCURRENTLY
+
+Run: python -m app.migrations.add_search_vectors
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+BATCH_SIZE = 5000
+
+FUNCTIONS = r"""
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+    -- Split camelCase, letter/digit runs and punctuation into words
+    CREATE OR REPLACE FUNCTION search_tokens(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT regexp_replace(
+            regexp_replace(
+                regexp_replace(
+                    regexp_replace(coalesce(value, ''), '([[:lower:]])([[:upper:]])', '\1 \2', 'g'),
+                    '([[:alpha:]])([[:digit:]])', '\1 \2', 'g'),
+                '([[:digit:]])([[:alpha:]])', '\1 \2', 'g'),
+            '[^[:alnum:]]+', ' ', 'g')
+    $$;
+
+    CREATE OR REPLACE FUNCTION course_search_vector(name text) RETURNS tsvector
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT setweight(to_tsvector('simple', search_tokens(name)), 'A')
+    $$;
+
+    -- Folders between the course root and the file (the file name itself is weight A)
+    CREATE OR REPLACE FUNCTION file_search_vector(name text, path text, course_path text) RETURNS tsvector
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT setweight(to_tsvector('simple', search_tokens(name)), 'A') ||
+               setweight(to_tsvector('simple', search_tokens(regexp_replace(
+                   CASE WHEN course_path IS NOT NULL AND left(path, length(course_path)) = course_path
+                        THEN substr(path, length(course_path) + 1)
+                        ELSE path END,
+                   '[^/\\]*$', ''))), 'B')
+    $$;
+
+    CREATE OR REPLACE FUNCTION courses_search_vector_trigger() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := course_search_vector(NEW.name);
+        RETURN NEW;
+    END
+    $$;
+
+    CREATE OR REPLACE FUNCTION file_nodes_search_vector_trigger() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF NEW.is_directory THEN
+            NEW.search_vector := NULL;
+        ELSE
+            NEW.search_vector := file_search_vector(
+                NEW.name, NEW.path, (SELECT path FROM courses WHERE id = NEW.course_id)
+            );
+        END IF;
+        RETURN NEW;
+    END
+    $$;
+"""
+
+COLUMNS_AND_TRIGGERS = """
+    ALTER TABLE courses ADD COLUMN IF NOT EXISTS search_vector tsvector;
+    ALTER TABLE file_nodes ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+    DROP TRIGGER IF EXISTS courses_search_vector ON courses;
+    CREATE TRIGGER courses_search_vector
+        BEFORE INSERT OR UPDATE OF name ON courses
+        FOR EACH ROW EXECUTE FUNCTION courses_search_vector_trigger();
+
+    DROP TRIGGER IF EXISTS file_nodes_search_vector ON file_nodes;
+    CREATE TRIGGER file_nodes_search_vector
+        BEFORE INSERT OR UPDATE OF name, path, course_id, is_directory ON file_nodes
+        FOR EACH ROW EXECUTE FUNCTION file_nodes_search_vector_trigger();
+"""
+
+BACKFILLS = [
+    ("courses", """
+        UPDATE courses
+        SET search_vector = course_search_vector(name)
+        WHERE id >= :start AND id < :end AND search_vector IS NULL
+    """),
+    ("file_nodes", """
+        UPDATE file_nodes f
+        SET search_vector = file_search_vector(f.name, f.path, c.path)
+        FROM courses c
+        WHERE c.id = f.course_id
+          AND f.id >= :start AND f.id < :end
+          AND f.is_directory = false
+          AND f.search_vector IS NULL
+    """),
+]
+
+SEARCH_INDEXES = [
+    ("idx_courses_search_vector", "courses USING gin (search_vector)"),
+    ("idx_courses_name_trgm", "courses USING gin (name gin_trgm_ops)"),
+    ("idx_file_nodes_search_vector", "file_nodes USING gin (search_vector)"),
+    ("idx_file_nodes_name_trgm", "file_nodes USING gin (name gin_trgm_ops)"),
+]
+
+def backfill(conn, table: str, statement: str):
+    """Fill search_vector in id ranges, committing each batch to keep row locks short"""
+    low, high = conn.execute(text(f"SELECT min(id), max(id) FROM {table}")).one()
+    if low is None:
+        return
+
+    updated = 0
+    for start in range(low, high + 1, BATCH_SIZE):
+        updated += conn.execute(text(statement), {"start": start, "end": start + BATCH_SIZE}).rowcount
+        conn.commit()
+    print(f"✓ {table}: {updated} rows backfilled")
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        # Fail fast instead of queueing behind long transactions for the ALTER TABLE lock
+        conn.execute(text("SET LOCAL lock_timeout = '5s';"))
+        # Raw driver SQL: text() would read the [[:alpha:]] classes as bind parameters
+        conn.exec_driver_sql(FUNCTIONS)
+        conn.execute(text(COLUMNS_AND_TRIGGERS))
+        conn.commit()
+        print("✓ search_vector columns and triggers added")
+
+        # Rows inserted from here on are filled by the triggers
+        for table, statement in BACKFILLS:
+            backfill(conn, table, statement)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with migration_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, definition in SEARCH_INDEXES:
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition};"))
+            print(f"✓ {name}")
+
+        conn.execute(text("ANALYZE courses, file_nodes;"))
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        for name, _ in SEARCH_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name};"))
+        conn.execute(text("""
+            DROP TRIGGER IF EXISTS courses_search_vector ON courses;
+            DROP TRIGGER IF EXISTS file_nodes_search_vector ON file_nodes;
+            DROP FUNCTION IF EXISTS courses_search_vector_trigger();
+            DROP FUNCTION IF EXISTS file_nodes_search_vector_trigger();
+            DROP FUNCTION IF EXISTS course_search_vector(text);
+            DROP FUNCTION IF EXISTS file_search_vector(text, text, text);
+            DROP FUNCTION IF EXISTS search_tokens(text);
+            ALTER TABLE courses DROP COLUMN IF EXISTS search_vector;
+            ALTER TABLE file_nodes DROP COLUMN IF EXISTS search_vector;
+        """))
+        conn.commit()
+        print("✓ Search vectors dropped")
+
+if __name__ == "__main__":
+    print("Running migration: add_search_vectors")
+    upgrade()
+    print("Migration completed!")
@@ -5,13 +5,11 @@ Run this to fix the column name issue:
 python -m app.migrations.fix_backup_metadata
 """
 
-from sqlalchemy import create_engine, text
-from app.core.config import settings
+from sqlalchemy import text
+from app.db.database import migration_engine
 
 def upgrade():
-    engine = create_engine(settings.DATABASE_URL)
-    
-    with engine.connect() as conn:
+    with migration_engine.connect() as conn:
         # Check if the old 'metadata' column exists
         result = conn.execute(text("""
             SELECT column_name 
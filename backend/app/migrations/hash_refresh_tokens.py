@@ -0,0 +1,73 @@
+"""
+Store refresh tokens as SHA-256 digests and index revocation/expiry
+
+- Adds token_hash (backfilled from the raw token) and drops the raw token column
+- Adds composite (user_id, revoked) index for revoke-all
+- Adds expires_at index for the periodic sweeper
+- Purges already expired/revoked rows
+
+Run: python -m app.migrations.hash_refresh_tokens
+"""
+
+from sqlalchemy import text
+from app.db.database import migration_engine
+
+def upgrade():
+    with migration_engine.connect() as conn:
+        # Remove dead rows first so the backfill touches less data
+        conn.execute(text("""
+            DELETE FROM refresh_tokens
+            WHERE revoked = TRUE OR expires_at < NOW();
+        """))
+        
+        conn.execute(text("""
+            ALTER TABLE refresh_tokens ADD COLUMN IF NOT EXISTS token_hash VARCHAR(64);
+        """))
+        
+        # Backfill digests (sha256() is built in since PostgreSQL 11)
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'refresh_tokens' AND column_name = 'token'
+                ) THEN
+                    UPDATE refresh_tokens
+                    SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')
+                    WHERE token_hash IS NULL;
+                END IF;
+            END $$;
+        """))
+        
+        conn.execute(text("""
+            ALTER TABLE refresh_tokens ALTER COLUMN token_hash SET NOT NULL;
+            ALTER TABLE refresh_tokens DROP COLUMN IF EXISTS token;
+            
+            CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_tokens_token_hash ON refresh_tokens(token_hash);
+            CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_revoked ON refresh_tokens(user_id, revoked);
+            CREATE INDEX IF NOT EXISTS ix_refresh_tokens_expires_at ON refresh_tokens(expires_at);
+            DROP INDEX IF EXISTS idx_refresh_tokens_token;
+        """))
+        
+        conn.commit()
+        print("✓ refresh_tokens migrated to hashed storage")
+
+def downgrade():
+    with migration_engine.connect() as conn:
+        # Raw tokens cannot be recovered from digests - existing sessions are dropped
+        conn.execute(text("""
+            DELETE FROM refresh_tokens;
+            DROP INDEX IF EXISTS ix_refresh_tokens_token_hash;
+            DROP INDEX IF EXISTS idx_refresh_tokens_user_revoked;
+            DROP INDEX IF EXISTS ix_refresh_tokens_expires_at;
+            ALTER TABLE refresh_tokens DROP COLUMN IF EXISTS token_hash;
+            ALTER TABLE refresh_tokens ADD COLUMN IF NOT EXISTS token VARCHAR(500) UNIQUE NOT NULL;
+            CREATE INDEX IF NOT EXISTS idx_refresh_tokens_token ON refresh_tokens(token);
+        """))
+        conn.commit()
+        print("✓ refresh_tokens reverted to raw token storage")
+
+if __name__ == "__main__":
+    print("Running migration: hash_refresh_tokens")
+    upgrade()
+    print("Migration completed!")
@@ -5,6 +5,7 @@ from app.models.file_node import FileNode
 from app.models.progress import UserProgress, ProgressStatus
 from app.models.last_viewed import LastViewed
 from app.models.settings import Settings
+from app.models.rollup import FileRollup, UserCourseCompletion
 
 __all__ = [
     "User",
@@ -14,5 +15,7 @@ __all__ = [
     "UserProgress",
     "ProgressStatus",
     "LastViewed",
-    "Settings"
+    "Settings",
+    "FileRollup",
+    "UserCourseCompletion"
 ]
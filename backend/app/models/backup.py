@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, BigInteger, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -19,6 +19,11 @@ class BackupHistory(Base):
     notes = Column(Text)
     
     created_by = relationship("User")
+    
+    __table_args__ = (
+        # Newest-first keyset pagination
+        Index('idx_backup_history_created_id', 'created_at', 'id'),
+    )
 
 class OperationLock(Base):
     __tablename__ = "operation_lock"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -11,7 +11,12 @@ class Course(Base):
     name = Column(String, index=True, nullable=False)
     path = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # search_vector (tsvector) is trigger-maintained and left unmapped; see app.migrations.add_search_vectors
     
     # Relationships
     category = relationship("Category", back_populates="courses")
     files = relationship("FileNode", back_populates="course", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index('idx_courses_category_name', 'category_id', 'name'),
+    )
@@ -0,0 +1,40 @@
+"""
+Text extracted from documents (PDF, EPUB, plain text) for content search
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, BigInteger, ForeignKey, Index
+from datetime import datetime
+from app.db.database import Base
+
+class DocumentText(Base):
+    """
+    Extraction state per file
+    size/mtime_ns are the on-disk values at extraction; the file is only
+    extracted again when either changes.
+    """
+    __tablename__ = "document_texts"
+
+    file_id = Column(Integer, ForeignKey("file_nodes.id", ondelete="CASCADE"), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    status = Column(String(20), nullable=False)  # indexed, empty, failed, unsupported
+    sections = Column(Integer, default=0, nullable=False)  # pages or chapters
+    chunk_count = Column(Integer, default=0, nullable=False)
+    error = Column(String(500), nullable=True)
+    extracted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class DocumentChunk(Base):
+    """Searchable passage of a document, within one page or chapter"""
+    __tablename__ = "document_chunks"
+
+    id = Column(Integer, primary_key=True)
+    file_id = Column(Integer, ForeignKey("file_nodes.id", ondelete="CASCADE"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)  # scope filter without a join
+    position = Column(Integer, nullable=False)  # order within the file
+    location = Column(String(255), nullable=True)  # "p. 12", chapter title
+    content = Column(Text, nullable=False)
+    # search_vector (tsvector) is trigger-maintained and left unmapped; see app.migrations.add_document_text
+
+    __table_args__ = (
+        Index('idx_document_chunks_file_position', 'file_id', 'position'),
+        Index('idx_document_chunks_course', 'course_id'),
+    )
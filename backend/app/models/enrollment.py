@@ -1,7 +1,7 @@
 """
 Course enrollment model
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -23,4 +23,7 @@ class Enrollment(Base):
     # Ensure unique enrollment per user+course
     __table_args__ = (
         UniqueConstraint('user_id', 'course_id', name='uq_enrollment_user_course'),
+        # Per-user and per-course keyset pagination
+        Index('idx_enrollments_user_id_id', 'user_id', 'id'),
+        Index('idx_enrollments_course_id_id', 'course_id', 'id'),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, BigInteger, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -14,9 +14,24 @@ class FileNode(Base):
     parent_id = Column(Integer, ForeignKey("file_nodes.id"), nullable=True)
     is_directory = Column(Boolean, default=False)
     size = Column(BigInteger, nullable=True)
+    child_count = Column(Integer, default=0, nullable=False)  # Maintained by FileTreeService.refresh_tree
+    tree_path = Column(String, nullable=True)  # Materialized path of ids, e.g. "/12/45/78/" (self included)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # search_vector (tsvector) is trigger-maintained and left unmapped; see app.migrations.add_search_vectors
     
     # Relationships
     course = relationship("Course", back_populates="files")
     parent = relationship("FileNode", remote_side=[id], backref="children")
     progress = relationship("UserProgress", back_populates="file")
+    
+    __table_args__ = (
+        # Children listing: filter (course_id, parent_id), folders first, then name
+        Index('idx_file_nodes_children', 'course_id', 'parent_id', is_directory.desc(), 'name'),
+        Index('idx_file_nodes_parent_id', 'parent_id'),
+        # File search only looks at files, ordered by name
+        Index('idx_file_nodes_course_files', 'course_id', 'name', postgresql_where=(is_directory == False)),
+        # Search type filter/facets on the stored type (app.core.file_types)
+        Index('idx_file_nodes_type', 'file_type', 'course_id', postgresql_where=(is_directory == False)),
+        # Prefix (LIKE '/12/45/%') lookups for subtree queries
+        Index('idx_file_nodes_tree_path', 'tree_path', postgresql_ops={'tree_path': 'varchar_pattern_ops'}),
+    )
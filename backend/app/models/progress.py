@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -23,3 +23,11 @@ class UserProgress(Base):
     # Relationships
     user = relationship("User", back_populates="progress")
     file = relationship("FileNode", back_populates="progress")
+    
+    # One progress row per user and file (enables ON CONFLICT upserts)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'file_id', name='uq_user_progress_user_file'),
+        Index('idx_user_progress_file_id', 'file_id'),
+        # Per-user keyset pagination
+        Index('idx_user_progress_user_id_id', 'user_id', 'id'),
+    )
@@ -0,0 +1,41 @@
+"""
+Denormalized aggregate rollups for courses, folders and user completion
+"""
+from sqlalchemy import Column, Integer, String, BigInteger, ForeignKey, UniqueConstraint
+from app.db.database import Base
+
+# folder_id used for course-level rollup rows
+COURSE_LEVEL = 0
+
+class FileRollup(Base):
+    """
+    File count and total size per (course, folder, file_type)
+    
+    folder_id = COURSE_LEVEL (0) holds the whole-course totals; other rows are
+    recursive totals under that folder. Maintained by RollupService.
+    """
+    __tablename__ = "file_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    folder_id = Column(Integer, nullable=False, default=COURSE_LEVEL)  # No FK: 0 = course level
+    file_type = Column(String, nullable=False)
+    file_count = Column(Integer, default=0, nullable=False)
+    total_size = Column(BigInteger, default=0, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('course_id', 'folder_id', 'file_type', name='uq_file_rollups_course_folder_type'),
+    )
+
+class UserCourseCompletion(Base):
+    """Completed file count per user and course (percent = completed / course file_count)"""
+    __tablename__ = "user_course_completions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    completed_count = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('user_id', 'course_id', name='uq_user_course_completions_user_course'),
+    )
@@ -1,7 +1,7 @@
 """
 Scan history and error tracking models
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum
@@ -41,6 +41,11 @@ class ScanHistory(Base):
     # Relationships
     started_by = relationship("User", backref="scans")
     errors = relationship("ScanError", back_populates="scan", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Newest-first keyset pagination
+        Index('idx_scan_history_started_id', 'started_at', 'id'),
+    )
 
 class ScanError(Base):
     """Track file-level scan errors"""
@@ -55,6 +60,11 @@ class ScanError(Base):
     
     # Relationship
     scan = relationship("ScanHistory", back_populates="errors")
+    
+    __table_args__ = (
+        # Per-scan, newest-first keyset pagination
+        Index('idx_scan_errors_scan_created_id', 'scan_id', 'created_at', 'id'),
+    )
 
 class ScanLock(Base):
     """Prevent concurrent scans"""
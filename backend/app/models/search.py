@@ -1,7 +1,7 @@
 """
 Search and notification models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -61,6 +61,13 @@ class UserNotification(Base):
     # Relationships
     user = relationship("User", backref="notifications")
     announcement = relationship("Announcement", backref="user_notifications")
+    
+    __table_args__ = (
+        # One notification per user and announcement (enables ON CONFLICT upserts)
+        UniqueConstraint('user_id', 'announcement_id', name='uq_user_notifications_user_announcement'),
+        Index('idx_user_notifications_user_read', 'user_id', 'is_read'),
+        Index('idx_user_notifications_unread', 'user_id', postgresql_where=(is_read == False)),
+    )
 
 class SearchLog(Base):
     """Search query logging for analytics"""
@@ -75,3 +82,23 @@ class SearchLog(Base):
     
     # Relationships
     user = relationship("User", backref="search_logs")
+    
+    __table_args__ = (
+        Index('idx_search_logs_user_created', 'user_id', 'created_at'),
+    )
+
+class SearchQueryDaily(Base):
+    """
+    Searches per query and day, upserted by the search log writer
+    Popular searches read these rows instead of grouping search_logs.
+    """
+    __tablename__ = "search_query_daily"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False)
+    query = Column(String(255), nullable=False)
+    search_count = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('day', 'query', name='uq_search_query_daily_day_query'),
+    )
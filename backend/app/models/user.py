@@ -12,6 +12,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped on enroll/unenroll; per-worker enrollment index entries reload when it changes
+    enrollment_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     progress = relationship("UserProgress", back_populates="user")
@@ -1,18 +1,20 @@
 from app.schemas.user import User, UserCreate, UserLogin, Token, TokenData, TokenRefresh
 from app.schemas.category import Category, CategoryCreate
 from app.schemas.course import Course, CourseCreate
-from app.schemas.file_node import FileNode, FileNodeCreate, FileNodeTree
+from app.schemas.file_node import FileNode, FileNodeCreate, FileNodeTree, FileNodeChild, FileNodeChildrenPage
 from app.schemas.progress import UserProgress, UserProgressCreate, LastViewed, LastViewedCreate, ProgressStatus
+from app.schemas.rollup import RollupStats, CourseCompletion
 from app.schemas.scanner import ScanRequest, ScanResult, RootPathRequest, RootPathResponse
 
 __all__ = [
     "User", "UserCreate", "UserLogin", "Token", "TokenData", "TokenRefresh",
     "Category", "CategoryCreate",
     "Course", "CourseCreate",
-    "FileNode", "FileNodeCreate", "FileNodeTree",
+    "FileNode", "FileNodeCreate", "FileNodeTree", "FileNodeChild", "FileNodeChildrenPage",
     "UserProgress", "UserProgressCreate",
     "LastViewed", "LastViewedCreate",
     "ProgressStatus",
+    "RollupStats", "CourseCompletion",
     "ScanRequest", "ScanResult",
     "RootPathRequest", "RootPathResponse"
 ]
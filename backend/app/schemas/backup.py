@@ -21,6 +21,7 @@ class BackupResponse(BaseModel):
 class BackupListResponse(BaseModel):
     backups: List[BackupResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 class BackupStatusResponse(BaseModel):
     is_locked: bool
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
+from app.schemas.rollup import RollupStats
 
 class CourseBase(BaseModel):
     name: str
@@ -13,6 +14,7 @@ class CourseCreate(CourseBase):
 class Course(CourseBase):
     id: int
     created_at: datetime
+    stats: Optional[RollupStats] = None
 
     class Config:
         from_attributes = True
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional, List
+from app.schemas.rollup import RollupStats
 
 class FileNodeBase(BaseModel):
     name: str
@@ -23,5 +24,14 @@ class FileNode(FileNodeBase):
     class Config:
         from_attributes = True
 
+class FileNodeChild(FileNode):
+    child_count: int = 0
+    has_children: bool = False
+    stats: Optional[RollupStats] = None  # Folders only
+
+class FileNodeChildrenPage(BaseModel):
+    items: List[FileNodeChild]
+    next_cursor: Optional[str] = None
+
 class FileNodeTree(FileNode):
     children: Optional[List['FileNodeTree']] = []
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Dict
+
+class RollupStats(BaseModel):
+    total_size: int = 0
+    file_count: int = 0
+    file_types: Dict[str, int] = {}
+
+class CourseCompletion(BaseModel):
+    course_id: int
+    completed: int
+    total: int
+    percent: float
@@ -0,0 +1,104 @@
+"""
+Async authorization service for AsyncSession read paths
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.models.enrollment import Enrollment
+from app.models.course import Course
+from app.models.category import Category
+from app.models.file_node import FileNode
+from app.core.enrollment_index import enrollment_index
+from app.services.authorization_service import apply_course_scope
+from typing import List, Optional
+
+class AsyncAuthorizationService:
+    """
+    Async counterpart of AuthorizationService read methods
+    
+    Same rules; enroll/unenroll stay on the sync service.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def can_access_course(self, user: User, course_id: int) -> bool:
+        """True if user is admin or enrolled in course"""
+        if user.is_admin:
+            return True
+        
+        return await enrollment_index.contains_async(self.db, user.id, user.enrollment_version, course_id)
+    
+    async def can_access_file(self, user: User, file_id: int) -> bool:
+        """True if user is admin or enrolled in file's course"""
+        if user.is_admin:
+            return True
+        
+        result = await self.db.execute(
+            select(FileNode.course_id).where(FileNode.id == file_id)
+        )
+        course_id = result.scalar()
+        if course_id is None:
+            return False
+        
+        return await self.can_access_course(user, course_id)
+    
+    async def can_access_category(self, user: User, category_id: int) -> bool:
+        """True if user is admin or enrolled in at least one course in category"""
+        if user.is_admin:
+            return True
+        
+        result = await self.db.execute(
+            select(Enrollment.id).join(
+                Course, Enrollment.course_id == Course.id
+            ).where(
+                Course.category_id == category_id,
+                Enrollment.user_id == user.id
+            ).limit(1)
+        )
+        
+        return result.first() is not None
+    
+    async def get_enrolled_course_ids(self, user: User) -> List[int]:
+        """Course IDs user is enrolled in (all courses for admin)"""
+        if user.is_admin:
+            result = await self.db.execute(select(Course.id))
+            return list(result.scalars().all())
+        
+        return await enrollment_index.get_course_ids_async(self.db, user.id, user.enrollment_version)
+    
+    async def get_accessible_categories(self, user: User) -> List[Category]:
+        """Categories with at least one enrolled course (all for admin)"""
+        stmt = select(Category)
+        
+        if not user.is_admin:
+            stmt = stmt.join(
+                Course, Category.id == Course.category_id
+            ).join(
+                Enrollment, Course.id == Enrollment.course_id
+            ).where(
+                Enrollment.user_id == user.id
+            ).distinct()
+        
+        result = await self.db.execute(stmt.order_by(Category.name))
+        return list(result.scalars().all())
+    
+    async def get_accessible_courses(self, user: User, category_id: Optional[int] = None) -> List[Course]:
+        """Courses user can access, optionally filtered by category"""
+        stmt = select(Course).order_by(Course.name)
+        
+        if not user.is_admin:
+            course_ids = await enrollment_index.get_course_ids_async(self.db, user.id, user.enrollment_version)
+            if not course_ids:
+                return []
+            stmt = stmt.where(Course.id.in_(course_ids))
+        
+        if category_id:
+            stmt = stmt.where(Course.category_id == category_id)
+        
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+    
+    def apply_course_scope(self, stmt, user: User, course_column):
+        """Restrict a select() to courses the user can access (enrollment join)"""
+        return apply_course_scope(stmt, user, course_column)
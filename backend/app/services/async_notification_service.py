@@ -0,0 +1,44 @@
+"""
+Async notification reads for AsyncSession read paths
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.services.notification_service import NotificationService
+from app.services.async_authorization_service import AsyncAuthorizationService
+from typing import List, Dict, Any, Optional, Tuple
+
+class AsyncNotificationService(NotificationService):
+    """
+    Async counterpart of NotificationService list/count reads
+    
+    Writes (announcements, read flags) stay on the sync service.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.auth_service = AsyncAuthorizationService(db)
+    
+    async def _visible_filter(self, user: User):
+        if user.is_admin:
+            return self._visible_announcements_filter(user)
+        
+        course_ids = await self.auth_service.get_enrolled_course_ids(user)
+        return self._visible_announcements_filter(user, course_ids)
+    
+    async def get_user_notifications(
+        self,
+        user: User,
+        unread_only: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of notifications for a user"""
+        stmt = self._notifications_statement(
+            user, unread_only, limit, await self._visible_filter(user), cursor
+        )
+        return self._notifications_page((await self.db.execute(stmt)).all(), limit)
+    
+    async def get_unread_count(self, user: User) -> int:
+        """Get count of unread notifications"""
+        stmt = self._unread_count_statement(user, await self._visible_filter(user))
+        return (await self.db.execute(stmt)).scalar() or 0
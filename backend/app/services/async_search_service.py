@@ -0,0 +1,300 @@
+"""
+Async search service for AsyncSession read paths
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.models.course import Course
+from app.models.file_node import FileNode
+from app.core.search_index import search_index
+from app.core.search_cache import ADMIN_SCOPE, id_array, normalize_query, scope_digest, search_cache
+from app.db.async_database import async_session
+from app.core.file_types import resolve_file_type
+from app.services.search_service import (
+    SearchService, SearchScope, SearchFilters, NO_FILTERS, CONTENT_CANDIDATES, PARALLEL_SESSIONS
+)
+from app.services.async_authorization_service import AsyncAuthorizationService
+from array import array
+from collections import Counter
+from typing import List, Dict, Any, Optional
+import asyncio
+import threading
+
+# Extra AsyncSessions held by concurrent sub-queries (the async engine has its own pool)
+async_search_slots = threading.BoundedSemaphore(PARALLEL_SESSIONS)
+
+class AsyncSearchService(SearchService):
+    """
+    Async counterpart of SearchService
+    
+    Reuses SearchService statement builders and result formatting;
+    only statement execution is awaited.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.auth_service = AsyncAuthorizationService(db)
+    
+    async def search_all(
+        self,
+        query: str,
+        user: User,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Search across courses and files
+        SQL-backend sub-queries run concurrently (see _gather).
+        """
+        query = normalize_query(query)
+        scope = await self._resolve_scope(user)
+        key = search_cache.key('all', query, scope.cache_scope, scope.use_index, limit)
+        cached = search_cache.get(key)
+        if cached is not None:
+            course_ids, file_ids, type_counts = cached
+            courses, files = await self._courses_by_ids(course_ids), await self._files_by_ids(file_ids)
+        else:
+            version = search_cache.catalog_version
+            courses, files, type_counts = await self._run_search_all(query, user, limit, scope)
+            search_cache.put(key, (id_array(courses), id_array(files), type_counts), version)
+        
+        await self._log_search(user.id, query, len(courses) + len(files), 'all')
+        
+        return self._all_response(query, courses, files, type_counts, limit)
+    
+    async def _run_search_all(self, query: str, user: User, limit: int, scope: SearchScope):
+        if scope.use_index:
+            facets = self._empty_facets()
+            courses = await self._search_courses(query, user, limit, scope)
+            files = await self._search_files(query, user, limit, scope, facets=facets)
+            return courses, files, facets['file_type']
+        
+        return await self._gather(
+            lambda service: service._search_courses(query, user, limit, scope),
+            lambda service: service._search_files(query, user, limit, scope),
+            lambda service: service._facet_counts(query, user, NO_FILTERS, 'file_type')
+        )
+    
+    async def _gather(self, *tasks) -> list:
+        """
+        Results of tasks, in order
+        As many as async_search_slots allows run concurrently on their own sessions;
+        the rest run one after another on this session.
+        """
+        pooled = 0
+        while pooled < len(tasks) - 1 and async_search_slots.acquire(blocking=False):
+            pooled += 1
+        
+        jobs = []
+        for task in tasks[1:pooled + 1]:
+            job = asyncio.ensure_future(self._run(task))
+            # Released even if the job is cancelled before it starts
+            job.add_done_callback(lambda _: async_search_slots.release())
+            jobs.append(job)
+        
+        async def inline():
+            return [await task(self) for task in (tasks[0],) + tasks[pooled + 1:]]
+        
+        first, *rest = await asyncio.gather(inline(), *jobs)
+        return [first[0], *rest, *first[1:]]
+    
+    async def _run(self, task):
+        """Run task with its own AsyncSession (sessions do not support concurrent statements)"""
+        async with async_session() as db:
+            return await task(AsyncSearchService(db))
+    
+    async def search_courses(
+        self,
+        query: str,
+        user: User,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Search courses by name"""
+        query = normalize_query(query)
+        scope = await self._resolve_scope(user)
+        key = search_cache.key('courses', query, scope.cache_scope, scope.use_index, limit)
+        ids = search_cache.get(key)
+        if ids is not None:
+            return await self._courses_by_ids(ids)
+        
+        version = search_cache.catalog_version
+        results = await self._search_courses(query, user, limit, scope)
+        search_cache.put(key, id_array(results), version)
+        return results
+    
+    async def _search_courses(self, query: str, user: User, limit: int, scope: SearchScope) -> List[Dict[str, Any]]:
+        if scope.use_index:
+            return await self._courses_by_ids(search_index.search_courses(query, scope.course_ids, limit))
+        
+        result = await self.db.execute(self._courses_statement(query, user, limit))
+        return [self._course_result(course) for course in result.scalars().all()]
+    
+    async def search_files(
+        self,
+        query: str,
+        user: User,
+        limit: int = 30,
+        file_type: str = None
+    ) -> List[Dict[str, Any]]:
+        """Search files by name and path"""
+        filters = self._type_filter(file_type)
+        query = normalize_query(query)
+        scope = await self._resolve_scope(user)
+        key = search_cache.key('files', query, scope.cache_scope, scope.use_index, limit, filters)
+        ids = search_cache.get(key)
+        if ids is not None:
+            return await self._files_by_ids(ids)
+        
+        version = search_cache.catalog_version
+        results = await self._search_files(query, user, limit, scope, filters)
+        search_cache.put(key, id_array(results), version)
+        return results
+    
+    async def search_files_faceted(
+        self,
+        query: str,
+        user: User,
+        filters: SearchFilters = NO_FILTERS,
+        limit: int = 30
+    ) -> Dict[str, Any]:
+        """File search with facet filters and facet counts (see SearchService.search_files_faceted)"""
+        query = normalize_query(query)
+        scope = await self._resolve_scope(user)
+        scope = scope._replace(use_index=scope.use_index and filters.in_index)
+        key = search_cache.key('faceted', query, scope.cache_scope, scope.use_index, limit, filters)
+        cached = search_cache.get(key)
+        if cached is not None:
+            file_ids, facets = cached
+            files = await self._files_by_ids(file_ids)
+        else:
+            version = search_cache.catalog_version
+            files, facets = await self._run_faceted(query, user, limit, scope, filters)
+            search_cache.put(key, (id_array(files), facets), version)
+        
+        await self._log_search(user.id, query, len(files), 'files')
+        
+        categories = await self.db.execute(self._course_categories_statement(facets['course']))
+        return {
+            'results': files,
+            'facets': self._facets_response(facets, dict(categories.all())),
+            'total': len(files),
+            'query': query
+        }
+    
+    async def _run_faceted(self, query: str, user: User, limit: int, scope: SearchScope, filters: SearchFilters):
+        if scope.use_index:
+            facets = self._empty_facets()
+            return await self._search_files(query, user, limit, scope, filters, facets), facets
+        
+        files, type_counts, course_counts = await self._gather(
+            lambda service: service._search_files(query, user, limit, scope, filters),
+            lambda service: service._facet_counts(query, user, filters, 'file_type'),
+            lambda service: service._facet_counts(query, user, filters, 'course')
+        )
+        return files, {'file_type': type_counts, 'course': course_counts}
+    
+    async def _search_files(
+        self,
+        query: str,
+        user: User,
+        limit: int,
+        scope: SearchScope,
+        filters: SearchFilters = NO_FILTERS,
+        facets: Optional[Dict[str, Counter]] = None
+    ) -> List[Dict[str, Any]]:
+        if scope.use_index:
+            course_filter = None
+            if filters.category_ids:
+                result = await self.db.execute(self._category_courses_statement(filters))
+                course_filter = set(result.scalars())
+            return await self._files_by_ids(search_index.search_files(
+                query, scope.course_ids, limit, filters.file_types or None,
+                self._course_filter(filters, course_filter), facets
+            ))
+        
+        result = await self.db.execute(self._files_statement(query, user, limit, filters))
+        return [self._file_result(file) for file in result.scalars().all()]
+    
+    async def _facet_counts(self, query: str, user: User, filters: SearchFilters, facet: str) -> Counter:
+        result = await self.db.execute(self._facet_statement(query, user, filters, facet))
+        return Counter(dict(result.all()))
+    
+    async def search_content(
+        self,
+        query: str,
+        user: User,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Search inside extracted document text (best passage per file)"""
+        query = normalize_query(query)
+        scope = await self._resolve_scope(user)
+        key = search_cache.key('content', query, scope.cache_scope, scope.use_index, limit)
+        ids = search_cache.get(key)
+        if ids is not None:
+            result = await self.db.execute(self._chunks_by_ids_statement(ids))
+            rows = self._chunks_in_order(result.all(), ids)
+        else:
+            version = search_cache.catalog_version
+            rows = self._best_passages(await self._search_chunks(query, user, limit, scope), limit)
+            search_cache.put(key, array('q', (chunk.id for chunk, _ in rows)), version)
+        
+        results = [self._content_result(query, chunk, file) for chunk, file in rows]
+        await self._log_search(user.id, query, len(results), 'content')
+        return results
+    
+    async def _search_chunks(self, query: str, user: User, limit: int, scope: SearchScope) -> list:
+        if scope.use_index:
+            ids = search_index.search_content(query, scope.course_ids, limit * CONTENT_CANDIDATES)
+            result = await self.db.execute(self._chunks_by_ids_statement(ids))
+            return self._chunks_in_order(result.all(), ids)
+        
+        result = await self.db.execute(self._content_statement(query, user, limit))
+        return result.all()
+    
+    async def search_by_type(
+        self,
+        query: str,
+        user: User,
+        search_type: str,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Search by specific type"""
+        if search_type == 'courses':
+            results = await self.search_courses(query, user, limit)
+        elif search_type == 'files':
+            results = await self.search_files(query, user, limit)
+        elif resolve_file_type(search_type):
+            results = await self.search_files(query, user, limit, file_type=search_type)
+        else:
+            results = []
+        
+        await self._log_search(user.id, query, len(results), search_type)
+        
+        return results
+    
+    async def _resolve_scope(self, user: User) -> SearchScope:
+        use_index = self._use_index()
+        if user.is_admin:
+            return SearchScope(use_index, None, ADMIN_SCOPE)
+        course_ids = await self.auth_service.get_enrolled_course_ids(user)
+        return SearchScope(use_index, course_ids if use_index else None, scope_digest(course_ids))
+    
+    async def _courses_by_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        result = await self.db.execute(self._by_ids_statement(Course, ids))
+        return [self._course_result(course) for course in self._in_rank_order(result.scalars().all(), ids)]
+    
+    async def _files_by_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        result = await self.db.execute(self._by_ids_statement(FileNode, ids))
+        return [self._file_result(file) for file in self._in_rank_order(result.scalars().all(), ids)]
+    
+    async def get_popular_searches(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get most popular search queries"""
+        result = await self.db.execute(self._popular_statement(limit))
+        return [{'query': r.query, 'count': r.count} for r in result.all()]
+    
+    async def get_recent_searches(self, user_id: int, limit: int = 5) -> List[str]:
+        """Get user's recent search queries"""
+        result = await self.db.execute(self._recent_statement(user_id, limit))
+        return [r.query for r in result.scalars().all()]
+    
+    async def _log_search(self, user_id: int, query: str, results_count: int, search_type: str):
+        """Log search query for analytics (buffered, never waits on the database)"""
+        super()._log_search(user_id, query, results_count, search_type)
@@ -1,14 +1,17 @@
 from datetime import timedelta, datetime
 from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.models.refresh_token import RefreshToken
 from app.schemas import UserCreate, UserLogin, Token
 from app.core.security import (
-    verify_password, get_password_hash, 
-    create_access_token, create_refresh_token
+    password_needs_rehash,
+    create_access_token, create_refresh_token, hash_refresh_token
 )
+from app.core.password_pool import password_pool
 from app.core.config import settings
+from app.core.background_tasks import BackgroundTask
 import hashlib
 
 class AuthService:
@@ -42,7 +45,7 @@ class AuthService:
             )
 
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = password_pool.hash(user_data.password)
         db_user = User(
             username=user_data.username,
             email=user_data.email,
@@ -84,12 +87,9 @@ class AuthService:
             if user.hashed_password == sha256_hash:
                 password_valid = True
         
-        # 3. Try bcrypt verification
+        # 3. Try bcrypt verification (in the password hash pool)
         if not password_valid:
-            try:
-                password_valid = verify_password(login_data.password, user.hashed_password)
-            except:
-                pass
+            password_valid = password_pool.verify(login_data.password, user.hashed_password)
         
         if not password_valid:
             raise HTTPException(
@@ -98,14 +98,18 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        # Transparently upgrade legacy or outdated hashes
+        if settings.PASSWORD_REHASH_ON_LOGIN and password_needs_rehash(user.hashed_password):
+            user.hashed_password = password_pool.hash(login_data.password)
+
         # Create tokens
         access_token = create_access_token(data={"sub": user.username})
         refresh_token = create_refresh_token()
         
-        # Store refresh token in database
-        expires_at = datetime.utcnow() + timedelta(days=7)  # 7 days
+        # Store refresh token digest in database (raw token is never persisted)
+        expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
         db_refresh_token = RefreshToken(
-            token=refresh_token,
+            token_hash=hash_refresh_token(refresh_token),
             user_id=user.id,
             expires_at=expires_at
         )
@@ -129,9 +133,9 @@ class AuthService:
         """
         Refresh access token using refresh token.
         """
-        # Find refresh token in database
+        # Find refresh token in database (indexed digest lookup)
         db_token = self.db.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token,
+            RefreshToken.token_hash == hash_refresh_token(refresh_token),
             RefreshToken.revoked == False
         ).first()
         
@@ -168,30 +172,74 @@ class AuthService:
         """
         Logout user by revoking refresh token.
         """
-        db_token = self.db.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token
-        ).first()
+        count = self.db.query(RefreshToken).filter(
+            RefreshToken.token_hash == hash_refresh_token(refresh_token)
+        ).update({'revoked': True}, synchronize_session=False)
         
-        if db_token:
-            db_token.revoked = True
-            self.db.commit()
-            return True
-        
-        return False
+        self.db.commit()
+        return count > 0
     
     def logout_all_sessions(self, user_id: int) -> int:
         """
         Logout user from all devices by revoking all refresh tokens.
+        Single UPDATE served by the (user_id, revoked) index.
         """
-        tokens = self.db.query(RefreshToken).filter(
+        count = self.db.query(RefreshToken).filter(
             RefreshToken.user_id == user_id,
             RefreshToken.revoked == False
-        ).all()
-        
-        count = 0
-        for token in tokens:
-            token.revoked = True
-            count += 1
+        ).update({'revoked': True}, synchronize_session=False)
         
         self.db.commit()
         return count
+    
+    def purge_refresh_tokens(self, batch_size: int = 1000, _task: BackgroundTask = None) -> int:
+        """
+        Delete expired and revoked refresh tokens in batches.
+        Each batch is its own transaction to keep locks short.
+        
+        Returns: number of rows deleted
+        """
+        total = 0
+        
+        while True:
+            if _task and _task.should_abort:
+                break
+            
+            batch_ids = self.db.query(RefreshToken.id).filter(
+                or_(
+                    RefreshToken.expires_at < datetime.utcnow(),
+                    RefreshToken.revoked == True
+                )
+            ).limit(batch_size).subquery()
+            
+            deleted = self.db.query(RefreshToken).filter(
+                RefreshToken.id.in_(select(batch_ids.c.id))
+            ).delete(synchronize_session=False)
+            self.db.commit()
+            
+            total += deleted
+            if _task:
+                _task.update_heartbeat()
+            
+            if deleted < batch_size:
+                break
+        
+        return total
+
+
+def sweep_refresh_tokens(_task: BackgroundTask = None) -> dict:
+    """
+    Periodic background job: purge expired/revoked refresh tokens
+    Runs in a background thread with its own DB session
+    """
+    from app.db.database import SessionLocal
+    db = SessionLocal()
+    
+    try:
+        deleted = AuthService(db).purge_refresh_tokens(
+            batch_size=settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+            _task=_task
+        )
+        return {"deleted": deleted}
+    finally:
+        db.close()
@@ -2,13 +2,29 @@
 Authorization service for course access control
 """
 from sqlalchemy.orm import Session
+from sqlalchemy import and_
 from app.models.user import User
 from app.models.enrollment import Enrollment
 from app.models.course import Course
 from app.models.category import Category
 from app.models.file_node import FileNode
+from app.core.enrollment_index import enrollment_index
+from app.core.compression import precompressed_cache, CATEGORIES_NAMESPACE
 from typing import List, Optional
 
+def apply_course_scope(query, user: User, course_column):
+    """Join enrollments onto a query/statement for non-admin users"""
+    if user.is_admin:
+        return query
+    
+    return query.join(
+        Enrollment,
+        and_(
+            Enrollment.course_id == course_column,
+            Enrollment.user_id == user.id
+        )
+    )
+
 class AuthorizationService:
     """
     Centralized authorization logic
@@ -32,13 +48,8 @@ class AuthorizationService:
         if user.is_admin:
             return True
         
-        # Check enrollment
-        enrollment = self.db.query(Enrollment).filter(
-            Enrollment.user_id == user.id,
-            Enrollment.course_id == course_id
-        ).first()
-        
-        return enrollment is not None
+        # Check enrollment (served from the shared enrollment index)
+        return enrollment_index.contains(self.db, user.id, user.enrollment_version, course_id)
     
     def can_access_file(self, user: User, file_id: int) -> bool:
         """
@@ -93,11 +104,20 @@ class AuthorizationService:
             return [c.id for c in all_courses]
         
         # Regular user gets enrolled courses
-        enrollments = self.db.query(Enrollment.course_id).filter(
-            Enrollment.user_id == user.id
-        ).all()
+        return enrollment_index.get_course_ids(self.db, user.id, user.enrollment_version)
+    
+    def apply_course_scope(self, query, user: User, course_column):
+        """
+        Restrict a query to courses the user can access
+        
+        Pushes the filter into SQL as a join on enrollments instead of
+        an IN (...) list of course IDs. Admin queries are returned unchanged.
         
-        return [e.course_id for e in enrollments]
+        Args:
+            query: SQLAlchemy query or select() statement to filter
+            course_column: Column holding the course ID (e.g. FileNode.course_id)
+        """
+        return apply_course_scope(query, user, course_column)
     
     def get_accessible_categories(self, user: User) -> List[Category]:
         """
@@ -139,12 +159,13 @@ class AuthorizationService:
                 query = query.filter(Course.category_id == category_id)
             return query.all()
         
-        # Optimized query for regular users
-        # Single query with JOIN instead of separate queries per course
-        query = self.db.query(Course).join(
-            Enrollment, Course.id == Enrollment.course_id
-        ).filter(
-            Enrollment.user_id == user.id
+        # Regular users: course IDs come from the enrollment index
+        course_ids = enrollment_index.get_course_ids(self.db, user.id, user.enrollment_version)
+        if not course_ids:
+            return []
+        
+        query = self.db.query(Course).filter(
+            Course.id.in_(course_ids)
         ).order_by(Course.name)
         
         if category_id:
@@ -184,9 +205,13 @@ class AuthorizationService:
         )
         
         self.db.add(enrollment)
+        enrollment_index.bump_version(self.db, user_id)
         self.db.commit()
         self.db.refresh(enrollment)
         
+        enrollment_index.add(user_id, course_id)
+        precompressed_cache.bump(CATEGORIES_NAMESPACE)
+        
         return enrollment
     
     def unenroll_user(self, user_id: int, course_id: int) -> bool:
@@ -203,7 +228,10 @@ class AuthorizationService:
         
         if enrollment:
             self.db.delete(enrollment)
+            enrollment_index.bump_version(self.db, user_id)
             self.db.commit()
+            enrollment_index.remove(user_id, course_id)
+            precompressed_cache.bump(CATEGORIES_NAMESPACE)
             return True
         
         return False
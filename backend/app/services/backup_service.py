@@ -2,12 +2,17 @@ import subprocess
 import os
 from datetime import datetime
 from urllib.parse import urlparse
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from typing import Optional, List, Tuple
 from app.models.backup import BackupHistory
 from app.models.user import User
 from app.core.config import settings
 from app.services.lock_service import LockService
+from app.core.pagination import Keyset
+
+# Newest first (see app.core.pagination)
+BACKUP_KEYSET = Keyset(BackupHistory.created_at, BackupHistory.id, descending=True)
 
 class BackupService:
     def __init__(self, db: Session):
@@ -103,13 +108,14 @@ class BackupService:
             print(f"Error executing pg_dump: {e}")
             return False
     
-    def list_backups(self, limit: int = 50, offset: int = 0) -> List[BackupHistory]:
-        """List all backups with pagination"""
-        backups = self.db.query(BackupHistory).order_by(
-            BackupHistory.created_at.desc()
-        ).offset(offset).limit(limit).all()
-        
-        return backups
+    def list_backups(self, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[BackupHistory], Optional[str]]:
+        """List one page of backups, newest first (returns items, next_cursor)"""
+        return BACKUP_KEYSET.page(
+            self.db,
+            select(BackupHistory).options(joinedload(BackupHistory.created_by)),
+            cursor,
+            limit
+        )
     
     def get_backup_by_id(self, backup_id: int) -> Optional[BackupHistory]:
         """Get specific backup details"""
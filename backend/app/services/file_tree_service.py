@@ -0,0 +1,292 @@
+"""
+File tree service for level-by-level FileNode browsing
+"""
+from sqlalchemy import select, update, func, and_, or_, case, cast, String
+from sqlalchemy.orm import Session, aliased
+from fastapi import HTTPException
+from app.models.file_node import FileNode
+from app.services.rollup_service import RollupService
+from typing import Dict, List, Optional, Tuple
+import base64
+import calendar
+import json
+import os
+
+# Media type for the columnar tree payload (see FileTreeService.get_compact_tree)
+COMPACT_TREE_MEDIA_TYPE = "application/vnd.lms.compact-tree+json"
+
+class FileTreeService:
+    """
+    Children-on-demand access and subtree queries for a course's file tree
+    
+    Listing order is folders first, then name, matching idx_file_nodes_children.
+    Pages are keyset-paginated with an opaque cursor of the last (is_directory, name).
+    Subtree queries are a single prefix match on tree_path (idx_file_nodes_tree_path).
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_children(
+        self,
+        course_id: int,
+        parent_id: Optional[int],
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[FileNode], Optional[str]]:
+        """
+        Get one page of direct children (parent_id None = course root level)
+        Returns (nodes, next_cursor)
+        """
+        stmt = select(FileNode).where(
+            FileNode.course_id == course_id,
+            FileNode.parent_id.is_(None) if parent_id is None else FileNode.parent_id == parent_id
+        )
+        
+        if cursor:
+            last_is_directory, last_name = self._decode_cursor(cursor)
+            after_in_group = and_(
+                FileNode.is_directory == last_is_directory,
+                FileNode.name > last_name
+            )
+            # Folders sort before files, so every file follows a folder cursor
+            stmt = stmt.where(
+                or_(after_in_group, FileNode.is_directory == False)
+                if last_is_directory else after_in_group
+            )
+        
+        # Fetch one extra row to know whether another page exists
+        nodes = self.db.execute(
+            stmt.order_by(FileNode.is_directory.desc(), FileNode.name).limit(limit + 1)
+        ).scalars().all()
+        
+        next_cursor = None
+        if len(nodes) > limit:
+            nodes = nodes[:limit]
+            next_cursor = self._encode_cursor(nodes[-1])
+        
+        return nodes, next_cursor
+    
+    def get_compact_tree(self, course_id: int, base_path: str) -> dict:
+        """
+        Whole course tree as parallel column arrays
+        
+        Nodes are ordered parents-first. Per node i:
+        - id: delta from previous id (first is absolute)
+        - parent: i - parent index (0 = course root level)
+        - path is implied as parent path + sep + name; exceptions are sparse:
+          path {i: suffix after parent path}, abs {i: full path}
+        - type: index into types; dir: 0/1; created: seconds after created_base
+        """
+        rows = self.db.execute(
+            select(
+                FileNode.id, FileNode.parent_id, FileNode.name, FileNode.path,
+                FileNode.file_type, FileNode.is_directory, FileNode.size, FileNode.created_at
+            ).where(FileNode.course_id == course_id).order_by(FileNode.id)
+        ).tuples().all()
+        
+        # Parents-first order (breadth-first from the root level)
+        ids = {row[0] for row in rows}
+        children: Dict[Optional[int], list] = {}
+        for row in rows:
+            parent_id = row[1] if row[1] in ids else None
+            children.setdefault(parent_id, []).append(row)
+        
+        ordered = []
+        queue = children.get(None, [])
+        while queue:
+            ordered.extend(queue)
+            queue = [child for row in queue for child in children.get(row[0], ())]
+        
+        sep = os.sep
+        types: List[str] = []
+        type_index: Dict[str, int] = {}
+        index_of: Dict[int, int] = {}
+        paths: List[str] = []
+        created_times = [row[7] for row in ordered if row[7]]
+        created_base = min(created_times) if created_times else None
+        
+        id_col, parent_col, name_col = [], [], []
+        type_col, dir_col, size_col, created_col = [], [], [], []
+        relative: Dict[str, str] = {}
+        absolute: Dict[str, str] = {}
+        previous_id = 0
+        
+        for i, (node_id, parent_id, name, path, file_type, is_directory, size, created_at) in enumerate(ordered):
+            index_of[node_id] = i
+            paths.append(path)
+            parent_index = index_of.get(parent_id)
+            parent_path = paths[parent_index] if parent_index is not None else base_path
+            
+            if path != parent_path + sep + name:
+                if path.startswith(parent_path):
+                    relative[str(i)] = path[len(parent_path):]
+                else:
+                    absolute[str(i)] = path
+            
+            type_id = type_index.get(file_type)
+            if type_id is None:
+                type_id = type_index[file_type] = len(types)
+                types.append(file_type)
+            
+            id_col.append(node_id - previous_id)
+            parent_col.append(i - parent_index if parent_index is not None else 0)
+            name_col.append(name)
+            type_col.append(type_id)
+            dir_col.append(1 if is_directory else 0)
+            size_col.append(size)
+            created_col.append(int((created_at - created_base).total_seconds()) if created_at else None)
+            previous_id = node_id
+        
+        return {
+            'format': 'compact-tree',
+            'version': 1,
+            'course_id': course_id,
+            'count': len(ordered),
+            'base_path': base_path,
+            'sep': sep,
+            'types': types,
+            # Naive UTC timestamps, as stored by datetime.utcnow()
+            'created_base': calendar.timegm(created_base.timetuple()) if created_base else 0,
+            'path': relative,
+            'abs': absolute,
+            'id': id_col,
+            'parent': parent_col,
+            'name': name_col,
+            'type': type_col,
+            'dir': dir_col,
+            'size': size_col,
+            'created': created_col
+        }
+    
+    def refresh_tree(self, course_id: int):
+        """
+        Recompute tree_path and child_count for a course
+        Call after scanner/upload changes, before commit.
+        """
+        self.db.flush()
+        self.refresh_tree_paths(course_id)
+        self.refresh_child_counts(course_id)
+    
+    def refresh_tree_paths(self, course_id: int):
+        """Rebuild materialized paths for a course (one recursive UPDATE)"""
+        child = aliased(FileNode)
+        
+        tree = select(
+            FileNode.id,
+            ('/' + cast(FileNode.id, String) + '/').label('tree_path')
+        ).where(
+            FileNode.course_id == course_id,
+            FileNode.parent_id.is_(None)
+        ).cte('tree', recursive=True)
+        
+        tree = tree.union_all(
+            select(
+                child.id,
+                (tree.c.tree_path + cast(child.id, String) + '/').label('tree_path')
+            ).where(child.parent_id == tree.c.id)
+        )
+        
+        self.db.execute(
+            update(FileNode).where(
+                FileNode.id == tree.c.id
+            ).values(
+                tree_path=tree.c.tree_path
+            ).execution_options(synchronize_session=False)
+        )
+    
+    def refresh_child_counts(self, course_id: int):
+        """Recompute child_count for every node in a course (one UPDATE)"""
+        child = aliased(FileNode)
+        self.db.execute(
+            update(FileNode).where(
+                FileNode.course_id == course_id
+            ).values(
+                child_count=select(func.count(child.id)).where(
+                    child.parent_id == FileNode.id
+                ).scalar_subquery()
+            ).execution_options(synchronize_session=False)
+        )
+    
+    def get_subtree_stats(self, node: FileNode) -> Dict[str, int]:
+        """Recursive size, file count and folder count under a node"""
+        row = self.db.execute(
+            select(
+                func.coalesce(func.sum(FileNode.size), 0).label('total_size'),
+                func.count(case((FileNode.is_directory == False, 1))).label('file_count'),
+                func.count(case((FileNode.is_directory == True, 1))).label('folder_count')
+            ).where(
+                self._subtree_filter(node),
+                FileNode.id != node.id
+            )
+        ).one()
+        
+        return {
+            'total_size': int(row.total_size),
+            'file_count': row.file_count,
+            'folder_count': row.folder_count
+        }
+    
+    def get_ancestors(self, node: FileNode) -> List[FileNode]:
+        """Breadcrumb ancestry, root first (node itself excluded)"""
+        ancestor_ids = [int(i) for i in self._tree_path(node).strip('/').split('/')[:-1]]
+        if not ancestor_ids:
+            return []
+        
+        ancestors = self.db.execute(
+            select(FileNode).where(FileNode.id.in_(ancestor_ids))
+        ).scalars().all()
+        
+        position = {node_id: i for i, node_id in enumerate(ancestor_ids)}
+        return sorted(ancestors, key=lambda a: position[a.id])
+    
+    def _tree_path(self, node: FileNode) -> str:
+        """Node's materialized path, rebuilding the course's paths if missing"""
+        if node.tree_path is None:
+            self.refresh_tree_paths(node.course_id)
+            self.db.refresh(node, ['tree_path'])
+        return node.tree_path
+    
+    def _subtree_filter(self, node: FileNode):
+        # tree_path holds only digits and '/', so no LIKE escaping is needed
+        return FileNode.tree_path.like(f"{self._tree_path(node)}%")
+    
+    def _encode_cursor(self, node: FileNode) -> str:
+        raw = json.dumps([bool(node.is_directory), node.name]).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+    
+    def _decode_cursor(self, cursor: str) -> Tuple[bool, str]:
+        try:
+            is_directory, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return bool(is_directory), str(name)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    def to_children(self, course_id: int, nodes: List[FileNode]) -> List[dict]:
+        """Serialize a page of nodes, attaching folder rollups (one lookup)"""
+        stats = RollupService(self.db).get_folder_stats(
+            course_id, [node.id for node in nodes if node.is_directory]
+        )
+        
+        return [
+            self.to_child(node, stats.get(node.id, RollupService.empty_stats()) if node.is_directory else None)
+            for node in nodes
+        ]
+    
+    @staticmethod
+    def to_child(node: FileNode, stats: Optional[dict] = None) -> dict:
+        """Serialize node with has_children (and folder rollup) for the lazy tree"""
+        return {
+            'id': node.id,
+            'course_id': node.course_id,
+            'name': node.name,
+            'path': node.path,
+            'file_type': node.file_type,
+            'parent_id': node.parent_id,
+            'is_directory': node.is_directory,
+            'size': node.size,
+            'created_at': node.created_at,
+            'child_count': node.child_count or 0,
+            'has_children': bool(node.child_count),
+            'stats': stats
+        }
@@ -2,16 +2,27 @@
 Notification service for announcements and updates
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, true, false, select, func, literal
+from sqlalchemy.dialects.postgresql import insert
 from app.models.user import User
+from app.models.enrollment import Enrollment
 from app.models.search import Announcement, UserNotification, AnnouncementType
 from app.services.authorization_service import AuthorizationService
-from typing import List, Dict, Any, Optional
+from app.core.background_tasks import task_manager
+from app.core.config import settings
+from app.core.pagination import Keyset
+from app.db.database import SessionLocal
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 class NotificationService:
     """Manage announcements and user notifications"""
     
+    # Priority, then newest first (see app.core.pagination)
+    NOTIFICATION_KEYSET = Keyset(
+        Announcement.priority, Announcement.created_at, UserNotification.id, descending=True
+    )
+    
     def __init__(self, db: Session):
         self.db = db
         self.auth_service = AuthorizationService(db)
@@ -46,7 +57,7 @@ class NotificationService:
         self.db.commit()
         self.db.refresh(announcement)
         
-        # Create notifications for relevant users
+        # Create notifications for relevant users (large audiences continue in the background)
         self._create_user_notifications(announcement)
         
         return announcement
@@ -55,96 +66,120 @@ class NotificationService:
         self,
         user: User,
         unread_only: bool = False,
-        limit: int = 50
-    ) -> List[Dict[str, Any]]:
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        Get notifications for a user
+        Get one page of notifications for a user
         Filtered by course enrollment
+        Returns (notifications, next_cursor)
         """
-        # Get user's enrolled courses
-        accessible_course_ids = self.auth_service.get_enrolled_course_ids(user)
-        
-        # Build query
-        query = self.db.query(
+        stmt = self._notifications_statement(
+            user, unread_only, limit, self._visible_announcements_filter(user), cursor
+        )
+        return self._notifications_page(self.db.execute(stmt).all(), limit)
+    
+    def get_unread_count(self, user: User) -> int:
+        """Get count of unread notifications"""
+        stmt = self._unread_count_statement(user, self._visible_announcements_filter(user))
+        return self.db.execute(stmt).scalar() or 0
+    
+    def _notifications_statement(self, user: User, unread_only: bool, limit: int, visible_filter, cursor: Optional[str] = None):
+        """Build notification list query (shared with async service)"""
+        stmt = select(
             UserNotification, Announcement
         ).join(
             Announcement,
             UserNotification.announcement_id == Announcement.id
-        ).filter(
+        ).where(
             UserNotification.user_id == user.id
         )
         
         # Filter for announcements user can see
-        query = query.filter(
-            or_(
-                # System announcements (no course)
-                Announcement.course_id.is_(None),
-                # Course announcements user is enrolled in
-                Announcement.course_id.in_(accessible_course_ids) if accessible_course_ids else False
-            )
-        )
+        stmt = stmt.where(visible_filter)
         
         # Filter unread only
         if unread_only:
-            query = query.filter(UserNotification.is_read == False)
+            stmt = stmt.where(UserNotification.is_read == False)
         
         # Filter expired
-        query = query.filter(
+        stmt = stmt.where(
             or_(
                 Announcement.expires_at.is_(None),
                 Announcement.expires_at > datetime.utcnow()
             )
         )
         
-        # Order by priority and time
-        query = query.order_by(
-            Announcement.priority.desc(),
-            Announcement.created_at.desc()
-        ).limit(limit)
-        
-        results = query.all()
+        # Order by priority and time; one extra row tells whether another page exists
+        return self.NOTIFICATION_KEYSET.apply(stmt, cursor).limit(limit + 1)
+    
+    def _notifications_page(self, results, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Serialize (notification, announcement) rows and build the next cursor"""
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            notif, announcement = results[-1]
+            next_cursor = self.NOTIFICATION_KEYSET.encode(
+                [announcement.priority, announcement.created_at, notif.id]
+            )
         
         return [
-            {
-                'id': notif.id,
-                'announcement_id': announcement.id,
-                'title': announcement.title,
-                'content': announcement.content,
-                'type': announcement.announcement_type,
-                'course_id': announcement.course_id,
-                'file_id': announcement.file_id,
-                'priority': announcement.priority,
-                'is_read': notif.is_read,
-                'created_at': announcement.created_at.isoformat(),
-                'read_at': notif.read_at.isoformat() if notif.read_at else None,
-                'icon': self._get_notification_icon(announcement.announcement_type)
-            }
+            self._notification_result(notif, announcement)
             for notif, announcement in results
-        ]
+        ], next_cursor
     
-    def get_unread_count(self, user: User) -> int:
-        """Get count of unread notifications"""
-        accessible_course_ids = self.auth_service.get_enrolled_course_ids(user)
-        
-        count = self.db.query(UserNotification).join(
+    def _unread_count_statement(self, user: User, visible_filter):
+        """Build unread count query (shared with async service)"""
+        return select(func.count(UserNotification.id)).join(
             Announcement,
             UserNotification.announcement_id == Announcement.id
-        ).filter(
+        ).where(
             and_(
                 UserNotification.user_id == user.id,
                 UserNotification.is_read == False,
-                or_(
-                    Announcement.course_id.is_(None),
-                    Announcement.course_id.in_(accessible_course_ids) if accessible_course_ids else False
-                ),
+                visible_filter,
                 or_(
                     Announcement.expires_at.is_(None),
                     Announcement.expires_at > datetime.utcnow()
                 )
             )
-        ).count()
+        )
+    
+    def _notification_result(self, notif: UserNotification, announcement: Announcement) -> Dict[str, Any]:
+        return {
+            'id': notif.id,
+            'announcement_id': announcement.id,
+            'title': announcement.title,
+            'content': announcement.content,
+            'type': announcement.announcement_type,
+            'course_id': announcement.course_id,
+            'file_id': announcement.file_id,
+            'priority': announcement.priority,
+            'is_read': notif.is_read,
+            'created_at': announcement.created_at.isoformat(),
+            'read_at': notif.read_at.isoformat() if notif.read_at else None,
+            'icon': self._get_notification_icon(announcement.announcement_type)
+        }
+    
+    def _visible_announcements_filter(self, user: User, accessible_course_ids: Optional[List[int]] = None):
+        """
+        Build filter for announcements a user can see
         
-        return count
+        Admin sees everything, so no course list is loaded for them.
+        Regular users see system announcements and their enrolled courses.
+        """
+        if user.is_admin:
+            return true()
+        
+        if accessible_course_ids is None:
+            accessible_course_ids = self.auth_service.get_enrolled_course_ids(user)
+        
+        return or_(
+            # System announcements (no course)
+            Announcement.course_id.is_(None),
+            # Course announcements user is enrolled in
+            Announcement.course_id.in_(accessible_course_ids) if accessible_course_ids else false()
+        )
     
     def mark_as_read(self, notification_id: int, user_id: int) -> bool:
         """Mark a notification as read"""
@@ -237,45 +272,86 @@ class NotificationService:
             priority=0
         )
     
-    def _create_user_notifications(self, announcement: Announcement):
-        """Create notification records for all relevant users"""
-        from app.models.enrollment import Enrollment
+    def _create_user_notifications(self, announcement: Announcement) -> Optional[str]:
+        """
+        Create notification records for all relevant users
         
-        # Determine which users should get this notification
-        if announcement.course_id:
-            # Course-specific: notify enrolled users
-            enrollments = self.db.query(Enrollment).filter(
-                Enrollment.course_id == announcement.course_id
-            ).all()
-            user_ids = [e.user_id for e in enrollments]
-        else:
-            # System-wide: notify all users
-            from app.models.user import User
-            users = self.db.query(User).all()
-            user_ids = [u.id for u in users]
+        Up to NOTIFICATION_FANOUT_INLINE_MAX recipients: one INSERT ... SELECT here.
+        Larger audiences are handed to a background task; returns its task id.
+        """
+        audience = self.db.execute(
+            select(func.count()).select_from(self._audience_statement(announcement.course_id).subquery())
+        ).scalar()
         
-        # Create notification for each user
-        for user_id in user_ids:
-            # Skip if already exists
-            existing = self.db.query(UserNotification).filter(
-                and_(
-                    UserNotification.user_id == user_id,
-                    UserNotification.announcement_id == announcement.id
-                )
-            ).first()
-            
-            if not existing:
-                notif = UserNotification(
-                    user_id=user_id,
-                    announcement_id=announcement.id
-                )
-                self.db.add(notif)
+        if audience <= settings.NOTIFICATION_FANOUT_INLINE_MAX:
+            try:
+                self.db.execute(self._fanout_statement(announcement.id, announcement.course_id))
+                self.db.commit()
+            except Exception as e:
+                print(f"Error creating user notifications: {e}")
+                self.db.rollback()
+            return None
         
-        try:
-            self.db.commit()
-        except Exception as e:
-            print(f"Error creating user notifications: {e}")
-            self.db.rollback()
+        task_id = fanout_task_id(announcement.id)
+        task_manager.submit_task(
+            task_id=task_id,
+            task_type="notification_fanout",
+            task_func=fan_out_notifications,
+            task_args=(announcement.id, announcement.course_id, audience)
+        )
+        return task_id
+    
+    def _audience(self, course_id: Optional[int]):
+        """(user id column, conditions): enrolled users, or every user for system announcements"""
+        if course_id:
+            return Enrollment.user_id, [Enrollment.course_id == course_id]
+        return User.id, []
+    
+    def _audience_statement(self, course_id: Optional[int], after_user_id: int = 0, limit: Optional[int] = None):
+        """Recipient user ids in ascending order, after after_user_id"""
+        user_id, conditions = self._audience(course_id)
+        stmt = select(user_id).where(*conditions, user_id > after_user_id).order_by(user_id)
+        return stmt.limit(limit) if limit else stmt
+    
+    def _fanout_statement(
+        self,
+        announcement_id: int,
+        course_id: Optional[int],
+        after_user_id: int = 0,
+        through_user_id: Optional[int] = None
+    ):
+        """
+        INSERT ... SELECT of one notification per recipient in (after_user_id, through_user_id]
+        Users already notified are skipped by the unique constraint.
+        """
+        user_id, conditions = self._audience(course_id)
+        if through_user_id is not None:
+            conditions.append(user_id <= through_user_id)
+        
+        rows = select(
+            user_id, literal(announcement_id), false(), literal(datetime.utcnow())
+        ).where(*conditions, user_id > after_user_id)
+        
+        return insert(UserNotification).from_select(
+            ['user_id', 'announcement_id', 'is_read', 'created_at'], rows
+        ).on_conflict_do_nothing(constraint='uq_user_notifications_user_announcement')
+    
+    def get_delivery_status(self, announcement_id: int) -> Dict[str, Any]:
+        """Fan-out progress of an announcement (complete unless a background fan-out is tracked)"""
+        delivered = self.db.execute(
+            select(func.count()).where(UserNotification.announcement_id == announcement_id)
+        ).scalar()
+        
+        task = task_manager.get_task(fanout_task_id(announcement_id))
+        if task is None:
+            return {'status': 'completed', 'progress': 100, 'delivered': delivered}
+        
+        return {
+            'status': task.status.value,
+            'progress': task.progress,
+            'delivered': delivered,
+            'error': task.error
+        }
     
     def _get_notification_icon(self, announcement_type: str) -> str:
         """Get Material icon for notification type"""
@@ -287,3 +363,39 @@ class NotificationService:
         }
         
         return icon_map.get(announcement_type, 'notifications')
+
+
+def fanout_task_id(announcement_id: int) -> str:
+    return f"notification_fanout_{announcement_id}"
+
+
+def fan_out_notifications(announcement_id: int, course_id: Optional[int], audience: int, _task=None) -> dict:
+    """
+    Background fan-out for large audiences
+    One INSERT ... SELECT per user-id batch, each committed on its own, so
+    notifications appear while it runs and progress is the share of recipients done.
+    """
+    db = SessionLocal()
+    try:
+        service = NotificationService(db)
+        after_user_id, processed, created = 0, 0, 0
+        
+        while not (_task and _task.should_abort):
+            user_ids = db.execute(service._audience_statement(
+                course_id, after_user_id, settings.NOTIFICATION_FANOUT_BATCH_SIZE
+            )).scalars().all()
+            if not user_ids:
+                break
+            
+            result = db.execute(service._fanout_statement(announcement_id, course_id, after_user_id, user_ids[-1]))
+            db.commit()
+            
+            after_user_id = user_ids[-1]
+            processed += len(user_ids)
+            created += result.rowcount
+            if _task:
+                _task.update_progress(processed * 100 // max(audience, 1))
+        
+        return {'recipients': processed, 'created': created}
+    finally:
+        db.close()
@@ -4,6 +4,7 @@ Reliable scanner service with state machine and error tracking
 import os
 from datetime import datetime
 from typing import Optional, List, Tuple
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.scan_history import ScanHistory, ScanError, ScanLock, ScanStatus
@@ -11,6 +12,11 @@ from app.services.scanner_service import ScannerService
 from app.schemas.scanner import ScanResult, ScanHistoryResponse, ScanStatusResponse
 from app.core.security_utils import SecurityValidator
 from app.core.background_tasks import task_manager, BackgroundTask
+from app.core.pagination import Keyset
+
+# Newest first (see app.core.pagination)
+SCAN_HISTORY_KEYSET = Keyset(ScanHistory.started_at, ScanHistory.id, descending=True)
+SCAN_ERROR_KEYSET = Keyset(ScanError.created_at, ScanError.id, descending=True)
 
 class ReliableScannerService:
     """
@@ -420,27 +426,27 @@ class ReliableScannerService:
                 last_scan=None
             )
     
-    def get_scan_history(self, limit: int = 10) -> List[ScanHistoryResponse]:
-        """Get scan history"""
+    def get_scan_history(self, limit: int = 10, cursor: Optional[str] = None) -> Tuple[List[ScanHistoryResponse], Optional[str]]:
+        """Get one page of scan history, newest first (returns items, next_cursor)"""
         try:
-            scans = self.db.query(ScanHistory).order_by(
-                ScanHistory.started_at.desc()
-            ).limit(limit).all()
-            
-            return [ScanHistoryResponse.from_orm(scan) for scan in scans]
-        except Exception as e:
+            scans, next_cursor = SCAN_HISTORY_KEYSET.page(self.db, select(ScanHistory), cursor, limit)
+            return [ScanHistoryResponse.from_orm(scan) for scan in scans], next_cursor
+        except SQLAlchemyError as e:
             print(f"Error getting scan history: {e}")
-            return []
+            return [], None
     
-    def get_scan_errors(self, scan_id: int) -> List[ScanError]:
-        """Get errors for specific scan"""
+    def get_scan_errors(self, scan_id: int, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[ScanError], Optional[str]]:
+        """Get one page of errors for specific scan, newest first (returns items, next_cursor)"""
         try:
-            return self.db.query(ScanError).filter(
-                ScanError.scan_id == scan_id
-            ).all()
-        except Exception as e:
+            return SCAN_ERROR_KEYSET.page(
+                self.db,
+                select(ScanError).where(ScanError.scan_id == scan_id),
+                cursor,
+                limit
+            )
+        except SQLAlchemyError as e:
             print(f"Error getting scan errors: {e}")
-            return []
+            return [], None
 
 
 # Import settings for path validation
@@ -5,6 +5,12 @@ from sqlalchemy.orm import Session
 from app.models.backup import BackupHistory
 from app.core.config import settings
 from app.services.lock_service import LockService
+from app.core.enrollment_index import enrollment_index
+from app.core.compression import precompressed_cache
+from app.core.search_index import search_index
+from app.core.search_cache import search_cache
+from app.core.suggest_index import suggest_index
+from app.db.database import engine
 
 class RestoreService:
     def __init__(self, db: Session):
@@ -43,6 +49,17 @@ class RestoreService:
             if not self._verify_database_integrity():
                 raise Exception("Database integrity check failed after restore")
             
+            # Cached enrollments no longer match the restored data
+            enrollment_index.clear()
+            precompressed_cache.clear()
+            search_index.invalidate()
+            suggest_index.invalidate()
+            search_cache.bump()
+            
+            # Pooled connections may hold state from before the restore
+            # (async callers also await dispose_async_engine(), see the restore endpoint)
+            engine.dispose()
+            
             return True
             
         except Exception as e:
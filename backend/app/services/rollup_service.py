@@ -0,0 +1,268 @@
+"""
+Rollup service for denormalized course/folder aggregates and completion counts
+"""
+from collections import defaultdict
+from sqlalchemy import select, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+from app.models.file_node import FileNode
+from app.models.progress import UserProgress, ProgressStatus
+from app.models.rollup import FileRollup, UserCourseCompletion, COURSE_LEVEL
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class RollupService:
+    """
+    Maintain and read FileRollup / UserCourseCompletion rows
+    
+    Changes are turned into (folder, file_type) deltas for every ancestor
+    folder plus the course level, then written with one batched upsert.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    # Maintenance
+    
+    def apply_file_changes(
+        self,
+        course_id: int,
+        added: Iterable[FileNode] = (),
+        removed: Iterable[FileNode] = (),
+        resized: Iterable[Tuple[FileNode, int]] = ()
+    ):
+        """
+        Apply scanner diff results to rollups
+        
+        added: new nodes (flushed, tree paths refreshed)
+        removed: nodes being deleted, with their tree_path still loaded and their
+                 progress rows not yet deleted (completed ones are subtracted)
+        resized: (node, size delta) for modified files
+        """
+        added, removed, resized = list(added), list(removed), list(resized)
+        
+        removed_file_ids = [node.id for node in removed if not node.is_directory]
+        if removed_file_ids:
+            self._remove_completions(course_id, UserProgress.file_id.in_(removed_file_ids))
+        
+        # Rows predating tree_path cannot be placed; recompute instead
+        if any(node.tree_path is None for node in removed) or any(node.tree_path is None for node, _ in resized):
+            self.rebuild(course_id)
+            return
+        
+        deltas = defaultdict(lambda: [0, 0])
+        parent_paths = self._tree_paths({node.parent_id for node in added if node.parent_id})
+        
+        for node in added:
+            if not node.is_directory:
+                folder_ids = self._folder_ids(parent_paths.get(node.parent_id))
+                self._add(deltas, folder_ids, node.file_type, 1, node.size or 0)
+        
+        for node in removed:
+            if not node.is_directory:
+                folder_ids = self._folder_ids(node.tree_path, exclude_self=True)
+                self._add(deltas, folder_ids, node.file_type, -1, -(node.size or 0))
+        
+        for node, size_delta in resized:
+            folder_ids = self._folder_ids(node.tree_path, exclude_self=True)
+            self._add(deltas, folder_ids, node.file_type, 0, size_delta)
+        
+        self._apply(course_id, deltas)
+        self._drop_folders(course_id, [node.id for node in removed if node.is_directory])
+    
+    def _remove_completions(self, course_id: int, file_filter):
+        """Subtract completed progress on files about to be deleted from per-user counts"""
+        completed = self.db.execute(
+            select(UserProgress.user_id, func.count(UserProgress.id)).where(
+                file_filter,
+                UserProgress.status == ProgressStatus.COMPLETED
+            ).group_by(UserProgress.user_id)
+        ).all()
+        for user_id, count in completed:
+            self.record_completion(user_id, course_id, -count)
+    
+    def rebuild(self, course_id: int):
+        """Recompute all rollups of a course from file_nodes (INSERT ... SELECT)"""
+        self.db.execute(delete(FileRollup).where(FileRollup.course_id == course_id))
+        
+        columns = ['course_id', 'folder_id', 'file_type', 'file_count', 'total_size']
+        files = select(FileNode).where(
+            FileNode.course_id == course_id,
+            FileNode.is_directory == False
+        ).subquery()
+        
+        # Course level
+        self.db.execute(insert(FileRollup).from_select(columns, select(
+            files.c.course_id,
+            COURSE_LEVEL,
+            files.c.file_type,
+            func.count(files.c.id),
+            func.coalesce(func.sum(files.c.size), 0)
+        ).group_by(files.c.course_id, files.c.file_type)))
+        
+        # Every folder containing the file (prefix match on tree_path)
+        folder = aliased(FileNode)
+        self.db.execute(insert(FileRollup).from_select(columns, select(
+            files.c.course_id,
+            folder.id,
+            files.c.file_type,
+            func.count(files.c.id),
+            func.coalesce(func.sum(files.c.size), 0)
+        ).join(
+            folder,
+            and_(
+                folder.course_id == course_id,
+                folder.is_directory == True,
+                files.c.tree_path.like(folder.tree_path + '%')
+            )
+        ).group_by(files.c.course_id, folder.id, files.c.file_type)))
+    
+    def record_completion(self, user_id: int, course_id: int, delta: int):
+        """Adjust a user's completed file count for a course"""
+        if not delta:
+            return
+        
+        stmt = insert(UserCourseCompletion).values(
+            user_id=user_id,
+            course_id=course_id,
+            completed_count=max(delta, 0)
+        )
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id', 'course_id'],
+            set_={'completed_count': func.greatest(UserCourseCompletion.completed_count + delta, 0)}
+        ))
+    
+    # Reads
+    
+    def get_course_stats(self, course_ids: List[int]) -> Dict[int, dict]:
+        """Course totals keyed by course id (one indexed lookup)"""
+        if not course_ids:
+            return {}
+        
+        rows = self.db.execute(
+            select(FileRollup).where(
+                FileRollup.course_id.in_(course_ids),
+                FileRollup.folder_id == COURSE_LEVEL
+            )
+        ).scalars().all()
+        
+        return self._stats(rows, lambda r: r.course_id)
+    
+    def attach_course_stats(self, courses: List) -> List:
+        """Set .stats on Course objects for API responses"""
+        stats = self.get_course_stats([course.id for course in courses])
+        for course in courses:
+            course.stats = stats.get(course.id, self.empty_stats())
+        return courses
+    
+    def get_folder_stats(self, course_id: int, folder_ids: List[int]) -> Dict[int, dict]:
+        """Recursive folder totals keyed by folder id (one indexed lookup)"""
+        if not folder_ids:
+            return {}
+        
+        rows = self.db.execute(
+            select(FileRollup).where(
+                FileRollup.course_id == course_id,
+                FileRollup.folder_id.in_(folder_ids)
+            )
+        ).scalars().all()
+        
+        return self._stats(rows, lambda r: r.folder_id)
+    
+    def get_user_completions(self, user_id: int) -> List[dict]:
+        """Completion percentage per course the user has progress in"""
+        completions = self.db.execute(
+            select(UserCourseCompletion).where(UserCourseCompletion.user_id == user_id)
+        ).scalars().all()
+        
+        totals = self.get_course_stats([c.course_id for c in completions])
+        
+        result = []
+        for completion in completions:
+            total = totals.get(completion.course_id, self.empty_stats())['file_count']
+            result.append({
+                'course_id': completion.course_id,
+                'completed': completion.completed_count,
+                'total': total,
+                'percent': round(100.0 * completion.completed_count / total, 1) if total else 0.0
+            })
+        
+        return result
+    
+    @staticmethod
+    def empty_stats() -> dict:
+        return {'total_size': 0, 'file_count': 0, 'file_types': {}}
+    
+    # Helpers
+    
+    def _stats(self, rows, key) -> Dict[int, dict]:
+        stats: Dict[int, dict] = {}
+        for row in rows:
+            entry = stats.setdefault(key(row), self.empty_stats())
+            entry['total_size'] += row.total_size
+            entry['file_count'] += row.file_count
+            entry['file_types'][row.file_type] = row.file_count
+        return stats
+    
+    def _tree_paths(self, node_ids) -> Dict[int, str]:
+        if not node_ids:
+            return {}
+        
+        rows = self.db.execute(
+            select(FileNode.id, FileNode.tree_path).where(FileNode.id.in_(node_ids))
+        ).all()
+        return {node_id: tree_path for node_id, tree_path in rows}
+    
+    @staticmethod
+    def _folder_ids(tree_path: Optional[str], exclude_self: bool = False) -> List[int]:
+        """Course level plus every folder id on a materialized path"""
+        ids = [int(i) for i in (tree_path or '').strip('/').split('/') if i]
+        if exclude_self:
+            ids = ids[:-1]
+        return [COURSE_LEVEL] + ids
+    
+    @staticmethod
+    def _add(deltas, folder_ids: List[int], file_type: str, count: int, size: int):
+        for folder_id in folder_ids:
+            entry = deltas[(folder_id, file_type)]
+            entry[0] += count
+            entry[1] += size
+    
+    def _apply(self, course_id: int, deltas):
+        """Write all deltas with a single upsert, then drop emptied rows"""
+        rows = [
+            {
+                'course_id': course_id,
+                'folder_id': folder_id,
+                'file_type': file_type,
+                'file_count': count,
+                'total_size': size
+            }
+            for (folder_id, file_type), (count, size) in deltas.items()
+            if count or size
+        ]
+        if not rows:
+            return
+        
+        stmt = insert(FileRollup).values(rows)
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=['course_id', 'folder_id', 'file_type'],
+            set_={
+                'file_count': FileRollup.file_count + stmt.excluded.file_count,
+                'total_size': FileRollup.total_size + stmt.excluded.total_size
+            }
+        ))
+        
+        self.db.execute(delete(FileRollup).where(
+            FileRollup.course_id == course_id,
+            FileRollup.file_count <= 0
+        ))
+    
+    def _drop_folders(self, course_id: int, folder_ids: List[int]):
+        """Remove rollup rows of deleted folders"""
+        if not folder_ids:
+            return
+        
+        self.db.execute(delete(FileRollup).where(
+            FileRollup.course_id == course_id,
+            FileRollup.folder_id.in_(folder_ids)
+        ))
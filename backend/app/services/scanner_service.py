@@ -1,26 +1,30 @@
+import logging
 import os
-from pathlib import Path
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from app.models import Category, Course, FileNode, Settings as SettingsModel
+from app.models.progress import UserProgress
+from app.models.last_viewed import LastViewed
 from app.schemas import ScanResult
 from app.core.security_utils import SecurityValidator, is_safe_path
 from app.core.config import settings
+from app.core.file_types import FOLDER_TYPE, file_type_for
+from app.services.file_tree_service import FileTreeService
+from app.services.rollup_service import RollupService
+from app.core.compression import precompressed_cache, tree_namespace, CATEGORIES_NAMESPACE
+from app.core.search_index import search_index
+from app.core.search_cache import search_cache
+from app.core.text_extraction import schedule_document_extraction
+from app.core.suggest_index import suggest_index
+
+logger = logging.getLogger(__name__)
+
 
 class ScannerService:
     # Default categories
     DEFAULT_CATEGORIES = ["Courses", "Books", "Novels", "Pictures"]
     
-    # File extensions mapping
-    FILE_TYPE_MAP = {
-        '.pdf': 'pdf',
-        '.mp4': 'video', '.avi': 'video', '.mkv': 'video', '.mov': 'video', '.webm': 'video',
-        '.mp3': 'audio', '.wav': 'audio', '.ogg': 'audio', '.m4a': 'audio',
-        '.jpg': 'image', '.jpeg': 'image', '.png': 'image', '.gif': 'image', '.bmp': 'image', '.webp': 'image',
-        '.txt': 'text', '.md': 'text', '.log': 'text',
-        '.epub': 'epub'
-    }
-
     def __init__(self, db: Session):
         self.db = db
 
@@ -45,6 +49,8 @@ class ScannerService:
             files_added = 0
             files_removed = 0
             files_updated = 0
+            changed_course_ids = []
+            removed_file_ids = []
 
             # Get all directories in root (these are categories)
             category_dirs = [d for d in os.listdir(root_path) 
@@ -93,9 +99,35 @@ class ScannerService:
                     files_added += result['added']
                     files_removed += result['removed']
                     files_updated += result['updated']
+                    removed_file_ids.extend(result['removed_file_ids'])
+                    if result['added'] or result['removed'] or result['updated']:
+                        changed_course_ids.append(course.id)
 
             self.db.commit()
 
+            # Drop precompressed tree/category bodies built from the old data
+            for course_id in changed_course_ids:
+                precompressed_cache.bump(tree_namespace(course_id))
+            if categories_found or courses_found:
+                precompressed_cache.bump(CATEGORIES_NAMESPACE)
+
+            search_cache.bump()
+            # New or changed documents get their text extracted in the background
+            schedule_document_extraction()
+
+            # Tombstone removed files, then index the new rows; the scan itself has
+            # already been committed, so an index failure is logged, not reported
+            try:
+                search_index.remove_files(removed_file_ids)
+                search_index.refresh(self.db)
+                search_index.save()
+                suggest_index.refresh(self.db)
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"Search index maintenance after scan failed: {e}", exc_info=True)
+            # Drop results cached from the index while it was catching up
+            search_cache.bump()
+
             return ScanResult(
                 success=True,
                 message="Scan completed successfully",
@@ -139,6 +171,11 @@ class ScannerService:
         
         # Create a map to track newly created folders by path
         new_folders_map: Dict[str, FileNode] = {}
+        
+        # Diff results for rollup maintenance
+        added_nodes: List[FileNode] = []
+        removed_nodes: List[FileNode] = []
+        resized_nodes: List[Tuple[FileNode, int]] = []
 
         # FIRST PASS: Scan and create all directories
         for root, dirs, files in os.walk(course_path):
@@ -166,7 +203,7 @@ class ScannerService:
                         course_id=course.id,
                         name=dir_name,
                         path=normalized_dir_path,
-                        file_type='folder',
+                        file_type=FOLDER_TYPE,
                         parent_id=parent_id,
                         is_directory=True
                     )
@@ -175,6 +212,7 @@ class ScannerService:
                     
                     # Store in our map for parent lookup
                     new_folders_map[normalized_dir_path] = file_node
+                    added_nodes.append(file_node)
                     added += 1
 
         # SECOND PASS: Scan and create all files
@@ -218,7 +256,7 @@ class ScannerService:
                         else:
                             print(f"WARNING: Parent not found for {file_name} at {normalized_root}")
                     
-                    file_type = self._get_file_type(file_name)
+                    file_type = file_type_for(file_name)
                     file_size = os.path.getsize(file_path)
                     
                     file_node = FileNode(
@@ -231,34 +269,47 @@ class ScannerService:
                         size=file_size
                     )
                     self.db.add(file_node)
+                    added_nodes.append(file_node)
                     added += 1
                 else:
                     # Check if file was modified
                     existing_file = existing_paths[normalized_file_path]
                     new_size = os.path.getsize(file_path)
                     if existing_file.size != new_size:
+                        resized_nodes.append((existing_file, new_size - (existing_file.size or 0)))
                         existing_file.size = new_size
                         updated += 1
 
-        # Remove files that no longer exist
+        # Files that no longer exist
         for path, file_node in existing_paths.items():
             if path not in scanned_paths:
-                self.db.delete(file_node)
+                removed_nodes.append(file_node)
                 removed += 1
 
+        # Place the new nodes, then propagate the diff up the ancestor chains while
+        # removed nodes and their progress rows still exist (completed counts)
+        tree_service = FileTreeService(self.db)
+        self.db.flush()
+        tree_service.refresh_tree_paths(course.id)
+        RollupService(self.db).apply_file_changes(course.id, added_nodes, removed_nodes, resized_nodes)
+
+        if removed_nodes:
+            # Rows referencing file_nodes without ON DELETE CASCADE
+            removed_ids = [node.id for node in removed_nodes]
+            self.db.execute(delete(UserProgress).where(UserProgress.file_id.in_(removed_ids)))
+            self.db.execute(delete(LastViewed).where(LastViewed.file_id.in_(removed_ids)))
+            for file_node in removed_nodes:
+                self.db.delete(file_node)
+            self.db.flush()
+        tree_service.refresh_child_counts(course.id)
+
         return {
             'added': added,
             'removed': removed,
-            'updated': updated
+            'updated': updated,
+            'removed_file_ids': [node.id for node in removed_nodes if not node.is_directory]
         }
 
-    def _get_file_type(self, filename: str) -> str:
-        """
-        Determine file type based on extension.
-        """
-        ext = Path(filename).suffix.lower()
-        return self.FILE_TYPE_MAP.get(ext, 'unknown')
-
     def get_root_path(self) -> str:
         """
         Get the configured root path from database.
@@ -2,14 +2,106 @@
 Unified search service for courses and files
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy import or_, false, func, select, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.models.user import User
 from app.models.course import Course
 from app.models.file_node import FileNode
-from app.models.search import SearchLog
+from app.models.search import SearchLog, SearchQueryDaily
+from app.models.document_text import DocumentChunk
 from app.services.authorization_service import AuthorizationService
-from typing import List, Dict, Any
-from datetime import datetime
+from app.core.config import settings
+from app.core.file_types import icon_for, resolve_file_type
+from app.core.search_index import search_index, snippet
+from app.core.search_cache import ADMIN_SCOPE, id_array, normalize_query, scope_digest, search_cache
+from app.core.search_log_writer import search_log_writer
+from app.db.database import SessionLocal
+from fastapi import HTTPException, status
+from array import array
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+import threading
+from typing import Callable, List, Dict, Any, NamedTuple, Optional, Set, Tuple
+from datetime import datetime, timedelta
+import re
+
+# Trigger-maintained full-text columns (SEARCH_BACKEND=postgres, see app.migrations.add_search_vectors)
+COURSE_SEARCH_VECTOR = literal_column("courses.search_vector", TSVECTOR)
+FILE_SEARCH_VECTOR = literal_column("file_nodes.search_vector", TSVECTOR)
+CHUNK_SEARCH_VECTOR = literal_column("document_chunks.search_vector", TSVECTOR)
+
+# Reciprocal rank fusion constant for the merged course/file ranking
+RRF_K = 60
+
+# Content search fetches this many passages per requested file (best one per file is kept)
+CONTENT_CANDIDATES = 3
+
+# Extra sessions held by concurrent sub-queries, never more than a quarter of the connection pool
+PARALLEL_SESSIONS = max(0, min(
+    settings.SEARCH_PARALLEL_SESSIONS,
+    (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW) // 4
+))
+
+# Slots for those sessions (sync and async services keep separate pools, so separate slots)
+search_slots = threading.BoundedSemaphore(PARALLEL_SESSIONS)
+_search_pool = ThreadPoolExecutor(max_workers=max(1, PARALLEL_SESSIONS), thread_name_prefix="search")
+
+class SearchScope(NamedTuple):
+    """Backend choice and course scope, resolved once per search"""
+    use_index: bool
+    # In-memory index only: enrolled course IDs (None = all, for admin).
+    # SQL backends join enrollments in the statement instead.
+    course_ids: Optional[List[int]]
+    # Result cache scope: "admin" or a hash of the accessible course set
+    cache_scope: str
+
+class SearchFilters(NamedTuple):
+    """File search facet filters (empty / None = not filtered)"""
+    file_types: Tuple[str, ...] = ()
+    course_ids: Tuple[int, ...] = ()
+    category_ids: Tuple[int, ...] = ()
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    added_after: Optional[datetime] = None
+    added_before: Optional[datetime] = None
+
+    @property
+    def in_index(self) -> bool:
+        """The in-memory index filters type, course and category; size and date need SQL"""
+        return (self.min_size, self.max_size, self.added_after, self.added_before) == (None, None, None, None)
+
+NO_FILTERS = SearchFilters()
+
+def file_filters(
+    file_types: Optional[List[str]] = None,
+    course_ids: Optional[List[int]] = None,
+    category_ids: Optional[List[int]] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    added_after: Optional[datetime] = None,
+    added_before: Optional[datetime] = None
+) -> SearchFilters:
+    """Filters from request parameters; file types may be given as type, extension or MIME type"""
+    types = []
+    for value in file_types or ():
+        file_type = resolve_file_type(value)
+        if file_type is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown file type: {value}"
+            )
+        types.append(file_type)
+    
+    return SearchFilters(
+        file_types=tuple(sorted(set(types))),
+        course_ids=tuple(sorted(set(course_ids or ()))),
+        category_ids=tuple(sorted(set(category_ids or ()))),
+        min_size=min_size,
+        max_size=max_size,
+        added_after=added_after,
+        added_before=added_before
+    )
 
 class SearchService:
     """Unified search across courses and files"""
@@ -27,28 +119,117 @@ class SearchService:
         """
         Search across courses and files
         
+        Scope is resolved once, then the course, file and facet sub-queries
+        run (SQL backends: concurrently, see _gather). Ranked IDs and facet counts
+        are cached per course scope; a hit is hydrated by primary key.
+        
         Returns:
             {
+                'results': [...],  # courses and files ranked together
                 'courses': [...],
                 'files': [...],
+                'facets': {'pdf': N, 'video': N, ...},  # matching files by stored type
                 'total': N
             }
         """
-        courses = self.search_courses(query, user, limit)
-        files = self.search_files(query, user, limit)
-        
-        total = len(courses) + len(files)
+        query = normalize_query(query)
+        scope = self._resolve_scope(user)
+        key = search_cache.key('all', query, scope.cache_scope, scope.use_index, limit)
+        cached = search_cache.get(key)
+        if cached is not None:
+            course_ids, file_ids, type_counts = cached
+            courses, files = self._courses_by_ids(course_ids), self._files_by_ids(file_ids)
+        else:
+            version = search_cache.catalog_version
+            courses, files, type_counts = self._run_search_all(query, user, limit, scope)
+            search_cache.put(key, (id_array(courses), id_array(files), type_counts), version)
         
         # Log search
-        self._log_search(user.id, query, total, 'all')
+        self._log_search(user.id, query, len(courses) + len(files), 'all')
+        
+        return self._all_response(query, courses, files, type_counts, limit)
+    
+    def _run_search_all(self, query: str, user: User, limit: int, scope: SearchScope):
+        # The index ranks in memory and counts types while ranking: no fan-out
+        if scope.use_index:
+            facets = self._empty_facets()
+            courses = self._search_courses(query, user, limit, scope)
+            files = self._search_files(query, user, limit, scope, facets=facets)
+            return courses, files, facets['file_type']
+        
+        return self._gather(
+            lambda service: service._search_courses(query, user, limit, scope),
+            lambda service: service._search_files(query, user, limit, scope),
+            lambda service: service._facet_counts(query, user, NO_FILTERS, 'file_type')
+        )
+    
+    def _gather(self, *tasks: Callable[["SearchService"], Any]) -> list:
+        """
+        Results of tasks, in order
+        The first runs on this session; the others on their own sessions while
+        search_slots has room, otherwise inline here too.
+        """
+        jobs = [self._submit(task) for task in tasks[1:]]
+        return [tasks[0](self)] + [job.result() for job in jobs]
+    
+    def _submit(self, task: Callable[["SearchService"], Any]) -> Future:
+        """Run task on the search pool with its own session (Session is not thread-safe)"""
+        if not search_slots.acquire(blocking=False):
+            future = Future()
+            try:
+                future.set_result(task(self))
+            except Exception as e:
+                future.set_exception(e)
+            return future
         
+        def run():
+            try:
+                db = SessionLocal()
+                try:
+                    return task(SearchService(db))
+                finally:
+                    db.close()
+            finally:
+                search_slots.release()
+        
+        # Copy context so per-request query metrics include the sub-queries
+        try:
+            return _search_pool.submit(copy_context().run, run)
+        except BaseException:
+            search_slots.release()
+            raise
+    
+    def _all_response(
+        self,
+        query: str,
+        courses: List[Dict[str, Any]],
+        files: List[Dict[str, Any]],
+        type_counts: Counter,
+        limit: int
+    ) -> Dict[str, Any]:
         return {
+            'results': self._merge_ranked(courses, files, limit),
             'courses': courses,
             'files': files,
-            'total': total,
+            'facets': dict(type_counts.most_common()),
+            'total': len(courses) + len(files),
             'query': query
         }
     
+    def _merge_ranked(self, courses: list, files: list, limit: int) -> List[Dict[str, Any]]:
+        """
+        One ranking over both lists (reciprocal rank fusion)
+        Each backend ranks within a kind; rank positions are comparable where raw scores are not.
+        """
+        scored = [
+            (1.0 / (RRF_K + rank + 1), item)
+            for results in (courses, files)
+            for rank, item in enumerate(results)
+        ]
+        # Stable sort: a course wins a tie with the file at the same rank
+        scored.sort(key=lambda pair: -pair[0])
+        return [{**item, 'score': round(score, 6)} for score, item in scored[:limit]]
+    
     def search_courses(
         self,
         query: str,
@@ -59,33 +240,105 @@ class SearchService:
         Search courses by name
         User only sees enrolled courses (unless admin)
         """
-        query_lower = f"%{query.lower()}%"
+        query = normalize_query(query)
+        scope = self._resolve_scope(user)
+        key = search_cache.key('courses', query, scope.cache_scope, scope.use_index, limit)
+        ids = search_cache.get(key)
+        if ids is not None:
+            return self._courses_by_ids(ids)
         
-        # Get accessible courses
-        accessible_courses = self.auth_service.get_accessible_courses(user)
-        course_ids = [c.id for c in accessible_courses]
+        version = search_cache.catalog_version
+        results = self._search_courses(query, user, limit, scope)
+        search_cache.put(key, id_array(results), version)
+        return results
+    
+    def _search_courses(self, query: str, user: User, limit: int, scope: SearchScope) -> List[Dict[str, Any]]:
+        if scope.use_index:
+            return self._courses_by_ids(search_index.search_courses(query, scope.course_ids, limit))
         
-        if not course_ids:
-            return []
+        results = self.db.execute(
+            self._courses_statement(query, user, limit)
+        ).scalars().all()
         
-        # Search in accessible courses
-        results = self.db.query(Course).filter(
-            and_(
-                Course.id.in_(course_ids),
-                func.lower(Course.name).like(query_lower)
-            )
-        ).order_by(Course.name).limit(limit).all()
+        return [self._course_result(course) for course in results]
+    
+    def _use_index(self) -> bool:
+        """In-memory index when selected and loaded; SQL otherwise"""
+        return settings.SEARCH_BACKEND == "index" and search_index.ready
+    
+    def _resolve_scope(self, user: User) -> SearchScope:
+        use_index = self._use_index()
+        if user.is_admin:
+            return SearchScope(use_index, None, ADMIN_SCOPE)
+        course_ids = self.auth_service.get_enrolled_course_ids(user)
+        return SearchScope(use_index, course_ids if use_index else None, scope_digest(course_ids))
+    
+    def _by_ids_statement(self, model, ids: List[int]):
+        return select(model).where(model.id.in_(ids))
+    
+    def _courses_by_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Hydrate ranked course IDs (index results, cache hits) in one query"""
+        courses = self.db.execute(self._by_ids_statement(Course, ids)).scalars().all()
+        return [self._course_result(course) for course in self._in_rank_order(courses, ids)]
+    
+    def _files_by_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Hydrate ranked file IDs (index results, cache hits) in one query"""
+        files = self.db.execute(self._by_ids_statement(FileNode, ids)).scalars().all()
+        return [self._file_result(file) for file in self._in_rank_order(files, ids)]
+    
+    def _in_rank_order(self, rows: list, ids: List[int]) -> list:
+        """Reorder rows fetched by id to the index ranking (drops rows deleted since)"""
+        by_id = {row.id: row for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+    
+    def _ts_query(self, query: str):
+        """
+        Prefix tsquery ANDing every word, split the way search_tokens() splits names
+        None when the query has no words (trigram similarity only)
+        """
+        words = re.findall(r"[^\W\d_]+|\d+", query.lower())
+        if not words:
+            return None
+        return func.to_tsquery('simple', ' & '.join(f"{word}:*" for word in words))
+    
+    def _full_text_match(self, vector, name_column, query: str):
+        """
+        (condition, rank) for SEARCH_BACKEND=postgres
+        Full-text prefix match on the search vector, or pg_trgm similarity on the
+        name for misspellings; both served by GIN indexes.
+        """
+        ts_query = self._ts_query(query)
+        similar = name_column.op('%')(query)
+        similarity = func.similarity(name_column, query)
+        if ts_query is None:
+            return similar, similarity
+        return or_(vector.op('@@')(ts_query), similar), func.ts_rank(vector, ts_query) + similarity
+    
+    def _courses_statement(self, query: str, user: User, limit: int):
+        """Build course search statement (shared by sync and async services)"""
+        if settings.SEARCH_BACKEND == "postgres":
+            condition, rank = self._full_text_match(COURSE_SEARCH_VECTOR, Course.name, query)
+            stmt = self.auth_service.apply_course_scope(select(Course).where(condition), user, Course.id)
+            return stmt.order_by(rank.desc(), Course.name).limit(limit)
         
-        return [
-            {
-                'id': course.id,
-                'name': course.name,
-                'category_id': course.category_id,
-                'type': 'course',
-                'icon': 'school'
-            }
-            for course in results
-        ]
+        query_lower = f"%{query.lower()}%"
+        
+        # Search in accessible courses (enrollment filter joined in SQL)
+        stmt = select(Course).where(
+            func.lower(Course.name).like(query_lower)
+        )
+        stmt = self.auth_service.apply_course_scope(stmt, user, Course.id)
+        
+        return stmt.order_by(Course.name).limit(limit)
+    
+    def _course_result(self, course: Course) -> Dict[str, Any]:
+        return {
+            'id': course.id,
+            'name': course.name,
+            'category_id': course.category_id,
+            'type': 'course',
+            'icon': 'school'
+        }
     
     def search_files(
         self,
@@ -97,49 +350,300 @@ class SearchService:
         """
         Search files by name and path
         User only sees files in enrolled courses (unless admin)
+        file_type: a type ('video'), extension ('mp4') or MIME type
+        """
+        filters = self._type_filter(file_type)
+        query = normalize_query(query)
+        scope = self._resolve_scope(user)
+        key = search_cache.key('files', query, scope.cache_scope, scope.use_index, limit, filters)
+        ids = search_cache.get(key)
+        if ids is not None:
+            return self._files_by_ids(ids)
+        
+        version = search_cache.catalog_version
+        results = self._search_files(query, user, limit, scope, filters)
+        search_cache.put(key, id_array(results), version)
+        return results
+    
+    def _type_filter(self, file_type: Optional[str]) -> SearchFilters:
+        if not file_type:
+            return NO_FILTERS
+        return SearchFilters(file_types=(resolve_file_type(file_type) or file_type.lower(),))
+    
+    def search_files_faceted(
+        self,
+        query: str,
+        user: User,
+        filters: SearchFilters = NO_FILTERS,
+        limit: int = 30
+    ) -> Dict[str, Any]:
         """
+        File search with facet filters and facet counts
+        
+        Each facet is counted with every other filter applied but not its own,
+        so the other values of a selected facet stay visible with their counts.
+        
+        Returns:
+            {
+                'results': [...],
+                'facets': {
+                    'file_type': {'pdf': N, ...},
+                    'course': {course_id: N, ...},
+                    'category': {category_id: N, ...}
+                },
+                'total': N  # results returned
+            }
+        """
+        query = normalize_query(query)
+        scope = self._resolve_scope(user)
+        # Size and date filters are not in the index; those searches run in SQL
+        scope = scope._replace(use_index=scope.use_index and filters.in_index)
+        key = search_cache.key('faceted', query, scope.cache_scope, scope.use_index, limit, filters)
+        cached = search_cache.get(key)
+        if cached is not None:
+            file_ids, facets = cached
+            files = self._files_by_ids(file_ids)
+        else:
+            version = search_cache.catalog_version
+            files, facets = self._run_faceted(query, user, limit, scope, filters)
+            search_cache.put(key, (id_array(files), facets), version)
+        
+        self._log_search(user.id, query, len(files), 'files')
+        
+        categories = self.db.execute(self._course_categories_statement(facets['course'])).all()
+        return {
+            'results': files,
+            'facets': self._facets_response(facets, dict(categories)),
+            'total': len(files),
+            'query': query
+        }
+    
+    def _run_faceted(self, query: str, user: User, limit: int, scope: SearchScope, filters: SearchFilters):
+        if scope.use_index:
+            facets = self._empty_facets()
+            return self._search_files(query, user, limit, scope, filters, facets), facets
+        
+        files, type_counts, course_counts = self._gather(
+            lambda service: service._search_files(query, user, limit, scope, filters),
+            lambda service: service._facet_counts(query, user, filters, 'file_type'),
+            lambda service: service._facet_counts(query, user, filters, 'course')
+        )
+        return files, {'file_type': type_counts, 'course': course_counts}
+    
+    def _empty_facets(self) -> Dict[str, Counter]:
+        return {'file_type': Counter(), 'course': Counter()}
+    
+    def _facets_response(self, facets: Dict[str, Counter], course_categories: Dict[int, int]) -> Dict[str, Dict]:
+        """Facet counts largest first; categories rolled up from the course counts"""
+        categories = Counter()
+        for course_id, count in facets['course'].items():
+            categories[course_categories.get(course_id)] += count
+        return {
+            'file_type': dict(facets['file_type'].most_common()),
+            'course': dict(facets['course'].most_common()),
+            'category': dict(categories.most_common())
+        }
+    
+    def _course_categories_statement(self, course_ids):
+        return select(Course.id, Course.category_id).where(Course.id.in_(list(course_ids)))
+    
+    def _search_files(
+        self,
+        query: str,
+        user: User,
+        limit: int,
+        scope: SearchScope,
+        filters: SearchFilters = NO_FILTERS,
+        facets: Optional[Dict[str, Counter]] = None
+    ) -> List[Dict[str, Any]]:
+        """facets (index only) is filled with the type and course counts of the matches"""
+        if scope.use_index:
+            course_filter = None
+            if filters.category_ids:
+                course_filter = set(self.db.execute(self._category_courses_statement(filters)).scalars())
+            return self._files_by_ids(search_index.search_files(
+                query, scope.course_ids, limit, filters.file_types or None,
+                self._course_filter(filters, course_filter), facets
+            ))
+        
+        results = self.db.execute(
+            self._files_statement(query, user, limit, filters)
+        ).scalars().all()
+        
+        return [self._file_result(file) for file in results]
+    
+    def _category_courses_statement(self, filters: SearchFilters):
+        return select(Course.id).where(Course.category_id.in_(filters.category_ids))
+    
+    def _course_filter(self, filters: SearchFilters, category_courses: Optional[Set[int]]) -> Optional[Set[int]]:
+        """Index course filter: selected courses, narrowed to the selected categories' courses"""
+        if not filters.course_ids:
+            return category_courses
+        courses = set(filters.course_ids)
+        return courses if category_courses is None else courses & category_courses
+    
+    def _file_condition(self, query: str):
+        """(match condition, rank or None) for files on the configured SQL backend"""
+        if settings.SEARCH_BACKEND == "postgres":
+            return self._full_text_match(FILE_SEARCH_VECTOR, FileNode.name, query)
+        
         query_lower = f"%{query.lower()}%"
+        return or_(
+            func.lower(FileNode.name).like(query_lower),
+            func.lower(FileNode.path).like(query_lower)
+        ), None
+    
+    def _filter_conditions(self, filters: SearchFilters, skip: str = None) -> list:
+        """
+        WHERE conditions for the facet filters
+        skip: 'file_type' or 'course' leaves that facet unfiltered (for its counts)
+        """
+        conditions = []
+        if filters.file_types and skip != 'file_type':
+            conditions.append(FileNode.file_type.in_(filters.file_types))
+        if skip != 'course':
+            if filters.course_ids:
+                conditions.append(FileNode.course_id.in_(filters.course_ids))
+            if filters.category_ids:
+                conditions.append(FileNode.course_id.in_(self._category_courses_statement(filters)))
+        if filters.min_size is not None:
+            conditions.append(FileNode.size >= filters.min_size)
+        if filters.max_size is not None:
+            conditions.append(FileNode.size <= filters.max_size)
+        if filters.added_after is not None:
+            conditions.append(FileNode.created_at >= filters.added_after)
+        if filters.added_before is not None:
+            conditions.append(FileNode.created_at < filters.added_before)
+        return conditions
+    
+    def _files_statement(self, query: str, user: User, limit: int, filters: SearchFilters = NO_FILTERS):
+        """Build file search statement (shared by sync and async services)"""
+        condition, rank = self._file_condition(query)
         
-        # Get accessible course IDs
-        accessible_courses = self.auth_service.get_accessible_courses(user)
-        course_ids = [c.id for c in accessible_courses]
-        
-        if not course_ids:
-            return []
-        
-        # Build query
-        file_query = self.db.query(FileNode).filter(
-            and_(
-                FileNode.course_id.in_(course_ids),
-                FileNode.is_directory == False,  # Only files, not folders
-                or_(
-                    func.lower(FileNode.name).like(query_lower),
-                    func.lower(FileNode.path).like(query_lower)
-                )
-            )
+        # Only files, not folders
+        stmt = select(FileNode).where(
+            FileNode.is_directory == False,
+            condition,
+            *self._filter_conditions(filters)
         )
         
-        # Filter by file type if specified
-        if file_type:
-            file_query = file_query.filter(
-                func.lower(FileNode.name).like(f"%.{file_type.lower()}")
-            )
+        # Restrict to accessible courses (enrollment filter joined in SQL)
+        stmt = self.auth_service.apply_course_scope(stmt, user, FileNode.course_id)
         
-        results = file_query.order_by(FileNode.name).limit(limit).all()
+        if rank is not None:
+            stmt = stmt.order_by(rank.desc())
+        return stmt.order_by(FileNode.name).limit(limit)
+    
+    def _facet_counts(self, query: str, user: User, filters: SearchFilters, facet: str) -> Counter:
+        """Matching files per stored type or per course (facets on SQL backends)"""
+        return Counter(dict(self.db.execute(self._facet_statement(query, user, filters, facet)).all()))
+    
+    def _facet_statement(self, query: str, user: User, filters: SearchFilters, facet: str):
+        condition, _ = self._file_condition(query)
+        column = FileNode.file_type if facet == 'file_type' else FileNode.course_id
         
-        return [
-            {
-                'id': file.id,
-                'name': file.name,
-                'path': file.path,
-                'course_id': file.course_id,
-                'file_type': self._get_file_type(file.name),
-                'file_size': file.size,
-                'type': 'file',
-                'icon': self._get_file_icon(file.name)
-            }
-            for file in results
-        ]
+        stmt = select(column, func.count()).where(
+            FileNode.is_directory == False,
+            condition,
+            *self._filter_conditions(filters, skip=facet)
+        )
+        stmt = self.auth_service.apply_course_scope(stmt, user, FileNode.course_id)
+        return stmt.group_by(column)
+    
+    def search_content(
+        self,
+        query: str,
+        user: User,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Search inside extracted document text (PDF, EPUB, text files)
+        One result per file: its best passage, with a highlighted snippet
+        """
+        query = normalize_query(query)
+        scope = self._resolve_scope(user)
+        key = search_cache.key('content', query, scope.cache_scope, scope.use_index, limit)
+        ids = search_cache.get(key)
+        if ids is not None:
+            rows = self._chunks_in_order(self.db.execute(self._chunks_by_ids_statement(ids)).all(), ids)
+        else:
+            version = search_cache.catalog_version
+            rows = self._best_passages(self._search_chunks(query, user, limit, scope), limit)
+            search_cache.put(key, array('q', (chunk.id for chunk, _ in rows)), version)
+        
+        results = [self._content_result(query, chunk, file) for chunk, file in rows]
+        self._log_search(user.id, query, len(results), 'content')
+        return results
+    
+    def _search_chunks(self, query: str, user: User, limit: int, scope: SearchScope) -> list:
+        """Ranked (chunk, file) rows, several per file"""
+        if scope.use_index:
+            ids = search_index.search_content(query, scope.course_ids, limit * CONTENT_CANDIDATES)
+            return self._chunks_in_order(self.db.execute(self._chunks_by_ids_statement(ids)).all(), ids)
+        
+        return self.db.execute(self._content_statement(query, user, limit)).all()
+    
+    def _chunks_by_ids_statement(self, ids: List[int]):
+        return select(DocumentChunk, FileNode).join(
+            FileNode, FileNode.id == DocumentChunk.file_id
+        ).where(DocumentChunk.id.in_(ids))
+    
+    def _chunks_in_order(self, rows: list, ids: List[int]) -> list:
+        by_id = {chunk.id: (chunk, file) for chunk, file in rows}
+        return [by_id[i] for i in ids if i in by_id]
+    
+    def _content_statement(self, query: str, user: User, limit: int):
+        """Passage search on SQL backends (shared by sync and async services)"""
+        stmt = select(DocumentChunk, FileNode).join(FileNode, FileNode.id == DocumentChunk.file_id)
+        
+        if settings.SEARCH_BACKEND == "postgres":
+            ts_query = self._ts_query(query)
+            if ts_query is None:
+                stmt = stmt.where(false())  # no words to match in text
+            else:
+                stmt = stmt.where(CHUNK_SEARCH_VECTOR.op('@@')(ts_query)).order_by(
+                    func.ts_rank(CHUNK_SEARCH_VECTOR, ts_query).desc()
+                )
+        else:
+            stmt = stmt.where(func.lower(DocumentChunk.content).like(f"%{query.lower()}%"))
+        
+        # Chunks carry course_id, so the enrollment join skips file_nodes
+        stmt = self.auth_service.apply_course_scope(stmt, user, DocumentChunk.course_id)
+        return stmt.order_by(DocumentChunk.file_id, DocumentChunk.position).limit(limit * CONTENT_CANDIDATES)
+    
+    def _best_passages(self, rows: list, limit: int) -> list:
+        """First (best ranked) passage of each file"""
+        seen, best = set(), []
+        for chunk, file in rows:
+            if chunk.file_id not in seen:
+                seen.add(chunk.file_id)
+                best.append((chunk, file))
+                if len(best) == limit:
+                    break
+        return best
+    
+    def _content_result(self, query: str, chunk: DocumentChunk, file: FileNode) -> Dict[str, Any]:
+        text, highlights = snippet(chunk.content, query)
+        return {
+            **self._file_result(file),
+            'type': 'content',
+            'chunk_id': chunk.id,
+            'location': chunk.location,
+            'snippet': text,
+            'highlights': highlights  # [start, end) character offsets in snippet
+        }
+    
+    def _file_result(self, file: FileNode) -> Dict[str, Any]:
+        return {
+            'id': file.id,
+            'name': file.name,
+            'path': file.path,
+            'course_id': file.course_id,
+            'file_type': file.file_type,
+            'file_size': file.size,
+            'type': 'file',
+            'icon': icon_for(file.file_type)
+        }
     
     def search_by_type(
         self,
@@ -150,13 +654,13 @@ class SearchService:
     ) -> List[Dict[str, Any]]:
         """
         Search by specific type
-        search_type: 'courses', 'files', 'pdf', 'video', 'document'
+        search_type: 'courses', 'files', or a file type / extension ('pdf', 'video', 'docx')
         """
         if search_type == 'courses':
             results = self.search_courses(query, user, limit)
         elif search_type == 'files':
             results = self.search_files(query, user, limit)
-        elif search_type in ['pdf', 'doc', 'docx', 'ppt', 'pptx', 'mp4', 'avi', 'mp3']:
+        elif resolve_file_type(search_type):
             results = self.search_files(query, user, limit, file_type=search_type)
         else:
             results = []
@@ -168,97 +672,41 @@ class SearchService:
     
     def get_popular_searches(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most popular search queries"""
-        results = self.db.query(
-            SearchLog.query,
-            func.count(SearchLog.id).label('count')
-        ).group_by(
-            SearchLog.query
-        ).order_by(
-            func.count(SearchLog.id).desc()
-        ).limit(limit).all()
+        results = self.db.execute(self._popular_statement(limit)).all()
         
         return [
             {'query': r.query, 'count': r.count}
             for r in results
         ]
     
+    def _popular_statement(self, limit: int):
+        """Top queries over the last SEARCH_POPULAR_DAYS from the daily counts"""
+        since = datetime.utcnow().date() - timedelta(days=settings.SEARCH_POPULAR_DAYS)
+        count = func.sum(SearchQueryDaily.search_count)
+        return select(
+            SearchQueryDaily.query,
+            count.label('count')
+        ).where(
+            SearchQueryDaily.day >= since
+        ).group_by(
+            SearchQueryDaily.query
+        ).order_by(
+            count.desc()
+        ).limit(limit)
+    
     def get_recent_searches(self, user_id: int, limit: int = 5) -> List[str]:
         """Get user's recent search queries"""
-        results = self.db.query(SearchLog).filter(
-            SearchLog.user_id == user_id
-        ).order_by(
-            SearchLog.created_at.desc()
-        ).limit(limit).all()
+        results = self.db.execute(self._recent_statement(user_id, limit)).scalars().all()
         
         return [r.query for r in results]
     
-    def _get_file_type(self, filename: str) -> str:
-        """Get file type from filename"""
-        if '.' not in filename:
-            return 'unknown'
-        
-        ext = filename.rsplit('.', 1)[1].lower()
-        
-        # Map extensions to types
-        type_map = {
-            'pdf': 'pdf',
-            'doc': 'document',
-            'docx': 'document',
-            'txt': 'text',
-            'ppt': 'presentation',
-            'pptx': 'presentation',
-            'xls': 'spreadsheet',
-            'xlsx': 'spreadsheet',
-            'mp4': 'video',
-            'avi': 'video',
-            'mov': 'video',
-            'mp3': 'audio',
-            'wav': 'audio',
-            'jpg': 'image',
-            'jpeg': 'image',
-            'png': 'image',
-            'gif': 'image',
-            'zip': 'archive',
-            'rar': 'archive',
-            'py': 'code',
-            'js': 'code',
-            'java': 'code',
-            'cpp': 'code',
-        }
-        
-        return type_map.get(ext, 'file')
-    
-    def _get_file_icon(self, filename: str) -> str:
-        """Get Material icon for file type"""
-        file_type = self._get_file_type(filename)
-        
-        icon_map = {
-            'pdf': 'picture_as_pdf',
-            'document': 'description',
-            'text': 'article',
-            'presentation': 'slideshow',
-            'spreadsheet': 'table_chart',
-            'video': 'movie',
-            'audio': 'audiotrack',
-            'image': 'image',
-            'archive': 'folder_zip',
-            'code': 'code',
-            'file': 'insert_drive_file'
-        }
-        
-        return icon_map.get(file_type, 'insert_drive_file')
+    def _recent_statement(self, user_id: int, limit: int):
+        return select(SearchLog).where(
+            SearchLog.user_id == user_id
+        ).order_by(
+            SearchLog.created_at.desc()
+        ).limit(limit)
     
     def _log_search(self, user_id: int, query: str, results_count: int, search_type: str):
-        """Log search query for analytics"""
-        try:
-            log = SearchLog(
-                user_id=user_id,
-                query=query,
-                results_count=results_count,
-                search_type=search_type
-            )
-            self.db.add(log)
-            self.db.commit()
-        except Exception as e:
-            print(f"Failed to log search: {e}")
-            self.db.rollback()
+        """Log search query for analytics (buffered; written in batches off the request path)"""
+        search_log_writer.record(user_id, query, results_count, search_type)
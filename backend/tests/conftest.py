@@ -0,0 +1,42 @@
+"""
+Database fixtures
+
+PostgreSQL-only paths (ON CONFLICT upserts, recursive CTEs) run against
+TEST_DATABASE_URL, a disposable database; tests are skipped when it is unset.
+Each test runs in a transaction that is rolled back afterwards.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.models import Category, Course, FileNode, FileRollup, LastViewed, User, UserCourseCompletion, UserProgress
+
+TABLES = [
+    User.__table__, Category.__table__, Course.__table__, FileNode.__table__, UserProgress.__table__,
+    LastViewed.__table__, FileRollup.__table__, UserCourseCompletion.__table__
+]
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL not set")
+    engine = create_engine(url)
+    Base.metadata.create_all(engine, tables=TABLES)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(pg_engine):
+    connection = pg_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
@@ -0,0 +1,40 @@
+"""
+Completion counts when the scanner removes files users have completed
+"""
+from app.models import Category, Course, FileNode, User, UserProgress, ProgressStatus
+from app.services.rollup_service import RollupService
+from app.services.scanner_service import ScannerService
+
+
+def test_scan_removal_subtracts_completed_files(db, tmp_path):
+    course_dir = tmp_path / "Courses" / "Algebra"
+    course_dir.mkdir(parents=True)
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (course_dir / name).write_bytes(name.encode())
+
+    category = Category(name="Courses", path=str(tmp_path / "Courses"))
+    db.add(category)
+    db.flush()
+    course = Course(name="Algebra", path=str(course_dir), category_id=category.id)
+    user = User(username="student", email="student@example.com", hashed_password="x")
+    db.add_all([course, user])
+    db.flush()
+
+    scanner = ScannerService(db)
+    scanner._scan_course_files(course, str(course_dir))
+    files = {node.name: node for node in db.query(FileNode).filter(FileNode.course_id == course.id)}
+
+    rollups = RollupService(db)
+    for name in ("a.pdf", "b.pdf"):
+        db.add(UserProgress(user_id=user.id, file_id=files[name].id, status=ProgressStatus.COMPLETED))
+        rollups.record_completion(user.id, course.id, 1)
+    db.flush()
+
+    (course_dir / "b.pdf").unlink()
+    result = scanner._scan_course_files(course, str(course_dir))
+
+    assert result['removed'] == 1
+    assert rollups.get_user_completions(user.id) == [
+        {'course_id': course.id, 'completed': 1, 'total': 2, 'percent': 50.0}
+    ]
+    assert db.query(UserProgress).filter(UserProgress.file_id == files["b.pdf"].id).count() == 0
@@ -8,9 +8,40 @@ export interface FileNode {
   isDirectory: boolean;
   size?: number;
   createdAt?: Date;
+  childCount?: number;
+  hasChildren?: boolean;
   children?: FileNode[];
 }
 
+/**
+ * Columnar course tree payload (GET /files/course/:id?format=compact).
+ * Parallel arrays, parents first; see FileService.decodeCompactTree.
+ */
+export interface CompactTree {
+  format: 'compact-tree';
+  version: number;
+  course_id: number;
+  count: number;
+  base_path: string;
+  sep: string;
+  types: string[];
+  created_base: number;
+  path: Record<string, string>;
+  abs: Record<string, string>;
+  id: number[];
+  parent: number[];
+  name: string[];
+  type: number[];
+  dir: number[];
+  size: (number | null)[];
+  created: (number | null)[];
+}
+
+export interface FileNodePage {
+  items: FileNode[];
+  nextCursor: string | null;
+}
+
 export enum FileType {
   PDF = 'pdf',
   VIDEO = 'video',
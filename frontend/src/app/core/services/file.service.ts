@@ -2,7 +2,7 @@ import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
 import { Observable, map } from 'rxjs';
 import { environment } from '../../../environments/environment';
-import { FileNode, FileType } from '../models/file.model';
+import { CompactTree, FileNode, FileNodePage, FileType } from '../models/file.model';
 
 @Injectable({
   providedIn: 'root'
@@ -13,19 +13,84 @@ export class FileService {
   constructor(private http: HttpClient) {}
 
   getFilesByCourse(courseId: number): Observable<FileNode[]> {
-    return this.http.get<any[]>(`${this.apiUrl}/course/${courseId}`)
+    return this.http.get<CompactTree>(`${this.apiUrl}/course/${courseId}`, {
+      params: { format: 'compact' }
+    }).pipe(
+      map(tree => this.decodeCompactTree(tree))
+    );
+  }
+
+  /**
+   * Expand the columnar tree payload into FileNode objects (parents first).
+   */
+  decodeCompactTree(tree: CompactTree): FileNode[] {
+    const nodes: FileNode[] = new Array(tree.count);
+    let id = 0;
+
+    for (let i = 0; i < tree.count; i++) {
+      id += tree.id[i];
+      const parent = tree.parent[i] ? nodes[i - tree.parent[i]] : null;
+      const parentPath = parent ? parent.path : tree.base_path;
+      const key = String(i);
+
+      let path: string;
+      if (key in tree.abs) {
+        path = tree.abs[key];
+      } else if (key in tree.path) {
+        path = parentPath + tree.path[key];
+      } else {
+        path = parentPath + tree.sep + tree.name[i];
+      }
+
+      const created = tree.created[i];
+      nodes[i] = {
+        id,
+        courseId: tree.course_id,
+        name: tree.name[i],
+        path,
+        fileType: tree.types[tree.type[i]],
+        parentId: parent ? parent.id : null,
+        isDirectory: tree.dir[i] === 1,
+        size: tree.size[i] ?? undefined,
+        createdAt: created !== null ? new Date((tree.created_base + created) * 1000) : undefined
+      };
+    }
+
+    return nodes;
+  }
+
+  getCourseRoot(courseId: number, cursor?: string | null, limit = 100): Observable<FileNodePage> {
+    return this.getChildrenPage(`${this.apiUrl}/course/${courseId}/root`, cursor, limit);
+  }
+
+  getChildren(nodeId: number, cursor?: string | null, limit = 100): Observable<FileNodePage> {
+    return this.getChildrenPage(`${this.apiUrl}/${nodeId}/children`, cursor, limit);
+  }
+
+  private getChildrenPage(url: string, cursor: string | null | undefined, limit: number): Observable<FileNodePage> {
+    const params: Record<string, string> = { limit: String(limit) };
+    if (cursor) {
+      params['cursor'] = cursor;
+    }
+
+    return this.http.get<any>(url, { params })
       .pipe(
-        map(files => files.map(file => ({
-          id: file.id,
-          courseId: file.course_id,
-          name: file.name,
-          path: file.path,
-          fileType: file.file_type,
-          parentId: file.parent_id,
-          isDirectory: file.is_directory,
-          size: file.size,
-          createdAt: file.created_at ? new Date(file.created_at) : undefined
-        })))
+        map(page => ({
+          items: page.items.map((file: any) => ({
+            id: file.id,
+            courseId: file.course_id,
+            name: file.name,
+            path: file.path,
+            fileType: file.file_type,
+            parentId: file.parent_id,
+            isDirectory: file.is_directory,
+            size: file.size,
+            createdAt: file.created_at ? new Date(file.created_at) : undefined,
+            childCount: file.child_count,
+            hasChildren: file.has_children
+          })),
+          nextCursor: page.next_cursor
+        }))
       );
   }
 
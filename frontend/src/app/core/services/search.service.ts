@@ -1,16 +1,60 @@
 import { Injectable } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable, map } from 'rxjs';
 import { environment } from '../../../environments/environment';
 import { SearchStateService, SearchResultItem } from './search-state.service';
 
 export interface SearchResponse {
+  results: any[];  // courses and files ranked together
   courses: any[];
   files: any[];
+  facets: Record<string, number>;  // matching files per file type
   total: number;
   query: string;
 }
 
+export interface FileSearchFilters {
+  fileTypes?: string[];  // 'pdf', 'video', ... (extensions and MIME types also accepted)
+  courseIds?: number[];
+  categoryIds?: number[];
+  minSize?: number;  // bytes
+  maxSize?: number;
+  addedAfter?: string;  // ISO date
+  addedBefore?: string;
+}
+
+export interface FileSearchResponse {
+  results: any[];
+  facets: {
+    file_type: Record<string, number>;
+    course: Record<number, number>;
+    category: Record<number, number>;
+  };  // each facet counted without its own filter
+  total: number;
+  query: string;
+}
+
+export interface SearchSuggestion {
+  text: string;
+  type: 'course' | 'file' | 'query';
+  distance: number;
+  id?: number;
+  course_id?: number;
+}
+
+export interface ContentSearchResult {
+  id: number;  // file id
+  name: string;
+  path: string;
+  course_id: number;
+  file_type: string;
+  icon: string;
+  chunk_id: number;
+  location: string | null;  // "p. 12" or chapter title
+  snippet: string;
+  highlights: [number, number][];  // [start, end) offsets of matched words in snippet
+}
+
 @Injectable({
   providedIn: 'root'
 })
@@ -28,26 +72,25 @@ export class SearchService {
   searchAll(query: string, limit: number = 50): Observable<SearchResultItem[]> {
     return this.http.get<SearchResponse>(`${this.apiUrl}?q=${encodeURIComponent(query)}&limit=${limit}`).pipe(
       map(response => {
-        // Transform to unified format
-        const results: SearchResultItem[] = [
-          ...response.courses.map(c => ({
-            id: c.id,
-            name: c.name,
-            type: 'course' as const,
-            icon: c.icon || 'school',
-            categoryId: c.category_id
-          })),
-          ...response.files.map(f => ({
-            id: f.id,
-            name: f.name,
-            type: 'file' as const,
-            icon: f.icon || 'insert_drive_file',
-            path: f.path,
-            courseId: f.course_id,
-            fileType: f.file_type,
-            fileSize: f.file_size
-          }))
-        ];
+        // Transform to unified format (merged ranking)
+        const results: SearchResultItem[] = response.results.map(r => r.type === 'course'
+          ? {
+              id: r.id,
+              name: r.name,
+              type: 'course' as const,
+              icon: r.icon || 'school',
+              categoryId: r.category_id
+            }
+          : {
+              id: r.id,
+              name: r.name,
+              type: 'file' as const,
+              icon: r.icon || 'insert_drive_file',
+              path: r.path,
+              courseId: r.course_id,
+              fileType: r.file_type,
+              fileSize: r.file_size
+            });
 
         // Update search state
         this.searchState.activateSearch(query, results);
@@ -65,14 +108,36 @@ export class SearchService {
   }
 
   /**
-   * Search files only
+   * Search files only, with facet filters and facet counts
+   */
+  searchFiles(query: string, filters: FileSearchFilters = {}, limit: number = 30): Observable<FileSearchResponse> {
+    let params = new HttpParams().set('q', query).set('limit', limit);
+    filters.fileTypes?.forEach(type => params = params.append('file_type', type));
+    filters.courseIds?.forEach(id => params = params.append('course_id', id));
+    filters.categoryIds?.forEach(id => params = params.append('category_id', id));
+    if (filters.minSize != null) params = params.set('min_size', filters.minSize);
+    if (filters.maxSize != null) params = params.set('max_size', filters.maxSize);
+    if (filters.addedAfter) params = params.set('added_after', filters.addedAfter);
+    if (filters.addedBefore) params = params.set('added_before', filters.addedBefore);
+    return this.http.get<FileSearchResponse>(`${this.apiUrl}/files`, { params });
+  }
+
+  /**
+   * Search inside document text (PDF, EPUB, text files); best passage per file
+   */
+  searchContent(query: string, limit: number = 20): Observable<ContentSearchResult[]> {
+    return this.http.get<{ results: ContentSearchResult[] }>(
+      `${this.apiUrl}/content?q=${encodeURIComponent(query)}&limit=${limit}`
+    ).pipe(map(response => response.results));
+  }
+
+  /**
+   * Autocomplete suggestions while typing (cheap; use instead of searchAll per keystroke)
    */
-  searchFiles(query: string, fileType?: string, limit: number = 30): Observable<any> {
-    let url = `${this.apiUrl}/files?q=${encodeURIComponent(query)}&limit=${limit}`;
-    if (fileType) {
-      url += `&file_type=${fileType}`;
-    }
-    return this.http.get(url);
+  suggest(query: string, limit: number = 8): Observable<SearchSuggestion[]> {
+    return this.http.get<{ suggestions: SearchSuggestion[] }>(
+      `${this.apiUrl}/suggest?q=${encodeURIComponent(query)}&limit=${limit}`
+    ).pipe(map(response => response.suggestions));
   }
 
   /**